@@ -1,8 +1,8 @@
 from flask import Flask
-import logging
+import multiprocessing
 import secrets
 import os
-from pathlib import Path
+from core.log_files import configure_logging
 
 # Initialize Flask app
 app = Flask(__name__)
@@ -10,49 +10,8 @@ app = Flask(__name__)
 # Generate secret key for session management
 app.secret_key = os.environ.get('SECRET_KEY', secrets.token_hex(32))
 
-# Configure logging
-log_dir = Path(__file__).parent / 'logs'
-log_dir.mkdir(exist_ok=True)
-log_file = log_dir / 'scraper.log'
-
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler(log_file),
-        logging.StreamHandler()
-    ]
-)
-
-# Global scraper state
-scraper_thread = None
-scraper_instance = None
-
-def get_scraper_instance():
-    """Get the global scraper instance"""
-    global scraper_instance
-    return scraper_instance
-
-def set_scraper_instance(instance):
-    """Set the global scraper instance"""
-    global scraper_instance
-    scraper_instance = instance
-
-def get_scraper_thread():
-    """Get the global scraper thread"""
-    global scraper_thread
-    return scraper_thread
-
-def set_scraper_thread(thread):
-    """Set the global scraper thread"""
-    global scraper_thread
-    scraper_thread = thread
-
-# Make these available to blueprints
-app.get_scraper_instance = get_scraper_instance
-app.set_scraper_instance = set_scraper_instance
-app.get_scraper_thread = get_scraper_thread
-app.set_scraper_thread = set_scraper_thread
+# Configure logging (logs/scraper.log is written by the worker process)
+configure_logging()
 
 # Register blueprints
 from routes.main import main_bp
@@ -65,7 +24,25 @@ app.register_blueprint(settings_bp, url_prefix='/settings')
 app.register_blueprint(scraper_bp, url_prefix='/scraper')
 app.register_blueprint(setup_bp)
 
+def start_worker():
+    """Run the scrape worker in a child process (it stops with the server)"""
+    from core.worker import main as worker_main
+
+    worker = multiprocessing.get_context("spawn").Process(
+        target=worker_main, name="scrape-worker", daemon=True
+    )
+    worker.start()
+    return worker
+
+
 if __name__ == '__main__':
+    multiprocessing.freeze_support()
+
+    # With the debug reloader this block runs again in the serving child;
+    # only the outer process starts the worker
+    if os.environ.get('WERKZEUG_RUN_MAIN') != 'true':
+        start_worker()
+
     print("=" * 60)
     print("Mealie Recipe Dredger - Web Interface")
     print("=" * 60)
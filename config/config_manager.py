@@ -1,5 +1,8 @@
+import copy
 import json
 import os
+import tempfile
+import threading
 from pathlib import Path
 from typing import List, Tuple, Dict
 
@@ -8,6 +11,81 @@ BASE_DIR = Path(__file__).parent.parent
 DATA_DIR = BASE_DIR / "data"
 CONFIG_FILE = DATA_DIR / "config.json"
 
+# Parsed files keyed by path: path -> (file stamp, value)
+_cache = {}
+_cache_lock = threading.Lock()
+
+
+def _file_stamp(path: Path):
+    """Return (mtime, size, inode) of a path, or None if it doesn't exist"""
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+
+def _cached(path: Path, loader):
+    """
+    Return loader() for a file, re-running it only when the file changed
+
+    Args:
+        path: File (or directory) whose stamp invalidates the cached value
+        loader: Callable producing the value; exceptions are not cached
+
+    Returns:
+        A deep copy of the cached value, so callers may modify it
+    """
+    stamp = _file_stamp(path)
+    with _cache_lock:
+        entry = _cache.get(path)
+        if entry and stamp is not None and entry[0] == stamp:
+            return copy.deepcopy(entry[1])
+
+    value = loader()
+    if stamp is not None:
+        with _cache_lock:
+            _cache[path] = (stamp, value)
+    return copy.deepcopy(value)
+
+
+def _invalidate(path: Path):
+    with _cache_lock:
+        _cache.pop(path, None)
+
+
+def _atomic_write(path: Path, text: str):
+    """
+    Replace a file's contents in one step
+
+    The text goes to a temporary file in the same directory which is then
+    renamed over the target, so readers see either the old or the new file.
+    """
+    try:
+        mode = path.stat().st_mode & 0o777
+    except OSError:
+        mode = 0o644
+
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+        # mkstemp creates the file private; keep the permissions the file had
+        # (os.chmod by path, as os.fchmod is missing on Windows before 3.13)
+        os.chmod(tmp_path, mode)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+    finally:
+        _invalidate(path)
+        _invalidate(path.parent)
+
 
 def create_default_config() -> dict:
     """Generate default configuration"""
@@ -15,25 +93,78 @@ def create_default_config() -> dict:
         "mealie": {
             "enabled": True,
             "url": "http://YOUR_MEALIE_IP:9000",
-            "api_token": "YOUR_MEALIE_API_TOKEN_HERE"
+            "api_token": "YOUR_MEALIE_API_TOKEN_HERE",
+            "requests_per_second": 5.0,
+            "burst": 10,
+            "bulk_import": False,
+            "bulk_batch_size": 25
         },
         "tandoor": {
             "enabled": False,
             "url": "http://YOUR_TANDOOR_IP:8080",
-            "api_key": "YOUR_TANDOOR_API_KEY_HERE"
+            "api_key": "YOUR_TANDOOR_API_KEY_HERE",
+            "requests_per_second": 5.0,
+            "burst": 10
         },
         "scraper": {
             "dry_run": False,
             "target_recipes_per_site": 50,
             "scan_depth": 1000,
-            "delay_between_imports": 1.5
+            "requests_per_second": 2.0,
+            "burst": 5,
+            "site_rate_limits": {},
+            "max_workers": 4,
+            "verify_workers": 8,
+            "import_workers": 2,
+            "queue_size": 200,
+            "max_jobs": 2,
+            "total_workers": 16,
+            "import_retries": 3,
+            "retry_backoff_seconds": 1.0,
+            "breaker_threshold": 5,
+            "breaker_cooldown_seconds": 30,
+            "engine": "threaded",
+            "max_concurrency": 200,
+            "per_host_concurrency": 8,
+            "pool_size": 10,
+            "index_sync_hours": 24,
+            "catalog_workers": 4,
+            "sitemap_cache": True,
+            "discovery_ttl_hours": 720,
+            "discovery_negative_ttl_hours": 24,
+            "negative_cache_days": 30,
+            "incremental_crawl": True,
+            "site_log_rate": 5
         },
         "active_site_list": "sites.txt"
     }
 
 
+def _read_config() -> dict:
+    """Read config.json and fill in keys missing from older files"""
+    with open(CONFIG_FILE, 'r', encoding='utf-8') as f:
+        config = json.load(f)
+
+    # Ensure all required keys exist (merge with defaults)
+    default_config = create_default_config()
+    for key in default_config:
+        if key not in config:
+            config[key] = default_config[key]
+        elif isinstance(default_config[key], dict):
+            for subkey in default_config[key]:
+                if subkey not in config[key]:
+                    config[key][subkey] = default_config[key][subkey]
+
+    return config
+
+
 def load_config() -> dict:
-    """Load configuration from config.json with error handling"""
+    """
+    Load configuration from config.json with error handling
+
+    The parsed file is cached until its modification time changes; each
+    call returns a fresh copy that the caller may modify.
+    """
     try:
         if not CONFIG_FILE.exists():
             print(f"Config file not found, creating default at {CONFIG_FILE}")
@@ -41,20 +172,7 @@ def load_config() -> dict:
             save_config(config)
             return config
 
-        with open(CONFIG_FILE, 'r', encoding='utf-8') as f:
-            config = json.load(f)
-
-        # Ensure all required keys exist (merge with defaults)
-        default_config = create_default_config()
-        for key in default_config:
-            if key not in config:
-                config[key] = default_config[key]
-            elif isinstance(default_config[key], dict):
-                for subkey in default_config[key]:
-                    if subkey not in config[key]:
-                        config[key][subkey] = default_config[key][subkey]
-
-        return config
+        return _cached(CONFIG_FILE, _read_config)
     except json.JSONDecodeError as e:
         print(f"Error parsing config file: {e}")
         return create_default_config()
@@ -75,8 +193,7 @@ def save_config(config: dict) -> bool:
             print(f"Config validation errors: {errors}")
             return False
 
-        with open(CONFIG_FILE, 'w', encoding='utf-8') as f:
-            json.dump(config, f, indent=2)
+        _atomic_write(CONFIG_FILE, json.dumps(config, indent=2))
 
         return True
     except Exception as e:
@@ -106,6 +223,11 @@ def validate_config(config: dict) -> Tuple[bool, List[str]]:
             if not url.startswith(('http://', 'https://')):
                 errors.append("Mealie URL must start with http:// or https://")
 
+        if 'bulk_batch_size' in config['mealie']:
+            val = config['mealie']['bulk_batch_size']
+            if not isinstance(val, int) or val < 1 or val > 1000:
+                errors.append("bulk_batch_size must be between 1 and 1000")
+
     if 'tandoor' in config:
         tandoor_keys = ['enabled', 'url', 'api_key']
         for key in tandoor_keys:
@@ -119,7 +241,7 @@ def validate_config(config: dict) -> Tuple[bool, List[str]]:
                 errors.append("Tandoor URL must start with http:// or https://")
 
     if 'scraper' in config:
-        scraper_keys = ['dry_run', 'target_recipes_per_site', 'scan_depth', 'delay_between_imports']
+        scraper_keys = ['dry_run', 'target_recipes_per_site', 'scan_depth']
         for key in scraper_keys:
             if key not in config['scraper']:
                 errors.append(f"Missing scraper.{key}")
@@ -135,15 +257,67 @@ def validate_config(config: dict) -> Tuple[bool, List[str]]:
             if not isinstance(val, int) or val < 100 or val > 5000:
                 errors.append("scan_depth must be between 100 and 5000")
 
+        if 'max_workers' in config['scraper']:
+            val = config['scraper']['max_workers']
+            if not isinstance(val, int) or val < 1 or val > 32:
+                errors.append("max_workers must be between 1 and 32")
+
+        if 'import_retries' in config['scraper']:
+            val = config['scraper']['import_retries']
+            if not isinstance(val, int) or val < 0 or val > 10:
+                errors.append("import_retries must be between 0 and 10")
+
+        if config['scraper'].get('engine', 'threaded') not in ('threaded', 'async'):
+            errors.append("engine must be 'threaded' or 'async'")
+
+        for key in ('max_concurrency', 'per_host_concurrency', 'pool_size', 'catalog_workers',
+                    'verify_workers', 'import_workers', 'queue_size', 'breaker_threshold',
+                    'max_jobs', 'total_workers'):
+            if key in config['scraper']:
+                val = config['scraper'][key]
+                if not isinstance(val, int) or val < 1 or val > 1000:
+                    errors.append(f"{key} must be between 1 and 1000")
+
+        for key in ('index_sync_hours', 'discovery_ttl_hours', 'discovery_negative_ttl_hours',
+                    'negative_cache_days', 'retry_backoff_seconds', 'breaker_cooldown_seconds',
+                    'site_log_rate'):
+            if key in config['scraper']:
+                val = config['scraper'][key]
+                if not isinstance(val, (int, float)) or val < 0:
+                    errors.append(f"{key} must be 0 or greater")
+
+        if not isinstance(config['scraper'].get('site_rate_limits', {}), dict):
+            errors.append("site_rate_limits must be a mapping of host to limits")
+
+    # Validate rate limits (recipe sites, per-site overrides and both services)
+    rate_sections = [
+        (name, config.get(name, {})) for name in ('scraper', 'mealie', 'tandoor')
+    ]
+    site_limits = config.get('scraper', {}).get('site_rate_limits', {})
+    if isinstance(site_limits, dict):
+        rate_sections += [
+            (f"site_rate_limits.{host}", limits) for host, limits in site_limits.items()
+        ]
+
+    for name, section in rate_sections:
+        if not isinstance(section, dict):
+            errors.append(f"{name} rate limit must be a mapping")
+            continue
+        rate = section.get('requests_per_second', 1.0)
+        if not isinstance(rate, (int, float)) or rate <= 0:
+            errors.append(f"{name}.requests_per_second must be greater than 0")
+        burst = section.get('burst', 1)
+        if not isinstance(burst, int) or burst < 1:
+            errors.append(f"{name}.burst must be at least 1")
+
     return (len(errors) == 0, errors)
 
 
 def get_site_lists() -> List[str]:
-    """List all .txt files in data/ directory"""
+    """List all .txt files in data/ directory (cached until the directory changes)"""
     try:
         DATA_DIR.mkdir(parents=True, exist_ok=True)
-        txt_files = [f.name for f in DATA_DIR.glob("*.txt")]
-        return sorted(txt_files)
+        return _cached(DATA_DIR, lambda: sorted(f.name for f in DATA_DIR.glob("*.txt")))
     except Exception as e:
         print(f"Error listing site lists: {e}")
         return []
@@ -155,6 +329,8 @@ def load_site_list(filename: str) -> List[str]:
     - Skip empty lines
     - Skip lines starting with #
     - Validate URLs (must start with http:// or https://)
+
+    The parsed list is cached until the file's modification time changes.
     """
     try:
         file_path = DATA_DIR / filename
@@ -163,30 +339,35 @@ def load_site_list(filename: str) -> List[str]:
             print(f"Site list file not found: {filename}")
             return []
 
-        sites = []
-        with open(file_path, 'r', encoding='utf-8') as f:
-            for line_num, line in enumerate(f, 1):
-                # Strip whitespace
-                line = line.strip()
+        return _cached(file_path, lambda: _parse_site_list(file_path, filename))
+    except Exception as e:
+        print(f"Error loading site list {filename}: {e}")
+        return []
+
 
-                # Skip empty lines
-                if not line:
-                    continue
+def _parse_site_list(file_path: Path, filename: str) -> List[str]:
+    """Read the valid URLs of a site list file"""
+    sites = []
+    with open(file_path, 'r', encoding='utf-8') as f:
+        for line_num, line in enumerate(f, 1):
+            # Strip whitespace
+            line = line.strip()
 
-                # Skip comments
-                if line.startswith('#'):
-                    continue
+            # Skip empty lines
+            if not line:
+                continue
 
-                # Validate URL format
-                if line.startswith(('http://', 'https://')):
-                    sites.append(line)
-                else:
-                    print(f"Warning: Invalid URL on line {line_num} in {filename}: {line}")
+            # Skip comments
+            if line.startswith('#'):
+                continue
 
-        return sites
-    except Exception as e:
-        print(f"Error loading site list {filename}: {e}")
-        return []
+            # Validate URL format
+            if line.startswith(('http://', 'https://')):
+                sites.append(line)
+            else:
+                print(f"Warning: Invalid URL on line {line_num} in {filename}: {line}")
+
+    return sites
 
 
 def save_site_list(filename: str, sites: List[str]) -> bool:
@@ -195,11 +376,10 @@ def save_site_list(filename: str, sites: List[str]) -> bool:
         DATA_DIR.mkdir(parents=True, exist_ok=True)
         file_path = DATA_DIR / filename
 
-        with open(file_path, 'w', encoding='utf-8') as f:
-            for site in sites:
-                # Validate URL before writing
-                if site.startswith(('http://', 'https://')):
-                    f.write(f"{site}\n")
+        # Validate URLs before writing
+        _atomic_write(file_path, "".join(
+            f"{site}\n" for site in sites if site.startswith(('http://', 'https://'))
+        ))
 
         return True
     except Exception as e:
@@ -0,0 +1,168 @@
+import asyncio
+import threading
+from urllib.parse import urlparse
+from core.metrics import MeteredFeed, StageTimer, record_detect
+from core.rate_limiter import host_of
+
+try:
+    import aiohttp
+except ImportError:  # Optional dependency - the threaded engine is used instead
+    aiohttp = None
+
+
+def async_engine_available() -> bool:
+    """Return True if the optional aiohttp dependency is installed"""
+    return aiohttp is not None
+
+
+class AsyncFetchEngine:
+    """
+    asyncio HTTP engine running on a single background event loop
+
+    Site workers call the blocking wrappers (stream, verify_many);
+    the requests themselves are multiplexed on one thread, bounded by a
+    total concurrency limit and a per-host limit.
+    """
+
+    CHUNK_SIZE = 64 * 1024
+
+    def __init__(self, headers: dict, detector_factory, max_concurrency: int = 200,
+                 per_host_concurrency: int = 8, rate_limiter=None):
+        """
+        Initialize the engine (call start() before use)
+
+        Args:
+            headers: Default request headers
+            detector_factory: Callable returning a fresh streaming detector
+                (feed(chunk) -> done, .found)
+            max_concurrency: Maximum requests in flight across all hosts
+            per_host_concurrency: Maximum requests in flight to a single host
+            rate_limiter: Optional HostRateLimiter shared with the threaded session
+        """
+        if aiohttp is None:
+            raise RuntimeError("aiohttp is not installed - use the threaded engine")
+
+        self.headers = headers
+        self.detector_factory = detector_factory
+        self.max_concurrency = max_concurrency
+        self.per_host_concurrency = per_host_concurrency
+        self.rate_limiter = rate_limiter
+
+        self.loop = None
+        self._thread = None
+        self._session = None
+        self._global_limit = None
+        self._host_limits = {}
+
+    def start(self):
+        """Start the event loop thread and open the HTTP session"""
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(
+            target=self.loop.run_forever, name="async-fetch", daemon=True
+        )
+        self._thread.start()
+        self._run(self._open())
+
+    def close(self):
+        """Close the HTTP session and stop the event loop"""
+        if not self.loop:
+            return
+        self._run(self._close())
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join(timeout=5)
+        self.loop.close()
+        self.loop = None
+
+    def _run(self, coro):
+        """Run a coroutine on the engine loop and wait for its result"""
+        return asyncio.run_coroutine_threadsafe(coro, self.loop).result()
+
+    async def _open(self):
+        self._global_limit = asyncio.Semaphore(self.max_concurrency)
+        connector = aiohttp.TCPConnector(
+            limit=self.max_concurrency,
+            limit_per_host=self.per_host_concurrency,
+        )
+        self._session = aiohttp.ClientSession(headers=self.headers, connector=connector)
+
+    async def _close(self):
+        if self._session:
+            await self._session.close()
+            self._session = None
+
+    def _host_limit(self, url: str) -> asyncio.Semaphore:
+        """Get (or create) the semaphore for a URL's host - loop thread only"""
+        host = urlparse(url).netloc
+        if host not in self._host_limits:
+            self._host_limits[host] = asyncio.Semaphore(self.per_host_concurrency)
+        return self._host_limits[host]
+
+    async def _wait_for_token(self, url: str):
+        """Wait for the host's rate-limit token before taking a concurrency slot"""
+        if self.rate_limiter:
+            wait = self.rate_limiter.reserve(url)
+            if wait > 0:
+                await asyncio.sleep(wait)
+
+    async def _stream(self, url: str, on_chunk, timeout: float, headers: dict) -> tuple:
+        """GET a URL and hand body chunks to on_chunk until it returns True"""
+        await self._wait_for_token(url)
+        async with self._global_limit, self._host_limit(url):
+            async with self._session.get(
+                url, headers=headers, timeout=aiohttp.ClientTimeout(total=timeout)
+            ) as r:
+                if r.status == 200:
+                    async for chunk in r.content.iter_chunked(self.CHUNK_SIZE):
+                        if on_chunk(chunk):
+                            break
+                return (r.status, dict(r.headers))
+
+    async def _verify(self, url: str) -> tuple:
+        host = host_of(url)
+        # The detector stops the download as soon as it has an answer
+        detector = self.detector_factory()
+        meter = MeteredFeed(detector.feed)
+        try:
+            with StageTimer("verify_fetch", host) as timer:
+                status, _ = await self._stream(url, meter, 10, {})
+                timer.result = str(status)
+            return (status, status == 200 and detector.found)
+        except Exception:
+            return (None, False)
+        finally:
+            record_detect(meter, host, detector.found)
+
+    async def _verify_all(self, urls: list) -> list:
+        return await asyncio.gather(*(self._verify(url) for url in urls))
+
+    def stream(self, url: str, on_chunk, timeout: float = 30, headers: dict = None) -> tuple:
+        """
+        Stream a URL's body through a callback (blocking)
+
+        The callback runs on the event loop thread and must be cheap; it
+        returns True to stop reading and close the connection early.
+
+        Args:
+            url: URL to fetch
+            on_chunk: Callable(bytes) -> bool
+            timeout: Total request timeout in seconds
+            headers: Extra request headers (e.g. conditional GET validators)
+
+        Returns:
+            Tuple of (status_code: int, response_headers: dict); the body is
+            only streamed for 200
+        """
+        return self._run(self._stream(url, on_chunk, timeout, headers or {}))
+
+    def verify_many(self, urls: list) -> list:
+        """
+        Verify a batch of URLs concurrently (blocking)
+
+        Args:
+            urls: URLs to check
+
+        Returns:
+            List of (status_code, is_recipe) tuples in the same order as urls;
+            status_code is None if the request failed
+        """
+        return self._run(self._verify_all(urls))
@@ -0,0 +1,227 @@
+import hashlib
+import threading
+import time
+from core.state_store import SqliteStore
+
+# Site states
+SITE_PENDING = "pending"        # Not started (or discovery interrupted)
+SITE_DISCOVERED = "discovered"  # Candidate list saved; verification/import in progress
+SITE_DONE = "done"
+
+# Candidate states
+CANDIDATE_QUEUED = "queued"      # Waiting for verification
+CANDIDATE_VERIFIED = "verified"  # Verified recipe waiting for import
+
+# Seconds between flushes of buffered candidate updates
+CHECKPOINT_INTERVAL = 5.0
+
+
+def site_list_key(site_list: list) -> str:
+    """Fingerprint of a site list, so a checkpoint is only resumed for the same list"""
+    return hashlib.sha1("\n".join(site_list).encode("utf-8")).hexdigest()
+
+
+class RunCheckpoint(SqliteStore):
+    """
+    On-disk progress of the latest scrape run of a site list
+
+    Records each site's state and import count, plus the candidate URLs of
+    sites being worked on. Finished candidates are deleted, so after an
+    interruption only the remaining work is resumed. Candidate updates are
+    buffered and written every CHECKPOINT_INTERVAL seconds.
+
+    Rows are keyed by the site list fingerprint, so scrapes of different
+    lists running at the same time keep separate checkpoints.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS checkpoint_meta (
+            run TEXT NOT NULL,
+            key TEXT NOT NULL,
+            value TEXT,
+            PRIMARY KEY (run, key)
+        ) WITHOUT ROWID;
+        CREATE TABLE IF NOT EXISTS checkpoint_sites (
+            run TEXT NOT NULL,
+            site TEXT NOT NULL,
+            position INTEGER NOT NULL,
+            state TEXT NOT NULL,
+            imported INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (run, site)
+        ) WITHOUT ROWID;
+        CREATE TABLE IF NOT EXISTS checkpoint_candidates (
+            run TEXT NOT NULL,
+            url TEXT NOT NULL,
+            site TEXT NOT NULL,
+            position INTEGER NOT NULL,
+            state TEXT NOT NULL,
+            PRIMARY KEY (run, url)
+        ) WITHOUT ROWID;
+        CREATE INDEX IF NOT EXISTS checkpoint_candidates_site
+            ON checkpoint_candidates (run, site, position);
+    """
+
+    def __init__(self, site_list: list, db_path=None):
+        """
+        Args:
+            site_list: Site URLs of the run
+            db_path: Database file (defaults to data/dredger.db)
+        """
+        super().__init__(db_path)
+        self.site_list = site_list
+        self.run = site_list_key(site_list)
+        # url -> new state (None deletes the candidate), waiting to be flushed
+        self._pending = {}
+        self._pending_lock = threading.Lock()
+        self._last_flush = time.monotonic()
+
+    def start(self):
+        """Discard any previous run of this site list and record a fresh one"""
+        with self._lock, self._conn:
+            for table in ("checkpoint_meta", "checkpoint_sites", "checkpoint_candidates"):
+                self._conn.execute(f"DELETE FROM {table} WHERE run = ?", (self.run,))
+            self._conn.executemany(
+                "INSERT INTO checkpoint_meta (run, key, value) VALUES (?, ?, ?)",
+                [(self.run, "status", "running"), (self.run, "started_at", str(time.time()))],
+            )
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO checkpoint_sites (run, site, position, state) "
+                "VALUES (?, ?, ?, ?)",
+                [(self.run, site, idx, SITE_PENDING) for idx, site in enumerate(self.site_list)],
+            )
+        with self._pending_lock:
+            self._pending = {}
+
+    def _meta(self) -> dict:
+        with self._lock:
+            return dict(self._conn.execute(
+                "SELECT key, value FROM checkpoint_meta WHERE run = ?", (self.run,)
+            ).fetchall())
+
+    def resumable(self) -> bool:
+        """Return True if an unfinished run of this site list is on disk"""
+        # "running" is left behind when the process died mid-run
+        return self._meta().get("status") in ("running", "interrupted")
+
+    def summary(self) -> dict:
+        """Return progress of the checkpointed run (empty dict if none)"""
+        meta = self._meta()
+        if not meta:
+            return {}
+        with self._lock:
+            sites = dict(self._conn.execute(
+                "SELECT state, COUNT(*) FROM checkpoint_sites WHERE run = ? GROUP BY state",
+                (self.run,)
+            ).fetchall())
+            imported = self._conn.execute(
+                "SELECT COALESCE(SUM(imported), 0) FROM checkpoint_sites WHERE run = ?",
+                (self.run,)
+            ).fetchone()[0]
+        return {
+            "status": meta.get("status"),
+            "sites_total": sum(sites.values()),
+            "sites_completed": sites.get(SITE_DONE, 0),
+            "total_imported": imported,
+        }
+
+    def sites(self) -> dict:
+        """Return site -> (state, imported) for the checkpointed run"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT site, state, imported FROM checkpoint_sites WHERE run = ?", (self.run,)
+            ).fetchall()
+        return {site: (state, imported) for site, state, imported in rows}
+
+    def candidates(self, site: str) -> list:
+        """Return the remaining (url, state) candidates of a site in sitemap order"""
+        self.flush()
+        with self._lock:
+            return self._conn.execute(
+                "SELECT url, state FROM checkpoint_candidates WHERE run = ? AND site = ? "
+                "ORDER BY position",
+                (self.run, site),
+            ).fetchall()
+
+    def save_candidates(self, site: str, urls: list):
+        """Record a site's candidate list and mark it discovered"""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "DELETE FROM checkpoint_candidates WHERE run = ? AND site = ?", (self.run, site)
+            )
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO checkpoint_candidates (run, url, site, position, state) "
+                "VALUES (?, ?, ?, ?, ?)",
+                [(self.run, url, site, pos, CANDIDATE_QUEUED) for pos, url in enumerate(urls)],
+            )
+            self._conn.execute(
+                "UPDATE checkpoint_sites SET state = ? WHERE run = ? AND site = ?",
+                (SITE_DISCOVERED, self.run, site)
+            )
+
+    def site_done(self, site: str, imported: int):
+        """Mark a site finished and drop its remaining candidates"""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "DELETE FROM checkpoint_candidates WHERE run = ? AND site = ?", (self.run, site)
+            )
+            self._conn.execute(
+                "UPDATE checkpoint_sites SET state = ?, imported = ? WHERE run = ? AND site = ?",
+                (SITE_DONE, imported, self.run, site),
+            )
+
+    def set_imported(self, site: str, imported: int):
+        """Update a site's import count"""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE checkpoint_sites SET imported = ? WHERE run = ? AND site = ?",
+                (imported, self.run, site)
+            )
+
+    def mark(self, urls: list, state: str = None):
+        """
+        Buffer a state change for candidates
+
+        Args:
+            urls: Candidate URLs
+            state: CANDIDATE_VERIFIED, or None when the candidate is finished
+        """
+        with self._pending_lock:
+            for url in urls:
+                self._pending[url] = state
+            due = time.monotonic() - self._last_flush >= CHECKPOINT_INTERVAL
+        if due:
+            self.flush()
+
+    def flush(self):
+        """Write buffered candidate updates to disk"""
+        with self._pending_lock:
+            pending = self._pending
+            self._pending = {}
+            self._last_flush = time.monotonic()
+        if not pending:
+            return
+
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "DELETE FROM checkpoint_candidates WHERE run = ? AND url = ?",
+                [(self.run, url) for url, state in pending.items() if state is None],
+            )
+            self._conn.executemany(
+                "UPDATE checkpoint_candidates SET state = ? WHERE run = ? AND url = ?",
+                [(state, self.run, url) for url, state in pending.items() if state is not None],
+            )
+
+    def finish(self, completed: bool):
+        """
+        Flush and record how the run ended
+
+        Args:
+            completed: True if every site was processed; False leaves the
+                run resumable
+        """
+        self.flush()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO checkpoint_meta (run, key, value) VALUES (?, 'status', ?)",
+                (self.run, "complete" if completed else "interrupted"),
+            )
@@ -0,0 +1,63 @@
+import re
+
+# JSON-LD Recipe type: "@type":"Recipe", "@type" : [ "Thing", "Recipe" ],
+# "@type": "https://schema.org/Recipe", ...
+RECIPE_TYPE_PATTERN = re.compile(
+    rb'"@type"\s*:\s*(?:\[[^\]]{0,500}?)?"(?:https?://schema\.org/)?Recipe"'
+)
+
+# Recipe card plugins (WP Recipe Maker, Tasty Recipes, Mediavine Create),
+# matched inside a class attribute so stylesheet links don't count
+PLUGIN_CLASS_PATTERN = re.compile(
+    rb'class\s*=\s*["\'][^"\']{0,500}?'
+    rb'(?:wp-recipe-maker|wprm-recipe|tasty-recipes|mv-create-card)'
+)
+
+# Bytes kept from the previous chunk so markers split across chunks still match
+OVERLAP_BYTES = 1024
+
+# Pages are not scanned beyond this many bytes
+MAX_SCAN_BYTES = 4 * 1024 * 1024
+
+
+class RecipeDetector:
+    """
+    Streaming recipe detector fed with chunks of a page body
+
+    Stops as soon as a Recipe JSON-LD block or a known recipe plugin card
+    is seen, so callers can close the connection without downloading the
+    rest of the page.
+    """
+
+    def __init__(self, max_bytes: int = MAX_SCAN_BYTES):
+        self.max_bytes = max_bytes
+        self.bytes_scanned = 0
+        self.found = False
+        self.done = False
+        self._tail = b""
+
+    def feed(self, chunk: bytes) -> bool:
+        """
+        Scan the next chunk of the body
+
+        Args:
+            chunk: Raw bytes
+
+        Returns:
+            True once detection is finished (recipe found or scan limit hit)
+        """
+        if self.done or not chunk:
+            return self.done
+
+        self.bytes_scanned += len(chunk)
+        window = self._tail + chunk
+
+        if RECIPE_TYPE_PATTERN.search(window) or PLUGIN_CLASS_PATTERN.search(window):
+            self.found = True
+            self.done = True
+        elif self.bytes_scanned >= self.max_bytes:
+            self.done = True
+
+        self._tail = window[-OVERLAP_BYTES:]
+        return self.done
+
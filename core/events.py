@@ -0,0 +1,169 @@
+import json
+import queue
+import threading
+import time
+from pathlib import Path
+from core.log_files import log_event
+
+# Events buffered per subscriber before the oldest are dropped
+SUBSCRIBER_QUEUE_SIZE = 1000
+
+# Seconds between checks of the log file for new lines
+LOG_POLL_INTERVAL = 0.5
+
+# Seconds between reads of the scrape job status
+STATUS_POLL_INTERVAL = 0.5
+
+
+def format_sse(event: str, data) -> str:
+    """Encode one Server-Sent Event with a JSON payload"""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+class EventBroker:
+    """
+    Fan-out of server events to every connected SSE client
+
+    Each subscriber gets its own bounded queue; a client that stops reading
+    loses its oldest events instead of holding up the publisher.
+    """
+
+    def __init__(self):
+        self._subscribers = []
+        self._lock = threading.Lock()
+
+    def subscribe(self) -> queue.Queue:
+        """Register a new client and return its event queue"""
+        subscriber = queue.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        with self._lock:
+            self._subscribers.append(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber: queue.Queue):
+        """Remove a disconnected client"""
+        with self._lock:
+            if subscriber in self._subscribers:
+                self._subscribers.remove(subscriber)
+
+    def has_subscribers(self) -> bool:
+        with self._lock:
+            return bool(self._subscribers)
+
+    def publish(self, event: str, data):
+        """
+        Send an event to every client
+
+        Args:
+            event: Event name (e.g. "status", "log")
+            data: JSON-serializable payload
+        """
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for subscriber in subscribers:
+            while True:
+                try:
+                    subscriber.put_nowait((event, data))
+                    break
+                except queue.Full:
+                    try:
+                        subscriber.get_nowait()
+                    except queue.Empty:
+                        pass
+
+
+class LogTailer:
+    """
+    Background thread publishing lines appended to a log file as "log" events
+
+    Follows the file by byte offset and starts over when the file shrinks
+    (truncated or rotated).
+    """
+
+    def __init__(self, path: Path, broker: EventBroker):
+        self.path = Path(path)
+        self.broker = broker
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def ensure_started(self):
+        """Start the tailer thread if it isn't running yet"""
+        with self._lock:
+            if self._thread and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(target=self._run, name="log-tailer", daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        position = self.path.stat().st_size if self.path.exists() else 0
+        partial = b""
+        while True:
+            time.sleep(LOG_POLL_INTERVAL)
+            try:
+                size = self.path.stat().st_size
+            except OSError:
+                continue
+            if size < position:
+                position, partial = 0, b""
+            if not self.broker.has_subscribers():
+                # Nobody listening: skip ahead so a new client only gets fresh lines
+                position, partial = size, b""
+                continue
+            if size == position:
+                continue
+
+            with open(self.path, "rb") as f:
+                f.seek(position)
+                chunk = f.read(size - position)
+            position += len(chunk)
+
+            *lines, partial = (partial + chunk).split(b"\n")
+            if lines:
+                self.broker.publish("log", [
+                    log_event(line.decode("utf-8", errors="replace") + "\n") for line in lines
+                ])
+
+
+class StatusWatcher:
+    """
+    Background thread publishing the scraper status as "status" events
+
+    The scraper runs in the worker process, so the status is read from the
+    job table while anyone is subscribed and published when it changes.
+    """
+
+    def __init__(self, read_status, broker: EventBroker):
+        """
+        Args:
+            read_status: Callable returning the current status dict
+            broker: Broker to publish on
+        """
+        self.read_status = read_status
+        self.broker = broker
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def ensure_started(self):
+        """Start the watcher thread if it isn't running yet"""
+        with self._lock:
+            if self._thread and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(target=self._run, name="status-watcher", daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        last = None
+        while True:
+            time.sleep(STATUS_POLL_INTERVAL)
+            if not self.broker.has_subscribers():
+                last = None
+                continue
+            try:
+                status = self.read_status()
+            except Exception:
+                continue
+            if status != last:
+                self.broker.publish("status", status)
+                last = status
+
+
+BROKER = EventBroker()
@@ -0,0 +1,62 @@
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+
+# Number of distinct hosts whose connection pools are kept alive
+DEFAULT_POOL_HOSTS = 64
+
+_shared_session = None
+_shared_lock = threading.Lock()
+
+
+class RateLimitedSession(requests.Session):
+    """Session that waits on a per-host rate limiter before every request"""
+
+    def __init__(self, rate_limiter=None):
+        super().__init__()
+        self.rate_limiter = rate_limiter
+
+    def request(self, method, url, *args, **kwargs):
+        if self.rate_limiter:
+            self.rate_limiter.acquire(url)
+        return super().request(method, url, *args, **kwargs)
+
+
+def create_session(pool_size: int = 10, headers: dict = None,
+                   pool_hosts: int = DEFAULT_POOL_HOSTS,
+                   rate_limiter=None) -> requests.Session:
+    """
+    Create a requests session with keep-alive connection pooling
+
+    Args:
+        pool_size: Maximum pooled connections per host
+        headers: Default headers sent with every request
+        pool_hosts: Number of per-host pools to keep
+        rate_limiter: Optional HostRateLimiter applied to every request
+
+    Returns:
+        Configured requests.Session
+    """
+    session = RateLimitedSession(rate_limiter)
+    adapter = HTTPAdapter(pool_connections=pool_hosts, pool_maxsize=pool_size)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+
+    if headers:
+        session.headers.update(headers)
+
+    return session
+
+
+def get_shared_session() -> requests.Session:
+    """
+    Get the process-wide session used by short-lived callers (e.g. routes)
+
+    Returns:
+        Shared requests.Session
+    """
+    global _shared_session
+    with _shared_lock:
+        if _shared_session is None:
+            _shared_session = create_session()
+        return _shared_session
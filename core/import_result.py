@@ -0,0 +1,28 @@
+"""Outcome codes shared by the Mealie and Tandoor import calls"""
+
+IMPORTED = "imported"
+REJECTED = "rejected"   # The server refused this URL (e.g. it could not be parsed)
+FAILED = "failed"       # Transient problem (timeout, connection, 5xx, auth)
+DEFERRED = "deferred"   # Not attempted because the service's circuit breaker is open
+UNKNOWN = "unknown"     # The server may have imported it (e.g. lost response) - never resubmitted
+
+# Client errors that mean "this URL will not import", not "try again later"
+REJECTED_STATUS_CODES = (400, 404, 410, 422)
+
+
+def classify_status(status_code: int, success_codes) -> str:
+    """
+    Map an import response status to an outcome code
+
+    Args:
+        status_code: HTTP status of the import request
+        success_codes: Status codes that mean the recipe was created
+
+    Returns:
+        IMPORTED, REJECTED or FAILED
+    """
+    if status_code in success_codes:
+        return IMPORTED
+    if status_code in REJECTED_STATUS_CODES:
+        return REJECTED
+    return FAILED
@@ -0,0 +1,372 @@
+import json
+import os
+import time
+from core.state_store import SqliteStore
+
+# Job states
+JOB_QUEUED = "queued"            # Waiting for the worker process (or a free job slot)
+JOB_RUNNING = "running"
+JOB_DONE = "done"
+JOB_STOPPED = "stopped"          # Stopped on request
+JOB_FAILED = "failed"
+JOB_INTERRUPTED = "interrupted"  # Worker exited mid-run (resumable from the checkpoint)
+
+ACTIVE_STATES = (JOB_QUEUED, JOB_RUNNING)
+
+# Seconds between worker heartbeats, and after which a silent worker counts as gone
+WORKER_HEARTBEAT = 2.0
+WORKER_TIMEOUT = 30.0
+
+# Windows API values used to check a worker's process id
+PROCESS_QUERY_LIMITED_INFORMATION = 0x1000
+ERROR_ACCESS_DENIED = 5
+STILL_ACTIVE = 259
+
+# Finished jobs listed by GET /scraper/jobs
+RECENT_JOBS = 20
+
+# Status reported before any job has run
+DEFAULT_STATUS = {
+    "running": False,
+    "progress": 0,
+    "current_site": "",
+    "active_sites": [],
+    "total_imported": 0,
+    "sites_completed": 0,
+    "sites_total": 0
+}
+
+
+class JobStore(SqliteStore):
+    """
+    Scrape jobs shared between the web processes and the worker process
+
+    The web tier queues jobs and requests stops; the worker claims queued
+    jobs, runs them and writes their status back. Because everything goes
+    through data/dredger.db, any number of web processes see the same runs.
+    Jobs of different site lists can run at the same time; a site list has
+    at most one job queued or running.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS scrape_jobs (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            site_list TEXT NOT NULL,
+            resume INTEGER NOT NULL DEFAULT 0,
+            state TEXT NOT NULL,
+            stop_requested INTEGER NOT NULL DEFAULT 0,
+            status TEXT,
+            error TEXT,
+            worker_pid INTEGER,
+            created_at REAL NOT NULL,
+            started_at REAL,
+            finished_at REAL
+        );
+        CREATE INDEX IF NOT EXISTS scrape_jobs_state ON scrape_jobs (state);
+        CREATE TABLE IF NOT EXISTS worker (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            pid INTEGER NOT NULL,
+            heartbeat REAL NOT NULL,
+            metrics TEXT
+        );
+    """
+
+    COLUMNS = ("id", "site_list", "resume", "state", "stop_requested", "status", "error",
+               "created_at", "started_at", "finished_at")
+
+    def _row(self, row) -> dict:
+        if row is None:
+            return None
+        job = dict(zip(self.COLUMNS, row))
+        job["resume"] = bool(job["resume"])
+        job["stop_requested"] = bool(job["stop_requested"])
+        job["status"] = json.loads(job["status"]) if job["status"] else {}
+        return job
+
+    def _select(self, where: str = "", params=()) -> list:
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT {', '.join(self.COLUMNS)} FROM scrape_jobs {where}", params
+            ).fetchall()
+        return [self._row(row) for row in rows]
+
+    def create(self, site_list: str, resume: bool = False) -> int:
+        """
+        Queue a scrape of a site list
+
+        Args:
+            site_list: Site list filename in data/
+            resume: Continue the interrupted run of this list
+
+        Returns:
+            The new job id, or None if this list already has a job queued or running
+        """
+        with self._lock:
+            # IMMEDIATE takes the write lock first, so two web processes
+            # can't both see "nothing active" and queue a run each
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                active = self._conn.execute(
+                    "SELECT COUNT(*) FROM scrape_jobs WHERE site_list = ? AND state IN (?, ?)",
+                    (site_list,) + ACTIVE_STATES
+                ).fetchone()[0]
+                if active:
+                    self._conn.rollback()
+                    return None
+                cursor = self._conn.execute(
+                    "INSERT INTO scrape_jobs (site_list, resume, state, created_at) "
+                    "VALUES (?, ?, ?, ?)",
+                    (site_list, int(resume), JOB_QUEUED, time.time()),
+                )
+                self._conn.commit()
+                return cursor.lastrowid
+            except Exception:
+                self._conn.rollback()
+                raise
+
+    def get(self, job_id: int) -> dict:
+        """Return a job by id (None if unknown)"""
+        jobs = self._select("WHERE id = ?", (job_id,))
+        return jobs[0] if jobs else None
+
+    def current(self) -> dict:
+        """Return the newest active job, or the most recent one if none is active"""
+        jobs = self._select(
+            "ORDER BY state IN (?, ?) DESC, id DESC LIMIT 1", ACTIVE_STATES
+        )
+        return jobs[0] if jobs else None
+
+    def active(self) -> list:
+        """Return the queued and running jobs, oldest first"""
+        return self._select("WHERE state IN (?, ?) ORDER BY id", ACTIVE_STATES)
+
+    def recent(self, limit: int = RECENT_JOBS) -> list:
+        """Return the active jobs plus the latest finished ones, newest first"""
+        return self._select(
+            "WHERE state IN (?, ?) OR id IN "
+            "(SELECT id FROM scrape_jobs WHERE state NOT IN (?, ?) ORDER BY id DESC LIMIT ?) "
+            "ORDER BY id DESC",
+            ACTIVE_STATES + ACTIVE_STATES + (limit,)
+        )
+
+    def request_stop(self, job_id: int) -> bool:
+        """
+        Ask the worker to stop a job (a queued job is cancelled right away)
+
+        Returns:
+            True if the job was queued or running
+        """
+        with self._lock, self._conn:
+            cancelled = self._conn.execute(
+                "UPDATE scrape_jobs SET state = ?, stop_requested = 1, finished_at = ? "
+                "WHERE id = ? AND state = ?",
+                (JOB_STOPPED, time.time(), job_id, JOB_QUEUED),
+            ).rowcount
+            flagged = self._conn.execute(
+                "UPDATE scrape_jobs SET stop_requested = 1 WHERE id = ? AND state = ?",
+                (job_id, JOB_RUNNING),
+            ).rowcount
+        return bool(cancelled or flagged)
+
+    def stop_requested(self, job_id: int) -> bool:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT stop_requested FROM scrape_jobs WHERE id = ?", (job_id,)
+            ).fetchone()
+        return bool(row and row[0])
+
+    def claim_next(self) -> dict:
+        """Mark the oldest queued job as running in this process and return it"""
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                "SELECT id FROM scrape_jobs WHERE state = ? ORDER BY id LIMIT 1", (JOB_QUEUED,)
+            ).fetchone()
+            if not row:
+                return None
+            claimed = self._conn.execute(
+                "UPDATE scrape_jobs SET state = ?, worker_pid = ?, started_at = ? "
+                "WHERE id = ? AND state = ?",
+                (JOB_RUNNING, os.getpid(), time.time(), row[0], JOB_QUEUED),
+            ).rowcount
+        return self.get(row[0]) if claimed else None
+
+    def set_status(self, job_id: int, status: dict):
+        """Store the scraper status of a running job"""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE scrape_jobs SET status = ? WHERE id = ?", (json.dumps(status), job_id)
+            )
+
+    def finish(self, job_id: int, state: str, error: str = None):
+        """Record how a job ended"""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE scrape_jobs SET state = ?, error = ?, finished_at = ? WHERE id = ?",
+                (state, error, time.time(), job_id),
+            )
+
+    def register_worker(self) -> int:
+        """
+        Become the worker process, unless another live worker already is
+
+        The check and the claim happen in one write transaction, so two
+        workers starting together can't both win.
+
+        Returns:
+            None if this process is now the worker, else the pid of the
+            worker that is still running
+        """
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._conn.execute(
+                    "SELECT pid, heartbeat FROM worker WHERE id = 1"
+                ).fetchone()
+                if row and row[0] != os.getpid() and _worker_running(*row):
+                    self._conn.rollback()
+                    return row[0]
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO worker (id, pid, heartbeat) VALUES (1, ?, ?)",
+                    (os.getpid(), time.time()),
+                )
+                self._conn.commit()
+                return None
+            except Exception:
+                self._conn.rollback()
+                raise
+
+    def recover(self) -> int:
+        """
+        Mark jobs left running by a worker that died as interrupted
+
+        Called by a worker on startup, after register_worker() and before
+        it claims anything.
+
+        Returns:
+            Number of jobs marked
+        """
+        with self._lock, self._conn:
+            return self._conn.execute(
+                "UPDATE scrape_jobs SET state = ?, finished_at = ? WHERE state = ?",
+                (JOB_INTERRUPTED, time.time(), JOB_RUNNING),
+            ).rowcount
+
+    def heartbeat(self, metrics: str = None):
+        """Record that the worker process is alive, with its latest metrics"""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO worker (id, pid, heartbeat, metrics) VALUES (1, ?, ?, ?)",
+                (os.getpid(), time.time(), metrics),
+            )
+
+    def status(self) -> dict:
+        """
+        Return job_status() of the current job, plus a summary of every
+        active job under "jobs"
+        """
+        worker = self.worker()
+        status = job_status(self.current(), worker)
+        status["jobs"] = [job_summary(job) for job in self.active()]
+        return status
+
+    def worker(self) -> dict:
+        """Return the worker's pid, whether it is alive and its last metrics (None if never seen)"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT pid, heartbeat, metrics FROM worker WHERE id = 1"
+            ).fetchone()
+        if not row:
+            return None
+        pid, heartbeat, metrics = row
+        return {
+            "pid": pid,
+            "alive": time.time() - heartbeat < WORKER_TIMEOUT,
+            "metrics": metrics or "",
+        }
+
+
+def _worker_running(pid: int, heartbeat: float) -> bool:
+    """Check whether a registered worker is still alive (recent heartbeat, process exists)"""
+    if time.time() - heartbeat >= WORKER_TIMEOUT:
+        return False
+    return _process_exists(pid)
+
+
+def _process_exists(pid: int) -> bool:
+    """Check whether a process id belongs to a running process"""
+    if os.name == "nt":
+        # os.kill(pid, 0) would send CTRL_C_EVENT on Windows
+        return _windows_process_exists(pid)
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except OSError:
+        # Exists but belongs to another user
+        pass
+    return True
+
+
+def _windows_process_exists(pid: int) -> bool:
+    """Check a process id through OpenProcess / GetExitCodeProcess"""
+    import ctypes
+    from ctypes import wintypes
+
+    kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)
+    kernel32.OpenProcess.restype = wintypes.HANDLE
+    kernel32.OpenProcess.argtypes = (wintypes.DWORD, wintypes.BOOL, wintypes.DWORD)
+    kernel32.GetExitCodeProcess.argtypes = (wintypes.HANDLE, ctypes.POINTER(wintypes.DWORD))
+    kernel32.CloseHandle.argtypes = (wintypes.HANDLE,)
+
+    handle = kernel32.OpenProcess(PROCESS_QUERY_LIMITED_INFORMATION, False, pid)
+    if not handle:
+        # Exists but belongs to another user; any other error means it is gone
+        return ctypes.get_last_error() == ERROR_ACCESS_DENIED
+    try:
+        code = wintypes.DWORD()
+        if not kernel32.GetExitCodeProcess(handle, ctypes.byref(code)):
+            return True
+        return code.value == STILL_ACTIVE
+    finally:
+        kernel32.CloseHandle(handle)
+
+
+def job_status(job: dict, worker: dict = None) -> dict:
+    """
+    Build the status shown by the dashboard for a job
+
+    Args:
+        job: Job from JobStore (None before the first run)
+        worker: JobStore.worker() result
+
+    Returns:
+        The scraper status plus job_id, job_state, site_list and worker_alive
+    """
+    status = dict(DEFAULT_STATUS)
+    status["worker_alive"] = bool(worker and worker["alive"])
+    if not job:
+        return status
+
+    status.update(job["status"])
+    # A job the worker just claimed has no scraper status yet
+    status["running"] = job["state"] == JOB_RUNNING and job["status"].get("running", True)
+    status.update(job_id=job["id"], job_state=job["state"], site_list=job["site_list"],
+                  error=job["error"])
+    return status
+
+
+def job_summary(job: dict) -> dict:
+    """Return the id, site list, state and progress of a job for job lists"""
+    return {
+        "job_id": job["id"],
+        "site_list": job["site_list"],
+        "state": job["state"],
+        "progress": job["status"].get("progress", 0),
+        "total_imported": job["status"].get("total_imported", 0),
+        "sites_completed": job["status"].get("sites_completed", 0),
+        "sites_total": job["status"].get("sites_total", 0),
+        "error": job["error"],
+        "created_at": job["created_at"],
+        "started_at": job["started_at"],
+        "finished_at": job["finished_at"],
+    }
@@ -0,0 +1,404 @@
+import atexit
+import json
+import logging
+import os
+import queue
+import re
+import threading
+import time
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from pathlib import Path
+from urllib.parse import urlparse
+
+# Structured fields a record may carry (passed with `extra=`)
+RECORD_FIELDS = ("run_id", "site", "url", "stage", "duration")
+
+# Rotate logs/scraper.log at this size, keeping LOG_BACKUPS old files
+LOG_MAX_BYTES = 10 * 1024 * 1024
+LOG_BACKUPS = 5
+
+# Lines a single site may log in a burst before site_log_rate applies
+SITE_LOG_BURST = 20
+
+# Bytes read per backwards seek
+READ_BLOCK_SIZE = 64 * 1024
+
+# Most bytes a single filtered page request scans before returning
+MAX_SCAN_BYTES = 8 * 1024 * 1024
+
+# Plain-text lines: "2026-01-31 12:00:00,123 - INFO - 1a2b3c4d - message"
+# (older lines have no run id)
+_LINE_RE = re.compile(
+    r'^(?P<time>\d{4}-\d\d-\d\d \d\d:\d\d:\d\d,\d+) - (?P<level>[A-Z]+) - '
+    r'(?:(?P<run_id>[0-9a-f]{8}|-) - )?(?P<message>.*)$'
+)
+
+# Run id per thread, so concurrent scrape jobs tag their own lines
+_run_context = threading.local()
+_listener = None
+
+
+def set_run_id(run_id: str = None):
+    """
+    Tag log records written from now on by this thread with a scraper run id
+
+    Threads started by a run (pipeline stages, thread pools) pick it up with
+    current_run_id() and set it again. None clears it.
+    """
+    _run_context.run_id = run_id
+
+
+def current_run_id() -> str:
+    """Return the run id of the calling thread (None outside a run)"""
+    return getattr(_run_context, 'run_id', None)
+
+
+class RunIdFilter(logging.Filter):
+    """Add the current run id to every record so lines can be filtered by run"""
+
+    def filter(self, record):
+        if not getattr(record, 'run_id', None):
+            record.run_id = current_run_id()
+        return True
+
+
+class SiteRateLimitFilter(logging.Filter):
+    """
+    Token bucket per site for INFO and DEBUG records
+
+    A site logging more than `rate` lines per second (after a burst of
+    SITE_LOG_BURST) has its extra lines dropped; the next line let through
+    says how many were suppressed. Warnings and errors always pass.
+    Sites are keyed by host, so lines tagged with a site and lines tagged
+    with one of its URLs share a bucket.
+    """
+
+    def __init__(self, rate: float = 0):
+        super().__init__()
+        self.rate = rate
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record):
+        if self.rate <= 0 or record.levelno >= logging.WARNING:
+            return True
+        site = urlparse(getattr(record, 'site', None) or getattr(record, 'url', None) or '').netloc
+        if not site:
+            return True
+
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated, suppressed = self._buckets.get(site, (SITE_LOG_BURST, now, 0))
+            tokens = min(SITE_LOG_BURST, tokens + (now - updated) * self.rate)
+            if tokens < 1:
+                self._buckets[site] = (tokens, now, suppressed + 1)
+                return False
+            self._buckets[site] = (tokens - 1, now, 0)
+
+        if suppressed:
+            record.msg = f"{record.getMessage()} ({suppressed} lines suppressed)"
+            record.args = None
+        return True
+
+    def pop_suppressed(self) -> dict:
+        """Return host -> lines dropped since the last line let through, and reset"""
+        with self._lock:
+            suppressed = {
+                site: count for site, (_, _, count) in self._buckets.items() if count
+            }
+            self._buckets = {}
+        return suppressed
+
+
+SITE_RATE_LIMIT = SiteRateLimitFilter()
+
+
+def set_site_log_rate(rate: float):
+    """Set the per-site log line rate (lines/second, 0 = unlimited)"""
+    SITE_RATE_LIMIT.rate = rate
+
+
+def log_suppressed(logger: logging.Logger):
+    """Log how many lines each site had dropped that no later line reported"""
+    for site, count in sorted(SITE_RATE_LIMIT.pop_suppressed().items()):
+        logger.info(f"[Logs] {count} lines from {site} suppressed")
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line with the structured fields of the record"""
+
+    def format(self, record):
+        entry = {
+            "time": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for field in RECORD_FIELDS:
+            value = getattr(record, field, None)
+            if value is not None:
+                entry[field] = round(value, 3) if field == "duration" else value
+        if record.exc_info:
+            entry["error"] = self.formatException(record.exc_info)
+        return json.dumps(entry)
+
+
+def configure_logging(log_file: Path = None):
+    """
+    Log JSON lines to a size-rotated file and plain messages to the console
+
+    Records are put on a queue and written by a background listener thread,
+    so logging never blocks a scraper worker on file I/O. Only one process
+    (the scrape worker) should write the log file, as rotation isn't safe
+    across processes.
+
+    Args:
+        log_file: Path of the active log file (None logs to the console only)
+    """
+    global _listener
+    if _listener:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+    else:
+        atexit.register(_stop_listener)
+
+    console_handler = logging.StreamHandler()
+    console_handler.setFormatter(logging.Formatter('%(message)s'))
+    handlers = [console_handler]
+    if log_file:
+        file_handler = RotatingFileHandler(
+            log_file, maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUPS, encoding='utf-8'
+        )
+        file_handler.setFormatter(JsonFormatter())
+        handlers.insert(0, file_handler)
+
+    records = queue.SimpleQueue()
+    queue_handler = QueueHandler(records)
+    queue_handler.addFilter(RunIdFilter())
+    queue_handler.addFilter(SITE_RATE_LIMIT)
+
+    root = logging.getLogger()
+    root.setLevel(logging.INFO)
+    root.handlers = [queue_handler]
+
+    _listener = QueueListener(records, *handlers)
+    _listener.start()
+
+
+def _stop_listener():
+    """Write out queued records at exit"""
+    if _listener:
+        _listener.stop()
+
+
+def parse_line(line: str) -> dict:
+    """
+    Split a log line into its fields
+
+    Returns:
+        Dict with time, level, run_id and message, plus site/url/stage/duration
+        for JSON lines (time/level/run_id are None for lines not written by
+        the logging module, e.g. tracebacks)
+    """
+    if line.startswith('{'):
+        try:
+            entry = json.loads(line)
+        except ValueError:
+            entry = None
+        if isinstance(entry, dict):
+            entry.setdefault("run_id", None)
+            entry.setdefault("message", "")
+            return entry
+
+    match = _LINE_RE.match(line)
+    if not match:
+        return {"time": None, "level": None, "run_id": None, "message": line.rstrip("\n")}
+    fields = match.groupdict()
+    if fields["run_id"] == '-':
+        fields["run_id"] = None
+    return fields
+
+
+def display_line(line: str) -> str:
+    """Render a JSON log line as "time - LEVEL - run id - message" for the logs page"""
+    if not line.startswith('{'):
+        return line
+    fields = parse_line(line)
+    if fields.get("time") is None:
+        return line
+    text = f"{fields['time']} - {fields.get('level')} - {fields['run_id'] or '-'} - {fields['message']}"
+    if fields.get("error"):
+        text += "\n" + fields["error"]
+    return text + "\n"
+
+
+def log_event(line: str) -> dict:
+    """
+    Build the "log" event payload for one log line
+
+    Carries the displayed text plus the fields _matches() filters on, so
+    the logs page filters live lines the same way as paged ones.
+    """
+    fields = parse_line(line)
+    return {
+        "text": display_line(line),
+        "level": fields.get("level"),
+        "run_id": fields.get("run_id"),
+        "site": fields.get("site"),
+        "message": fields.get("message") or "",
+    }
+
+
+def _line_start(f, offset: int) -> int:
+    """Return the start of the line containing byte `offset` (`offset` itself at a line start)"""
+    position = offset
+    while position > 0:
+        size = min(READ_BLOCK_SIZE, position)
+        f.seek(position - size)
+        newline = f.read(size).rfind(b"\n")
+        if newline >= 0:
+            return position - size + newline + 1
+        position -= size
+    return 0
+
+
+def _lines_backwards(f, end: int):
+    """
+    Yield (offset, line) for the lines before `end`, newest first
+
+    `end` must be a line start; `offset` is where each yielded line starts.
+    """
+    position = end
+    tail = b""
+    while position > 0:
+        size = min(READ_BLOCK_SIZE, position)
+        position -= size
+        f.seek(position)
+        chunk = f.read(size) + tail
+
+        # Bytes before the first newline belong to a line that starts in an earlier block
+        base = position
+        if position > 0:
+            newline = chunk.find(b"\n")
+            if newline < 0:
+                tail = chunk
+                continue
+            tail, chunk = chunk[:newline + 1], chunk[newline + 1:]
+            base += newline + 1
+
+        lines = chunk.split(b"\n")[:-1]
+        offsets = []
+        for line in lines:
+            offsets.append(base)
+            base += len(line) + 1
+        yield from zip(reversed(offsets), reversed(lines))
+
+
+def tail_lines(log_file: Path, count: int = 500) -> list:
+    """
+    Return the last `count` lines of a log file without reading all of it
+
+    Args:
+        log_file: Path to the log file
+        count: Number of lines
+
+    Returns:
+        Lines oldest first, each ending in a newline
+    """
+    return read_page(log_file, limit=count)["lines"]
+
+
+def _matches(line: str, level: str, site: str, run_id: str) -> bool:
+    if not (level or site or run_id):
+        return True
+    fields = parse_line(line)
+    if level and fields["level"] != level:
+        return False
+    if run_id and fields["run_id"] != run_id:
+        return False
+    if site and site not in (fields.get("site") or "") and site not in fields["message"]:
+        return False
+    return True
+
+
+def read_page(log_file: Path, before: int = None, limit: int = 200,
+              level: str = None, site: str = None, run_id: str = None) -> dict:
+    """
+    Read one page of log lines going backwards from a byte offset
+
+    Args:
+        log_file: Path to the log file
+        before: Byte offset to read backwards from (None = end of file)
+        limit: Maximum lines returned
+        level: Only lines of this level (e.g. "ERROR")
+        site: Only lines whose message contains this text
+        run_id: Only lines logged during this scraper run
+
+    Returns:
+        Dict with:
+            lines: Matching lines, oldest first
+            before: Offset to pass for the next (older) page, None at the
+                start of the file
+            end: Offset of the end of the last complete line, for polling
+                new lines with read_after()
+    """
+    log_file = Path(log_file)
+    if not log_file.exists():
+        return {"lines": [], "before": None, "end": 0}
+
+    level = level.upper() if level else None
+    with open(log_file, 'rb') as f:
+        # An unfinished last line is left for the next read
+        end = _line_start(f, f.seek(0, os.SEEK_END))
+        start = end if before is None else _line_start(f, max(0, min(before, end)))
+
+        lines = []
+        next_before = None
+        scanned = 0
+        for offset, raw in _lines_backwards(f, start):
+            scanned += len(raw) + 1
+            line = raw.decode('utf-8', errors='replace') + "\n"
+            if _matches(line, level, site, run_id):
+                lines.append(display_line(line))
+            if len(lines) >= limit or scanned >= MAX_SCAN_BYTES:
+                next_before = offset or None
+                break
+
+    lines.reverse()
+    return {"lines": lines, "before": next_before, "end": end}
+
+
+def read_after(log_file: Path, after: int, limit: int = 1000,
+               level: str = None, site: str = None, run_id: str = None) -> dict:
+    """
+    Read complete lines written after a byte offset
+
+    Args:
+        log_file: Path to the log file
+        after: Offset returned as "end" by an earlier call
+        limit: Maximum lines returned
+        level, site, run_id: Filters as for read_page()
+
+    Returns:
+        Dict with lines and "end", the offset to pass next time. If the file
+        shrank (rotated), reading restarts at the beginning.
+    """
+    log_file = Path(log_file)
+    if not log_file.exists():
+        return {"lines": [], "end": 0}
+
+    level = level.upper() if level else None
+    with open(log_file, 'rb') as f:
+        size = f.seek(0, os.SEEK_END)
+        position = after if 0 <= after <= size else 0
+        f.seek(position)
+        lines = []
+        for raw in f:
+            if not raw.endswith(b"\n") or len(lines) >= limit:
+                break
+            position += len(raw)
+            line = raw.decode('utf-8', errors='replace')
+            if _matches(line, level, site, run_id):
+                lines.append(display_line(line))
+    return {"lines": lines, "end": position}
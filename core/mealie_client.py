@@ -1,20 +1,46 @@
+import logging
+import time
 import requests
+from core.http_session import create_session
+from core.import_result import FAILED, IMPORTED, REJECTED, UNKNOWN, classify_status
+from core.paging import fetch_pages
+from core.retry import RetryPolicy, sent_nothing
+
+logger = logging.getLogger(__name__)
 
 
 class MealieClient:
     """Client for interacting with Mealie API"""
 
-    def __init__(self, url: str, api_token: str):
+    # Recipe field used for incremental catalog syncs
+    UPDATED_FIELD = "dateUpdated"
+    SUPPORTS_INCREMENTAL = True
+
+    # Recipe summaries per catalog page
+    PAGE_SIZE = 1000
+
+    # Bulk import report polling
+    REPORT_POLL_INTERVAL = 2.0
+    REPORT_TIMEOUT = 600
+
+    def __init__(self, url: str, api_token: str, session: requests.Session = None,
+                 catalog_workers: int = 4, retry_policy: RetryPolicy = None):
         """
         Initialize Mealie API client
 
         Args:
             url: Base URL of Mealie instance (e.g., http://192.168.1.79:9000)
             api_token: API token for authentication
+            session: Shared pooled session (a private one is created if omitted)
+            catalog_workers: Catalog pages fetched in parallel
+            retry_policy: Backoff for timeouts, 429 and 5xx on imports (none if omitted)
         """
         self.url = url.rstrip('/')
         self.api_token = api_token
         self.headers = {"Authorization": f"Bearer {self.api_token}"}
+        self.session = session or create_session()
+        self.catalog_workers = catalog_workers
+        self.retry_policy = retry_policy or RetryPolicy(retries=0)
 
     def test_connection(self) -> tuple:
         """
@@ -24,7 +50,7 @@ class MealieClient:
             Tuple of (success: bool, message: str)
         """
         try:
-            r = requests.get(
+            r = self.session.get(
                 f"{self.url}/api/recipes?page=1&perPage=1",
                 headers=self.headers,
                 timeout=10
@@ -49,53 +75,100 @@ class MealieClient:
         Returns:
             Set of existing recipe URLs
         """
-        print("[Mealie] Fetching existing recipes...")
+        urls, _ = self.sync_catalog()
+        return urls
+
+    @staticmethod
+    def _item_updated(item: dict) -> str:
+        """Return the best available update timestamp of a recipe summary"""
+        for key in ("dateUpdated", "updatedAt", "updateAt", "createdAt", "dateAdded"):
+            if item.get(key):
+                return str(item[key])
+        return ""
+
+    def _fetch_recipe_page(self, params: dict, page: int) -> dict:
+        """Fetch one page of recipe summaries (raises on failure)"""
+        r = self.session.get(
+            f"{self.url}/api/recipes",
+            params=dict(params, page=page),
+            headers=self.headers,
+            timeout=15,
+        )
+        r.raise_for_status()
+        return r.json()
+
+    def sync_catalog(self, since: str = None) -> tuple:
+        """
+        Fetch recipe URLs from Mealie, optionally only those changed since a watermark
+
+        Without `since` the whole catalog is downloaded. With `since`,
+        recipes are filtered server-side on their update timestamp (and
+        older ones are skipped client-side). The first page reports the
+        page count; the rest are fetched in parallel.
+
+        Args:
+            since: Update timestamp returned by a previous sync
+
+        Returns:
+            Tuple of (urls: set, watermark: str) where watermark is the newest
+            update timestamp seen (or `since` if nothing changed), or None if
+            the sync did not complete
+        """
         existing = set()
-        page = 1
+        watermark = since or ""
 
-        try:
-            # Check connection first
-            r = requests.get(
-                f"{self.url}/api/recipes?page=1&perPage=1",
-                headers=self.headers,
-                timeout=10
-            )
-            if r.status_code != 200:
-                print(f"[Mealie] Connection failed with status {r.status_code}")
-                return set()
-        except Exception as e:
-            print(f"[Mealie] Connection error: {e}")
-            return set()
+        params = {"perPage": self.PAGE_SIZE}
+        if since:
+            logger.info(f"[Mealie] Syncing recipes updated since {since}...",
+                        extra={"stage": "catalog_sync"})
+            params.update({
+                "orderBy": self.UPDATED_FIELD,
+                "orderDirection": "desc",
+                "queryFilter": f'{self.UPDATED_FIELD} >= "{since}"',
+            })
+        else:
+            logger.info("[Mealie] Downloading recipe index...", extra={"stage": "catalog_sync"})
 
-        print("[Mealie] Downloading recipe index...")
-        while True:
-            try:
-                r = requests.get(
-                    f"{self.url}/api/recipes?page={page}&perPage=1000",
-                    headers=self.headers,
-                    timeout=15,
-                )
-                if r.status_code != 200:
-                    break
+        def collect(page, data):
+            nonlocal watermark
+            for item in data.get("items", []):
+                updated = self._item_updated(item)
+                if since and updated and updated < since:
+                    continue
+                watermark = max(watermark, updated)
 
-                items = r.json().get("items", [])
-                if not items:
-                    break
+                if "orgURL" in item and item["orgURL"]:
+                    existing.add(item["orgURL"])
+                if "originalURL" in item and item["originalURL"]:
+                    existing.add(item["originalURL"])
 
-                for item in items:
-                    if "orgURL" in item and item["orgURL"]:
-                        existing.add(item["orgURL"])
-                    if "originalURL" in item and item["originalURL"]:
-                        existing.add(item["originalURL"])
+            logger.debug(f"[Mealie] Scanned page {page} (Total: {len(existing)})",
+                         extra={"stage": "catalog_sync"})
 
-                print(f"   ...scanned page {page} (Total: {len(existing)})", end="\r")
-                page += 1
-            except Exception as e:
-                print(f"\n[Mealie] Error reading index: {e}")
-                break
+        # The first page doubles as the connection check and reports the page count
+        try:
+            first = self._fetch_recipe_page(params, 1)
+        except Exception as e:
+            logger.error(f"[Mealie] Connection error: {e}", extra={"stage": "catalog_sync"})
+            return (set(), None)
+
+        collect(1, first)
+        total_pages = first.get("total_pages") or first.get("totalPages") or 1
+
+        _, failed = fetch_pages(
+            lambda page: self._fetch_recipe_page(params, page),
+            range(2, total_pages + 1),
+            workers=self.catalog_workers,
+            on_page=collect,
+        )
 
-        print(f"\n[Mealie] Found {len(existing)} existing recipe URLs")
-        return existing
+        logger.info(f"[Mealie] Found {len(existing)} {'changed' if since else 'existing'} recipe URLs",
+                    extra={"stage": "catalog_sync"})
+        if failed:
+            logger.warning(f"[Mealie] {len(failed)} of {total_pages} pages failed - index is partial",
+                           extra={"stage": "catalog_sync"})
+            return (existing, None)
+        return (existing, watermark)
 
     def import_recipe(self, url: str) -> bool:
         """
@@ -107,6 +180,18 @@ class MealieClient:
         Returns:
             True if successful, False otherwise
         """
+        return self.import_recipe_result(url) == IMPORTED
+
+    def import_recipe_result(self, url: str) -> str:
+        """
+        Import a single recipe by URL and classify the outcome
+
+        Args:
+            url: Recipe URL to import
+
+        Returns:
+            IMPORTED, REJECTED (the server refused this URL) or FAILED (transient)
+        """
         endpoint = f"{self.url}/api/recipes/create/url"
         headers = {
             "Authorization": f"Bearer {self.api_token}",
@@ -114,13 +199,125 @@ class MealieClient:
         }
 
         try:
-            r = requests.post(
+            r = self.retry_policy.send(lambda: self.session.post(
                 endpoint,
                 json={"url": url},
                 headers=headers,
                 timeout=10
-            )
-            return r.status_code == 201
+            ))
+            return classify_status(r.status_code, (201,))
+        except Exception as e:
+            logger.error(f"[Mealie] Error importing {url}: {e}",
+                         extra={"url": url, "stage": "mealie_import"})
+            return FAILED
+
+    def import_recipes_bulk(self, urls: list) -> dict:
+        """
+        Import several recipes with one request to the bulk URL endpoint
+
+        Mealie scrapes the batch in the background and writes a report with
+        one entry per URL; the report is polled until it finishes. Servers
+        without the bulk endpoint fall back to one request per URL.
+
+        The request is only sent again if it failed to connect: once Mealie
+        may have accepted a batch, resubmitting it could import every recipe
+        twice, so a lost response or report gives UNKNOWN instead.
+
+        Args:
+            urls: Recipe URLs to import
+
+        Returns:
+            Dict of url -> IMPORTED, REJECTED, FAILED or UNKNOWN
+        """
+        if not urls:
+            return {}
+
+        try:
+            r = self.retry_policy.send(lambda: self.session.post(
+                f"{self.url}/api/recipes/create/url/bulk",
+                json={"imports": [{"url": url} for url in urls]},
+                headers=self.headers,
+                timeout=30
+            ), idempotent=False)
         except Exception as e:
-            print(f"[Mealie] Error importing {url}: {e}")
-            return False
+            logger.error(f"[Mealie] Error submitting bulk import: {e}",
+                         extra={"stage": "mealie_import"})
+            return dict.fromkeys(urls, FAILED if sent_nothing(e) else UNKNOWN)
+
+        if r.status_code in (404, 405):
+            logger.warning("[Mealie] Bulk import not supported - importing one by one",
+                           extra={"stage": "mealie_import"})
+            return {url: self.import_recipe_result(url) for url in urls}
+
+        if r.status_code not in (200, 201, 202):
+            logger.error(f"[Mealie] Bulk import failed with status code {r.status_code}",
+                         extra={"stage": "mealie_import"})
+            return dict.fromkeys(urls, FAILED)
+
+        try:
+            report_id = r.json()["reportId"]
+        except Exception:
+            logger.error("[Mealie] Bulk import returned no report id",
+                         extra={"stage": "mealie_import"})
+            return dict.fromkeys(urls, UNKNOWN)
+
+        report = self._wait_for_report(report_id)
+        if report is None:
+            logger.error(f"[Mealie] Bulk import report {report_id} did not finish in time",
+                         extra={"stage": "mealie_import"})
+            return dict.fromkeys(urls, UNKNOWN)
+
+        return self._report_results(urls, report)
+
+    def _wait_for_report(self, report_id: str) -> dict:
+        """Poll a group report until it leaves the in-progress state (None on timeout)"""
+        deadline = time.monotonic() + self.REPORT_TIMEOUT
+        while True:
+            try:
+                r = self.session.get(
+                    f"{self.url}/api/groups/reports/{report_id}",
+                    headers=self.headers,
+                    timeout=10
+                )
+                if r.status_code == 200:
+                    report = r.json()
+                    if report.get("status") != "in-progress":
+                        return report
+            except Exception as e:
+                logger.warning(f"[Mealie] Error reading report {report_id}: {e}",
+                               extra={"stage": "mealie_import"})
+
+            if time.monotonic() >= deadline:
+                return None
+            time.sleep(self.REPORT_POLL_INTERVAL)
+
+    @staticmethod
+    def _report_results(urls: list, report: dict) -> dict:
+        """
+        Map the entries of a finished bulk import report back to URLs
+
+        Only failure entries name the URL they refer to ("Failed to scrape
+        url <url>"); success entries carry the recipe name instead. URLs
+        without a failure entry are therefore counted as imported, unless a
+        failure entry names no URL - then they are UNKNOWN, as resubmitting
+        them could import a recipe twice.
+        """
+        pending = set(urls)
+        results = {}
+        # A failed report without entries can't be attributed either
+        unattributed = report.get("status") == "failure" and not report.get("entries")
+        for entry in report.get("entries") or []:
+            if entry.get("success"):
+                continue
+            for word in (entry.get("message") or "").split():
+                url = word.strip("'\"<>()[],;")
+                if url in pending:
+                    results[url] = REJECTED
+                    pending.discard(url)
+                    break
+            else:
+                unattributed = True
+
+        for url in pending:
+            results[url] = UNKNOWN if unattributed else IMPORTED
+        return results
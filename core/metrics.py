@@ -0,0 +1,228 @@
+import bisect
+import threading
+import time
+
+# Latency buckets in seconds (imports and catalog syncs can take a while)
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names, values, extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class _Metric:
+    """Base class for a metric family keyed by label values"""
+
+    TYPE = ""
+
+    def __init__(self, name: str, help_text: str, labels=()):
+        self.name = name
+        self.help = help_text
+        self.labels = tuple(labels)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def _key(self, label_values: dict) -> tuple:
+        return tuple(str(label_values.get(name, "")) for name in self.labels)
+
+    def remove(self, **labels):
+        """Drop every series whose labels have these values (e.g. a finished job's)"""
+        positions = [(self.labels.index(name), str(value)) for name, value in labels.items()]
+        with self._lock:
+            for key in list(self._values):
+                if all(key[pos] == value for pos, value in positions):
+                    del self._values[key]
+
+    def render(self) -> list:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.TYPE}"]
+        with self._lock:
+            items = sorted(self._values.items())
+        for key, value in items:
+            lines.extend(self._render_value(key, value))
+        return lines
+
+    def _render_value(self, key: tuple, value) -> list:
+        return [f"{self.name}{_format_labels(self.labels, key)} {value}"]
+
+
+class Counter(_Metric):
+    """Monotonically increasing value"""
+
+    TYPE = "counter"
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+
+class Gauge(_Metric):
+    """Value that can go up and down"""
+
+    TYPE = "gauge"
+
+    def set(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+
+class Histogram(_Metric):
+    """Distribution of observed values in cumulative buckets"""
+
+    TYPE = "histogram"
+
+    def __init__(self, name: str, help_text: str, labels=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, help_text, labels)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is None:
+                # Per-bucket counts (last slot is +Inf), sum
+                entry = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0]
+            entry[0][bisect.bisect_left(self.buckets, value)] += 1
+            entry[1] += value
+
+    def _render_value(self, key: tuple, value) -> list:
+        counts, total = value
+        lines = []
+        cumulative = 0
+        for bound, count in zip(self.buckets + (float("inf"),), counts):
+            cumulative += count
+            le = 'le="%s"' % ("+Inf" if bound == float("inf") else repr(bound))
+            lines.append(f"{self.name}_bucket{_format_labels(self.labels, key, le)} {cumulative}")
+        labels = _format_labels(self.labels, key)
+        lines.append(f"{self.name}_sum{labels} {total}")
+        lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    """Process-wide set of metrics rendered in the Prometheus text format"""
+
+    def __init__(self):
+        self._metrics = []
+
+    def _register(self, metric: _Metric) -> _Metric:
+        self._metrics.append(metric)
+        return metric
+
+    def counter(self, name: str, help_text: str, labels=()) -> Counter:
+        return self._register(Counter(name, help_text, labels))
+
+    def gauge(self, name: str, help_text: str, labels=()) -> Gauge:
+        return self._register(Gauge(name, help_text, labels))
+
+    def histogram(self, name: str, help_text: str, labels=(), buckets=DEFAULT_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, help_text, labels, buckets))
+
+    def render(self) -> str:
+        """Return every metric in the Prometheus text exposition format"""
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+# Stages: sitemap_fetch, verify_fetch, detect, mealie_import, tandoor_import, catalog_sync
+STAGE_SECONDS = REGISTRY.histogram(
+    "dredger_stage_duration_seconds",
+    "Time spent per scrape stage operation",
+    ["stage", "host", "result"],
+)
+DOWNLOADED_BYTES = REGISTRY.counter(
+    "dredger_downloaded_bytes_total",
+    "Response body bytes downloaded",
+    ["stage", "host"],
+)
+IMPORTS = REGISTRY.counter(
+    "dredger_imports_total",
+    "Recipe import outcomes per service",
+    ["service", "result"],
+)
+QUEUE_DEPTH = REGISTRY.gauge(
+    "dredger_queue_depth",
+    "Items waiting in each pipeline stage queue",
+    ["job", "stage"],
+)
+SCRAPER_STATUS = REGISTRY.gauge(
+    "dredger_scraper",
+    "Current scraper run counters, per scrape job",
+    ["job", "field"],
+)
+
+
+class StageTimer:
+    """
+    Context manager that records one stage operation in STAGE_SECONDS
+
+    Set `result` inside the block; an exception records result="error".
+    `duration` holds the elapsed seconds once the block has exited.
+
+        with StageTimer("sitemap_fetch", host) as timer:
+            ...
+            timer.result = str(status)
+    """
+
+    def __init__(self, stage: str, host: str):
+        self.stage = stage
+        self.host = host
+        self.result = "ok"
+        self.duration = 0.0
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is not None:
+            self.result = "error"
+        self.duration = time.perf_counter() - self.started
+        STAGE_SECONDS.observe(
+            self.duration, stage=self.stage, host=self.host, result=self.result,
+        )
+        return False
+
+
+class MeteredFeed:
+    """
+    Wrap a body-chunk consumer to count bytes and time spent consuming
+
+    Used for the detector (whose time is the "detect" stage) and for
+    sitemap parsing (bytes only).
+    """
+
+    def __init__(self, feed):
+        self.feed = feed
+        self.bytes = 0
+        self.seconds = 0.0
+
+    def __call__(self, chunk: bytes) -> bool:
+        self.bytes += len(chunk)
+        started = time.perf_counter()
+        try:
+            return self.feed(chunk)
+        finally:
+            self.seconds += time.perf_counter() - started
+
+
+def record_detect(meter: MeteredFeed, host: str, found: bool):
+    """Record the bytes and detector time of one verified page"""
+    DOWNLOADED_BYTES.inc(meter.bytes, stage="verify_fetch", host=host)
+    if meter.bytes:
+        STAGE_SECONDS.observe(
+            meter.seconds, stage="detect", host=host,
+            result="recipe" if found else "no_recipe",
+        )
@@ -0,0 +1,94 @@
+import time
+from pathlib import Path
+from core.state_store import SqliteStore
+from core.urls import CANONICAL_VERSION, canonical_url
+
+# Reason codes
+NOT_RECIPE = "not_recipe"          # Page loaded but has no recipe markup
+GONE = "gone"                      # Page returned 404/410
+IMPORT_REJECTED = "import_rejected"  # Every enabled service refused the import
+
+
+class NegativeCache(SqliteStore):
+    """
+    Persistent store of URLs known not to be importable recipes
+
+    Entries expire after their TTL so pages that later gain a recipe (or
+    imports that start working) are eventually retried. URLs are stored in
+    canonical_url() form.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS negative_urls (
+            url TEXT PRIMARY KEY,
+            reason TEXT NOT NULL,
+            recorded_at REAL NOT NULL,
+            expires_at REAL NOT NULL
+        ) WITHOUT ROWID;
+
+        CREATE TABLE IF NOT EXISTS negative_meta (
+            key TEXT PRIMARY KEY,
+            value TEXT
+        ) WITHOUT ROWID;
+    """
+
+    def __init__(self, db_path: Path = None):
+        super().__init__(db_path)
+        self._canonicalize()
+
+    def _canonicalize(self):
+        """Rewrite URLs stored before (or under an older) canonical_url() once"""
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                "SELECT value FROM negative_meta WHERE key = 'canonical_version'"
+            ).fetchone()
+            if row and row[0] == CANONICAL_VERSION:
+                return
+            rows = self._conn.execute(
+                "SELECT url, reason, recorded_at, expires_at FROM negative_urls"
+            ).fetchall()
+            self._conn.execute("DELETE FROM negative_urls")
+            # Oldest first, so the latest verdict on a merged URL wins
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO negative_urls (url, reason, recorded_at, expires_at) "
+                "VALUES (?, ?, ?, ?)",
+                ((canonical_url(url), reason, recorded_at, expires_at)
+                 for url, reason, recorded_at, expires_at in sorted(rows, key=lambda row: row[2])),
+            )
+            self._conn.execute(
+                "INSERT OR REPLACE INTO negative_meta (key, value) VALUES ('canonical_version', ?)",
+                (CANONICAL_VERSION,),
+            )
+
+    def record(self, url: str, reason: str, ttl_days: float):
+        """
+        Remember a URL as not worth fetching again
+
+        Args:
+            url: URL that failed
+            reason: One of the reason codes in this module
+            ttl_days: Days until the URL is retried
+        """
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO negative_urls (url, reason, recorded_at, expires_at) "
+                "VALUES (?, ?, ?, ?)",
+                (canonical_url(url), reason, now, now + ttl_days * 86400),
+            )
+
+    def active_urls(self) -> set:
+        """Return all unexpired URLs, canonical (expired entries are purged first)"""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM negative_urls WHERE expires_at < ?", (time.time(),))
+            rows = self._conn.execute("SELECT url FROM negative_urls").fetchall()
+        return {row[0] for row in rows}
+
+    def reason(self, url: str) -> str:
+        """Return the reason code for an unexpired URL (None if not cached)"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT reason FROM negative_urls WHERE url = ? AND expires_at >= ?",
+                (canonical_url(url), time.time()),
+            ).fetchone()
+        return row[0] if row else None
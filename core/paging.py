@@ -0,0 +1,48 @@
+import logging
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+logger = logging.getLogger(__name__)
+
+
+def fetch_pages(fetch_page, pages, workers: int = 4, retries: int = 1, on_page=None) -> tuple:
+    """
+    Fetch numbered API pages in parallel with bounded concurrency
+
+    A page that still fails after its retries is reported back instead of
+    aborting the other pages.
+
+    Args:
+        fetch_page: Callable(page: int) -> items; raises on failure
+        pages: Page numbers to fetch
+        workers: Maximum pages in flight
+        retries: Extra attempts per failed page
+        on_page: Optional callback(page, items) run on the calling thread
+
+    Returns:
+        Tuple of (results: dict page -> items, failed: list of page numbers)
+    """
+    results = {}
+    failed = []
+
+    def attempt(page):
+        for attempt_no in range(retries + 1):
+            try:
+                return fetch_page(page)
+            except Exception:
+                if attempt_no == retries:
+                    raise
+
+    with ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="catalog") as pool:
+        futures = {pool.submit(attempt, page): page for page in pages}
+        for future in as_completed(futures):
+            page = futures[future]
+            try:
+                results[page] = future.result()
+            except Exception as e:
+                logger.warning(f"[Catalog] Page {page} failed: {e}", extra={"stage": "catalog_sync"})
+                failed.append(page)
+                continue
+            if on_page:
+                on_page(page, results[page])
+
+    return (results, sorted(failed))
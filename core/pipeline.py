@@ -0,0 +1,261 @@
+import logging
+import queue
+import threading
+import time
+from collections import OrderedDict, deque
+from core.log_files import current_run_id, set_run_id
+
+logger = logging.getLogger(__name__)
+
+# Put on a stage queue once per worker to tell it no more input is coming
+_END = object()
+
+
+class FairQueue:
+    """
+    Bounded stage queue with a FIFO per key, served round-robin
+
+    get() hands out the oldest item of the next key whose gate lets it go,
+    so items of a key that has to wait (a throttled host, a site without a
+    free slot) never hold up the items of other keys queued behind them.
+    Items handed out count as taken for their key until done() is called.
+    """
+
+    def __init__(self, maxsize: int, key, gate=None, poll: float = 0.5):
+        """
+        Args:
+            maxsize: Maximum items waiting across all keys
+            key: Callable(item) -> hashable key the item is queued under
+            gate: Optional Callable(item, taken: int) -> float or None, asked
+                (under the queue's lock) whether the oldest item of a key may
+                go: 0 hands it out, a number of seconds asks again then, None
+                waits for done() or wake()
+            poll: Longest wait before the gates are asked again
+        """
+        self.maxsize = max(1, maxsize)
+        self.key = key
+        self.gate = gate
+        self.poll = poll
+        # key -> deque of items, in the order the keys are served
+        self._queues = OrderedDict()
+        self._taken = {}
+        self._size = 0
+        # End-of-input markers, handed out once every item is gone
+        self._ends = 0
+        self._changed = threading.Condition()
+
+    def qsize(self) -> int:
+        """Return the number of items waiting"""
+        with self._changed:
+            return self._size
+
+    def put(self, item):
+        """Queue an item, blocking while the queue is full"""
+        with self._changed:
+            if item is _END:
+                self._ends += 1
+            else:
+                while self._size >= self.maxsize:
+                    self._changed.wait()
+                self._queues.setdefault(self.key(item), deque()).append(item)
+                self._size += 1
+            self._changed.notify_all()
+
+    def get(self, timeout: float = None):
+        """
+        Take the next item a gate lets go
+
+        Raises:
+            queue.Empty: If no item could go within `timeout` seconds
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._changed:
+            while True:
+                item, wait = self._take()
+                if item is not None:
+                    return item
+                if not self._size and self._ends:
+                    self._ends -= 1
+                    return _END
+
+                wait = self.poll if wait is None else min(wait, self.poll)
+                if deadline is not None:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise queue.Empty
+                    wait = min(wait, remaining)
+                self._changed.wait(wait)
+
+    def _take(self) -> tuple:
+        """Return (item, None) for the next item allowed to go, else (None, seconds to wait)"""
+        soonest = None
+        for key, items in self._queues.items():
+            wait = self.gate(items[0], self._taken.get(key, 0)) if self.gate else 0
+            if wait is None:
+                continue
+            if wait <= 0:
+                item = items.popleft()
+                self._size -= 1
+                self._taken[key] = self._taken.get(key, 0) + 1
+                # The key goes to the back of the line
+                if items:
+                    self._queues.move_to_end(key)
+                else:
+                    del self._queues[key]
+                self._changed.notify_all()
+                return (item, None)
+            soonest = wait if soonest is None else min(soonest, wait)
+        return (None, soonest)
+
+    def done(self, items: list):
+        """Release items handed out by get() once they are handled"""
+        with self._changed:
+            for item in items:
+                key = self.key(item)
+                self._taken[key] -= 1
+                if not self._taken[key]:
+                    del self._taken[key]
+            self._changed.notify_all()
+
+    def wake(self):
+        """Ask the gates again, e.g. after something they depend on changed"""
+        with self._changed:
+            self._changed.notify_all()
+
+
+class Stage:
+    """
+    A pool of worker threads fed through a bounded queue
+
+    put() blocks while the queue is full, so a slow stage throttles the
+    stage feeding it instead of letting work pile up in memory. Workers can
+    take items in batches: a batch is handed over once it is full or
+    `batch_wait` seconds after its first item arrived. With a `key` the
+    queue is a FairQueue, served round-robin across keys.
+    """
+
+    def __init__(self, name: str, handler, workers: int = 1, queue_size: int = 100,
+                 batch_size: int = 1, batch_wait: float = 0.5, key=None, gate=None):
+        """
+        Args:
+            name: Thread name prefix
+            handler: Callable(items: list) run on a worker thread
+            workers: Number of worker threads
+            queue_size: Maximum items waiting in the queue
+            batch_size: Maximum items per handler call
+            batch_wait: Seconds to wait for a batch to fill up
+            key: Optional Callable(item) -> key for a round-robin FairQueue
+            gate: Optional FairQueue gate (see FairQueue), used with `key`
+        """
+        self.name = name
+        self.handler = handler
+        self.workers = max(1, workers)
+        self.batch_size = max(1, batch_size)
+        self.batch_wait = batch_wait
+        if key:
+            self.queue = FairQueue(queue_size, key, gate)
+        else:
+            self.queue = queue.Queue(maxsize=max(1, queue_size))
+        self._threads = []
+
+    def start(self):
+        """Start the worker threads (they log under the caller's run id)"""
+        run_id = current_run_id()
+        for n in range(self.workers):
+            thread = threading.Thread(
+                target=self._work, args=(run_id,), name=f"{self.name}-{n}", daemon=True
+            )
+            thread.start()
+            self._threads.append(thread)
+
+    def put(self, item):
+        """Queue an item, blocking while the queue is full"""
+        self.queue.put(item)
+
+    def wake(self):
+        """Have a FairQueue ask its gates again (no-op for a plain queue)"""
+        if isinstance(self.queue, FairQueue):
+            self.queue.wake()
+
+    def close(self):
+        """Signal the end of input and wait until every queued item is handled"""
+        for _ in self._threads:
+            self.queue.put(_END)
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+
+    def _next_batch(self) -> tuple:
+        """Return (items, finished) where finished means the input has ended"""
+        item = self.queue.get()
+        if item is _END:
+            return ([], True)
+
+        items = [item]
+        deadline = time.monotonic() + self.batch_wait
+        while len(items) < self.batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                item = self.queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if item is _END:
+                return (items, True)
+            items.append(item)
+        return (items, False)
+
+    def _work(self, run_id: str = None):
+        set_run_id(run_id)
+        finished = False
+        while not finished:
+            items, finished = self._next_batch()
+            if not items:
+                continue
+            try:
+                self.handler(items)
+            except Exception as e:
+                logger.exception(f"[Error] {self.name} stage: {e}", extra={"stage": self.name})
+            finally:
+                if isinstance(self.queue, FairQueue):
+                    self.queue.done(items)
+
+
+class ConcurrencyBudget:
+    """
+    Limit on pipeline work in progress across every scrape job of a process
+
+    Each job has its own stages and worker threads; the budget caps how many
+    of them do network work (sitemap reads, verification, imports) at once,
+    so running several jobs together doesn't multiply the load. Use it as a
+    context manager around the work - never around a put() into another
+    stage, or a full queue could hold a slot the next stage needs.
+    """
+
+    def __init__(self, limit: int):
+        """
+        Args:
+            limit: Units of work allowed at once
+        """
+        self.limit = max(1, limit)
+        self.in_use = 0
+        self._available = threading.Condition()
+
+    def set_limit(self, limit: int):
+        """Change the limit (work already running is not interrupted)"""
+        with self._available:
+            self.limit = max(1, limit)
+            self._available.notify_all()
+
+    def __enter__(self):
+        with self._available:
+            while self.in_use >= self.limit:
+                self._available.wait()
+            self.in_use += 1
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        with self._available:
+            self.in_use -= 1
+            self._available.notify()
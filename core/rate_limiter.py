@@ -0,0 +1,175 @@
+import threading
+import time
+from urllib.parse import urlparse
+
+
+def host_of(url: str) -> str:
+    """Return the host (netloc) of a URL, or the value itself if it has no scheme"""
+    if "://" not in url:
+        return url.strip().rstrip('/').lower()
+    return urlparse(url).netloc.lower()
+
+
+class TokenBucket:
+    """Thread-safe token bucket: `rate` tokens per second, up to `burst` saved"""
+
+    def __init__(self, rate: float, burst: int):
+        """
+        Initialize a full bucket
+
+        Args:
+            rate: Tokens added per second
+            burst: Maximum number of tokens the bucket can hold
+        """
+        self.rate = float(rate)
+        self.burst = max(1, int(burst))
+        self.tokens = float(self.burst)
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """
+        Take one token, going into debt if none are available
+
+        Returns:
+            Seconds the caller must wait before using the token
+        """
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= 1
+            if self.tokens >= 0:
+                return 0.0
+            return -self.tokens / self.rate
+
+    def try_reserve(self) -> float:
+        """
+        Take one token only if one is available now
+
+        Returns:
+            0 if a token was taken, otherwise seconds until one is available
+        """
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return 0.0
+            return (1 - self.tokens) / self.rate
+
+    def acquire(self):
+        """Block until a token is available"""
+        wait = self.reserve()
+        if wait > 0:
+            time.sleep(wait)
+
+
+class HostRateLimiter:
+    """
+    Token bucket per host, with per-host overrides of the default rate
+
+    A token can be taken ahead of a request with try_acquire(), e.g. by a
+    queue deciding which host to serve next; the next request to that host
+    then uses it instead of taking another.
+    """
+
+    def __init__(self, default_rate: float, default_burst: int, overrides: dict = None):
+        """
+        Initialize the limiter
+
+        Args:
+            default_rate: Requests per second for hosts without an override
+            default_burst: Burst size for hosts without an override
+            overrides: Mapping of host (or URL) -> {"requests_per_second", "burst"}
+        """
+        self.default_rate = default_rate
+        self.default_burst = default_burst
+        self.overrides = {}
+        self._buckets = {}
+        # host -> tokens taken by try_acquire() not yet used by a request
+        self._prepaid = {}
+        self._lock = threading.Lock()
+
+        for host, limits in (overrides or {}).items():
+            self.set_limit(host, limits.get('requests_per_second', default_rate),
+                           limits.get('burst', default_burst))
+
+    def set_limit(self, host: str, rate: float, burst: int):
+        """Override the rate for one host (accepts a bare host or a URL)"""
+        with self._lock:
+            host = host_of(host)
+            self.overrides[host] = (rate, burst)
+            self._buckets.pop(host, None)
+
+    def bucket(self, url: str) -> TokenBucket:
+        """Get (or create) the bucket for a URL's host"""
+        host = host_of(url)
+        with self._lock:
+            if host not in self._buckets:
+                rate, burst = self.overrides.get(host, (self.default_rate, self.default_burst))
+                self._buckets[host] = TokenBucket(rate, burst)
+            return self._buckets[host]
+
+    def reserve(self, url: str) -> float:
+        """Take a token for a URL's host and return the wait in seconds"""
+        host = host_of(url)
+        with self._lock:
+            if self._prepaid.get(host):
+                self._prepaid[host] -= 1
+                return 0.0
+        return self.bucket(url).reserve()
+
+    def try_acquire(self, url: str) -> float:
+        """
+        Take a token for a URL's host ahead of the request, if one is free now
+
+        Returns:
+            0 if a token was taken, otherwise seconds until one is free
+        """
+        wait = self.bucket(url).try_reserve()
+        if wait == 0:
+            host = host_of(url)
+            with self._lock:
+                self._prepaid[host] = self._prepaid.get(host, 0) + 1
+        return wait
+
+    def acquire(self, url: str):
+        """Block until a request to the URL's host is allowed"""
+        wait = self.reserve(url)
+        if wait > 0:
+            time.sleep(wait)
+
+
+def build_rate_limiter(config: dict) -> HostRateLimiter:
+    """
+    Build the limiter for a scrape from configuration
+
+    Recipe sites use scraper.requests_per_second / scraper.burst, with
+    per-site values from scraper.site_rate_limits. Mealie and Tandoor get
+    their own limits from their config sections.
+
+    Args:
+        config: Configuration dictionary
+
+    Returns:
+        Configured HostRateLimiter
+    """
+    scraper = config['scraper']
+    limiter = HostRateLimiter(
+        scraper.get('requests_per_second', 2.0),
+        scraper.get('burst', 5),
+        scraper.get('site_rate_limits', {}),
+    )
+
+    for service in ('mealie', 'tandoor'):
+        section = config[service]
+        if section.get('enabled') and section.get('url'):
+            limiter.set_limit(
+                section['url'],
+                section.get('requests_per_second', 5.0),
+                section.get('burst', 10),
+            )
+
+    return limiter
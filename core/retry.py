@@ -0,0 +1,171 @@
+import logging
+import random
+import threading
+import time
+import requests
+from urllib3.exceptions import ConnectTimeoutError
+
+# Responses worth retrying: rate limited or a temporary server-side problem
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+
+# Upper bound for a single backoff sleep (including Retry-After)
+MAX_BACKOFF_SECONDS = 60.0
+
+logger = logging.getLogger(__name__)
+
+
+def sent_nothing(error: Exception) -> bool:
+    """
+    Check whether a failed request never reached the server
+
+    True for failures to connect (refused, unresolvable host, connect
+    timeout): such a request can be sent again even if it isn't idempotent.
+    """
+    if isinstance(error, requests.exceptions.ConnectTimeout):
+        return True
+    if not isinstance(error, requests.exceptions.ConnectionError) or not error.args:
+        return False
+    cause = error.args[0]
+    # urllib3's NewConnectionError is a ConnectTimeoutError too
+    return isinstance(getattr(cause, "reason", cause), ConnectTimeoutError)
+
+
+class RetryPolicy:
+    """
+    Retries for timeouts, connection errors, 429 and 5xx responses
+
+    Sleeps use exponential backoff with full jitter so clients that failed
+    together don't retry in lockstep. A Retry-After header is honoured when
+    the server sends one.
+    """
+
+    def __init__(self, retries: int = 3, base_delay: float = 1.0,
+                 max_delay: float = MAX_BACKOFF_SECONDS):
+        """
+        Args:
+            retries: Extra attempts after the first one
+            base_delay: Backoff ceiling of the first retry in seconds
+            max_delay: Longest single sleep in seconds
+        """
+        self.retries = max(0, retries)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    def delay(self, attempt: int, retry_after: float = None) -> float:
+        """Seconds to sleep before retry number `attempt` (0-based)"""
+        backoff = random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+        if retry_after is not None:
+            backoff = max(backoff, min(retry_after, self.max_delay))
+        return backoff
+
+    @staticmethod
+    def _retry_after(response) -> float:
+        """Parse a Retry-After header given in seconds (dates are ignored)"""
+        try:
+            return float(response.headers.get("Retry-After"))
+        except (TypeError, ValueError):
+            return None
+
+    def send(self, request, idempotent: bool = True) -> requests.Response:
+        """
+        Run request() until it returns a final response or retries run out
+
+        Args:
+            request: Callable returning a requests.Response
+            idempotent: False for a request that must not be repeated once the
+                server may have seen it (e.g. a bulk import); it is then only
+                retried when it failed to connect (see sent_nothing)
+
+        Returns:
+            The last response (which may still be a 429/5xx)
+
+        Raises:
+            The last Timeout/ConnectionError if every attempt failed that way
+            (or the first one that may have reached a non-idempotent request's server)
+        """
+        for attempt in range(self.retries + 1):
+            last = attempt == self.retries
+            try:
+                r = request()
+            except (requests.exceptions.Timeout, requests.exceptions.ConnectionError) as e:
+                if last or not (idempotent or sent_nothing(e)):
+                    raise
+                time.sleep(self.delay(attempt))
+                continue
+
+            if last or not idempotent or r.status_code not in RETRY_STATUS_CODES:
+                return r
+            time.sleep(self.delay(attempt, self._retry_after(r)))
+
+
+class CircuitBreaker:
+    """
+    Per-service circuit breaker
+
+    After `threshold` consecutive failures the circuit opens and allow()
+    returns False for `cooldown` seconds. Then a single trial is let
+    through (half-open): success closes the circuit, failure opens it again.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, name: str, threshold: int = 5, cooldown: float = 30.0):
+        """
+        Args:
+            name: Service name used in log lines
+            threshold: Consecutive failures that open the circuit
+            cooldown: Seconds the circuit stays open
+        """
+        self.name = name
+        self.threshold = max(1, threshold)
+        self.cooldown = cooldown
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._trial_running = False
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        """Return True if a request may be sent now"""
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.OPEN and time.monotonic() - self.opened_at >= self.cooldown:
+                self.state = self.HALF_OPEN
+                self._trial_running = False
+            if self.state == self.HALF_OPEN and not self._trial_running:
+                self._trial_running = True
+                return True
+            return False
+
+    def retry_in(self) -> float:
+        """Seconds until an open circuit lets a trial request through"""
+        with self._lock:
+            if self.state != self.OPEN:
+                return 0.0
+            return max(0.0, self.cooldown - (time.monotonic() - self.opened_at))
+
+    def record_success(self):
+        """Record a response from the service (closes the circuit)"""
+        with self._lock:
+            if self.state != self.CLOSED:
+                logger.info(f"[{self.name}] Service is responding again - resuming imports")
+            self.state = self.CLOSED
+            self.failures = 0
+            self._trial_running = False
+
+    def record_failure(self):
+        """Record a failed request (may open the circuit)"""
+        with self._lock:
+            self.failures += 1
+            if self.state == self.HALF_OPEN or (
+                self.state == self.CLOSED and self.failures >= self.threshold
+            ):
+                if self.state == self.CLOSED:
+                    logger.warning(f"[{self.name}] {self.failures} failures in a row - "
+                                   f"pausing imports for {int(self.cooldown)}s")
+                self.state = self.OPEN
+                self.opened_at = time.monotonic()
+                self._trial_running = False
@@ -1,38 +1,203 @@
-import requests
+import heapq
+import logging
+import threading
 import time
-from bs4 import BeautifulSoup
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from core.checkpoint import CANDIDATE_VERIFIED, SITE_DISCOVERED, SITE_DONE, RunCheckpoint
+from core.async_engine import AsyncFetchEngine, async_engine_available
+from core.detector import RecipeDetector
+from core.http_session import create_session
+from core.log_files import log_suppressed, set_run_id, set_site_log_rate
+from core.metrics import (
+    DOWNLOADED_BYTES, IMPORTS, QUEUE_DEPTH, SCRAPER_STATUS, MeteredFeed, StageTimer, record_detect
+)
+from core.rate_limiter import build_rate_limiter, host_of
+from core.retry import CircuitBreaker, RetryPolicy
+from core.sitemap import SitemapParser, SitemapScan, parse_lastmod
+from core.sitemap_cache import (
+    MAX_CACHED_ENTRIES, SitemapCache, SitemapDiscoveryCache, SiteWatermarks
+)
+from core.import_result import DEFERRED, FAILED, IMPORTED, REJECTED, UNKNOWN
 from core.mealie_client import MealieClient
+from core.negative_cache import GONE, IMPORT_REJECTED, NOT_RECIPE, NegativeCache
+from core.pipeline import ConcurrencyBudget, Stage
 from core.tandoor_client import TandoorClient
+from core.url_index import KnownUrlSets, UrlIndex
+from core.urls import canonical_url
+
+# Sitemap entries containing any of these are never recipes
+EXCLUDED_URL_PATTERNS = [
+    "/about",
+    "/contact",
+    "/shop",
+    "/privacy",
+    "login",
+    "cart",
+    "roundup",
+]
+
+# Passes over imports that failed during the run before giving up
+DEFERRED_RETRY_ROUNDS = 3
+
+# Candidates of a site verified at once beyond its open import slots
+# (some pages turn out not to be recipes)
+VERIFY_HEADROOM = 2
+
+logger = logging.getLogger(__name__)
+
+
+class SiteJob:
+    """Progress of one site through the scrape pipeline"""
+
+    def __init__(self, index: int, site: str, target: int):
+        self.index = index
+        self.site = site
+        self.target = target
+        self.imported = 0
+        self.importing = 0
+        # Verified URLs waiting in the import queue
+        self.queued = 0
+        # Verified URLs waiting for a service to recover (see _retry_deferred)
+        self.deferred = 0
+        # Candidates still in the pipeline, plus one held by the discovery stage
+        self.outstanding = 1
+        # Continue from checkpointed candidates instead of reading the sitemap
+        self.resumed = False
+        # For the watermark: newest sitemap lastmod seen, the dated candidates
+        # as (lastmod, url) newest first, the candidates finished for good,
+        # the lastmod above which every new entry became a candidate (None:
+        # down to the watermark) and whether part of the sitemap failed
+        self.newest = None
+        self.dated = []
+        self.settled = set()
+        self.floor = None
+        self.scan_failed = False
+
+    @property
+    def satisfied(self) -> bool:
+        return self.imported >= self.target
+
+    def open_slots(self) -> int:
+        """Imports still needed once everything in flight has succeeded"""
+        return self.target - (self.imported + self.importing + self.queued + self.deferred)
 
 
 class RecipeScraper:
     """Recipe scraper that can be controlled and monitored"""
 
-    def __init__(self, config: dict, site_list: list):
+    def __init__(self, config: dict, site_list: list, url_index: UrlIndex = None,
+                 resume: bool = False, known_urls: KnownUrlSets = None,
+                 budget: ConcurrencyBudget = None, rate_limiter=None):
         """
         Initialize scraper with configuration and site list
 
         Args:
             config: Configuration dictionary
             site_list: List of site URLs to scrape
+            url_index: Persistent index of known URLs (opened from data/ if omitted)
+            resume: Continue the interrupted run of this site list if there is one
+            known_urls: Known-URL sets shared with other scrapers running at
+                the same time (private if omitted)
+            budget: Concurrency budget shared with other scrapers (private,
+                sized by scraper.total_workers, if omitted)
+            rate_limiter: Per-host limiter shared with other scrapers (built
+                from the config if omitted)
         """
         self.config = config
         self.site_list = site_list
         self.running = False
+        self.resume = resume
+
+        # Guards status and site progress across the stage workers
+        self._lock = threading.Lock()
 
         # Progress tracking
         self.status = {
             "running": False,
             "progress": 0,
             "current_site": "",
+            "active_sites": [],
             "total_imported": 0,
             "sites_completed": 0,
-            "sites_total": len(site_list)
+            "sites_total": len(site_list),
+            "sitemap_cache_hits": 0,
+            "sitemap_cache_misses": 0,
+            "run_id": None
         }
 
+        # Known URLs per service (loaded from the local index in run_scrape)
+        self.url_index = url_index or UrlIndex()
+        self._owns_url_index = url_index is None
+        self.known_urls = known_urls or KnownUrlSets()
+        self._open_targets = []
+
+        # URLs verified as non-recipes or refused by every service
+        self.negative_cache = NegativeCache()
+        self.negative_urls = set()
+
+        # Per-site lastmod high-water marks for incremental crawling
+        self.watermarks = None
+        if self.config['scraper'].get('incremental_crawl', True):
+            self.watermarks = SiteWatermarks()
+
+        # On-disk progress of the run, for resuming after an interruption
+        self.checkpoint = RunCheckpoint(site_list)
+
+        # Resolved sitemap URL (or "none") per site
+        self.discovery_cache = SitemapDiscoveryCache()
+
+        # Conditional-GET cache of parsed sitemaps
+        self.sitemap_cache = None
+        if self.config['scraper'].get('sitemap_cache', True):
+            self.sitemap_cache = SitemapCache()
+
+        # URLs known to every enabled service, for filtering candidates early
+        self.combined_existing = set()
+
         # HTTP headers
         self.headers = {"User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"}
 
+        # Per-host politeness limits for every outgoing request
+        self.rate_limiter = rate_limiter or build_rate_limiter(self.config)
+
+        # Network work in progress at once, across all stages
+        self.budget = budget or ConcurrencyBudget(
+            self.config['scraper'].get('total_workers', 16)
+        )
+
+        # Pooled keep-alive session shared by the scraper and both API clients
+        self.session = create_session(
+            pool_size=self.config['scraper'].get('pool_size', 10),
+            rate_limiter=self.rate_limiter
+        )
+
+        # Optional asyncio engine for sitemap and verify fetches (see run_scrape)
+        self.async_engine = None
+
+        # Pipeline stages (created in run_scrape)
+        self.discover_stage = None
+        self.verify_stage = None
+        self.import_stage = None
+
+        # Backoff for transient import failures and a breaker per service
+        scraper_cfg = self.config['scraper']
+        self.retry_policy = RetryPolicy(
+            retries=scraper_cfg.get('import_retries', 3),
+            base_delay=scraper_cfg.get('retry_backoff_seconds', 1.0)
+        )
+        self.breakers = {
+            service: CircuitBreaker(
+                name,
+                threshold=scraper_cfg.get('breaker_threshold', 5),
+                cooldown=scraper_cfg.get('breaker_cooldown_seconds', 30)
+            )
+            for service, name in (('mealie', "Mealie"), ('tandoor', "Tandoor"))
+        }
+
+        # url -> (job, services to retry, already counted) for failed imports
+        self._deferred = {}
+
         # Initialize API clients
         self.mealie_client = None
         self.tandoor_client = None
@@ -40,35 +205,119 @@ class RecipeScraper:
         if self.config['mealie']['enabled']:
             self.mealie_client = MealieClient(
                 self.config['mealie']['url'],
-                self.config['mealie']['api_token']
+                self.config['mealie']['api_token'],
+                session=self.session,
+                catalog_workers=self.config['scraper'].get('catalog_workers', 4),
+                retry_policy=self.retry_policy
             )
 
         if self.config['tandoor']['enabled']:
             self.tandoor_client = TandoorClient(
                 self.config['tandoor']['url'],
-                self.config['tandoor']['api_key']
+                self.config['tandoor']['api_key'],
+                session=self.session,
+                catalog_workers=self.config['scraper'].get('catalog_workers', 4),
+                retry_policy=self.retry_policy
             )
 
     def get_status(self) -> dict:
         """Get current scraper status"""
-        return self.status.copy()
+        with self._lock:
+            status = self.status.copy()
+            status["active_sites"] = list(self.status["active_sites"])
+
+        lookups = status["sitemap_cache_hits"] + status["sitemap_cache_misses"]
+        status["sitemap_cache_hit_rate"] = (
+            int(status["sitemap_cache_hits"] / lookups * 100) if lookups else 0
+        )
+        return status
+
+    def update_metrics(self, job: str = ""):
+        """
+        Publish queue depths and run counters to the metrics registry
+
+        Args:
+            job: Value of the `job` label, to tell concurrent runs apart
+        """
+        stages = (("discover", self.discover_stage), ("verify", self.verify_stage),
+                  ("import", self.import_stage))
+        for name, stage in stages:
+            QUEUE_DEPTH.set(stage.queue.qsize() if stage else 0, job=job, stage=name)
+        QUEUE_DEPTH.set(len(self._deferred), job=job, stage="retry")
+
+        status = self.get_status()
+        for field in ("running", "progress", "total_imported", "sites_completed", "sites_total",
+                      "sitemap_cache_hits", "sitemap_cache_misses"):
+            SCRAPER_STATUS.set(int(status[field]), job=job, field=field)
+        SCRAPER_STATUS.set(len(status["active_sites"]), job=job, field="active_sites")
 
     def stop(self):
         """Stop the scraper gracefully"""
-        print("[Scraper] Stop requested")
+        logger.info("[Scraper] Stop requested")
         self.running = False
-        self.status["running"] = False
+        with self._lock:
+            self.status["running"] = False
+        if self.verify_stage:
+            # Let held candidates through to be dropped
+            self.verify_stage.wake()
 
     def find_sitemap(self, base_url: str) -> str:
         """
         Find sitemap for a website
 
+        Uses the stored discovery result while it is fresh; otherwise checks
+        robots.txt and probes the usual sitemap locations.
+
         Args:
             base_url: Base URL of the website
 
         Returns:
             Sitemap URL or None if not found
         """
+        scraper_config = self.config['scraper']
+        cached, sitemap = self.discovery_cache.lookup(
+            base_url,
+            scraper_config.get('discovery_ttl_hours', 720),
+            scraper_config.get('discovery_negative_ttl_hours', 24),
+        )
+        if cached:
+            return sitemap
+
+        sitemap = self._discover_sitemap(base_url)
+        self.discovery_cache.store(base_url, sitemap)
+        return sitemap
+
+    def _robots_sitemaps(self, base_url: str) -> list:
+        """Return the Sitemap: URLs listed in a site's robots.txt"""
+        try:
+            r = self.session.get(f"{base_url}/robots.txt", headers=self.headers, timeout=5)
+            if r.status_code != 200:
+                return []
+        except Exception:
+            return []
+
+        sitemaps = []
+        for line in r.text.splitlines():
+            key, _, value = line.partition(":")
+            if key.strip().lower() == "sitemap" and value.strip():
+                sitemaps.append(value.strip())
+        return sitemaps
+
+    def _probe(self, url: str) -> bool:
+        """Check whether a candidate sitemap URL exists"""
+        try:
+            r = self.session.head(url, headers=self.headers, timeout=5)
+            return r.status_code == 200
+        except Exception:
+            return False
+
+    def _discover_sitemap(self, base_url: str) -> str:
+        """Find a site's sitemap via robots.txt, then concurrent probes"""
+        robots = self._robots_sitemaps(base_url)
+        if robots:
+            # Prefer a posts sitemap when robots.txt lists several
+            return next((url for url in robots if "post" in url), robots[0])
+
         candidates = [
             f"{base_url}/post-sitemap.xml",
             f"{base_url}/sitemap_index.xml",
@@ -76,13 +325,13 @@ class RecipeScraper:
             f"{base_url}/sitemap_posts.xml",
         ]
 
-        for url in candidates:
-            try:
-                r = requests.head(url, headers=self.headers, timeout=5)
-                if r.status_code == 200:
-                    return url
-            except:
-                pass
+        # Probe all candidates at once but keep their order of preference
+        with ThreadPoolExecutor(max_workers=len(candidates), thread_name_prefix="probe") as pool:
+            found = list(pool.map(self._probe, candidates))
+
+        for url, ok in zip(candidates, found):
+            if ok:
+                return url
 
         return None
 
@@ -96,212 +345,1095 @@ class RecipeScraper:
         Returns:
             True if URL contains a recipe, False otherwise
         """
+        return self.check_recipe(url)[0]
+
+    def check_recipe(self, url: str) -> tuple:
+        """
+        Verify a URL and explain a negative answer
+
+        The page is streamed through RecipeDetector and the connection is
+        closed as soon as a recipe marker is found.
+
+        Args:
+            url: URL to check
+
+        Returns:
+            Tuple of (is_recipe: bool, reason: str) where reason is a
+            negative-cache reason code, or None for transient failures
+        """
+        host = host_of(url)
+        detector = RecipeDetector()
+        meter = MeteredFeed(detector.feed)
         try:
-            r = requests.get(url, headers=self.headers, timeout=10)
-            if r.status_code != 200:
-                return False
+            with StageTimer("verify_fetch", host) as timer, \
+                    self.session.get(url, headers=self.headers, timeout=10, stream=True) as r:
+                timer.result = str(r.status_code)
+                if r.status_code != 200:
+                    return (False, self._negative_reason(r.status_code, False))
 
-            # Check for Recipe schema
-            if '"@type":"Recipe"' in r.text or '"@type": "Recipe"' in r.text:
-                return True
-
-            # Check for common recipe plugins
-            soup = BeautifulSoup(r.content, "html.parser")
-            if soup.find(
-                class_=lambda x: x
-                and (
-                    "wp-recipe-maker" in x
-                    or "tasty-recipes" in x
-                    or "mv-create-card" in x
-                )
-            ):
-                return True
+                for chunk in r.iter_content(chunk_size=32 * 1024):
+                    if meter(chunk):
+                        break
+                return (detector.found, None if detector.found else NOT_RECIPE)
+        except Exception:
+            return (False, None)
+        finally:
+            record_detect(meter, host, detector.found)
 
-            return False
-        except:
-            return False
+    @staticmethod
+    def _negative_reason(status: int, found: bool) -> str:
+        """Map a verify response to a negative-cache reason (None = don't cache)"""
+        if status == 200:
+            return None if found else NOT_RECIPE
+        if status in (404, 410):
+            return GONE
+        return None
 
-    def parse_sitemap(self, sitemap_url: str, ignore_set: set) -> list:
+    def _remember_negative(self, url: str, reason: str):
+        """Store a URL that should not be fetched again until its TTL expires"""
+        if not reason:
+            return
+        self.negative_cache.record(
+            url, reason, self.config['scraper'].get('negative_cache_days', 30)
+        )
+        self.negative_urls.add(canonical_url(url))
+
+    def _verify_urls(self, urls: list) -> list:
         """
-        Parse sitemap and return list of candidate URLs
+        Verify candidate URLs, recording definitive negatives in the negative cache
+
+        With the async engine the URLs are fetched concurrently; otherwise
+        one at a time on the calling worker thread.
+
+        Returns:
+            List of booleans in the same order as urls
+        """
+        if not self.async_engine:
+            found = []
+            for url in urls:
+                is_recipe, reason = self.check_recipe(url)
+                if not is_recipe:
+                    self._remember_negative(url, reason)
+                found.append(is_recipe)
+            return found
+
+        found = []
+        for url, (status, is_recipe) in zip(urls, self.async_engine.verify_many(urls)):
+            if not is_recipe and status is not None:
+                self._remember_negative(url, self._negative_reason(status, is_recipe))
+            found.append(is_recipe)
+        return found
+
+    def _stream_sitemap(self, sitemap_url: str, consume, headers: dict = None) -> tuple:
+        """
+        GET a sitemap and feed its body to consume() until it returns True
+
+        Returns:
+            Tuple of (status_code: int, response_headers: dict)
+        """
+        host = host_of(sitemap_url)
+        meter = MeteredFeed(consume)
+        try:
+            with StageTimer("sitemap_fetch", host) as timer:
+                if self.async_engine:
+                    status, response_headers = self.async_engine.stream(
+                        sitemap_url, meter, timeout=30, headers=headers
+                    )
+                else:
+                    with self.session.get(
+                        sitemap_url, headers={**self.headers, **(headers or {})},
+                        timeout=15, stream=True
+                    ) as r:
+                        status, response_headers = r.status_code, dict(r.headers)
+                        if status == 200:
+                            for chunk in r.iter_content(chunk_size=64 * 1024):
+                                if meter(chunk):
+                                    break
+                timer.result = str(status)
+            return (status, response_headers)
+        finally:
+            DOWNLOADED_BYTES.inc(meter.bytes, stage="sitemap_fetch", host=host)
+
+    def _record_sitemap_cache(self, hit: bool):
+        """Count a sitemap cache hit or miss"""
+        with self._lock:
+            self.status["sitemap_cache_hits" if hit else "sitemap_cache_misses"] += 1
+
+    def _read_sitemap(self, sitemap_url: str, accept, limit: int, since: float = None,
+                      crawled: tuple = None) -> tuple:
+        """
+        Stream one sitemap and keep the `limit` newest accepted URLs
+
+        Entries not modified after `since`, or inside the `crawled` range,
+        are skipped. Sitemaps without any
+        <lastmod> stop downloading as soon as `limit` URLs were accepted;
+        dated sitemaps are read to the end so the newest entries win.
+
+        A cached copy is revalidated with If-None-Match / If-Modified-Since;
+        on 304 its entries are reused without downloading the body.
+
+        Args:
+            sitemap_url: URL of the sitemap (plain or .xml.gz)
+            accept: Callable(loc) -> bool filtering page URLs
+            limit: Maximum number of URLs to keep
+            since: Skip entries with a lastmod at or before this timestamp
+            crawled: Skip entries with low < lastmod <= high for (low, high)
+
+        Returns:
+            Tuple of (child sitemap entries: list, accepted URLs: list of
+            (lastmod timestamp or None, loc), newest page lastmod seen or None,
+            truncated: bool - True if accepted URLs were left out,
+            failed: bool - True if the sitemap could not be read)
+        """
+        children = []
+        heap = []
+        state = {"seq": 0, "dated": False, "newest": None, "truncated": False}
+
+        def handle(entries):
+            for entry in entries:
+                if entry.kind == "sitemap":
+                    children.append(entry)
+                    continue
+
+                modified = parse_lastmod(entry.lastmod)
+                if modified is not None:
+                    state["dated"] = True
+                    if state["newest"] is None or modified > state["newest"]:
+                        state["newest"] = modified
+                    if since is not None and modified <= since:
+                        continue
+                    if crawled and crawled[0] < modified <= crawled[1]:
+                        continue
+                if not accept(entry.loc):
+                    continue
+
+                # Min-heap of the newest `limit` URLs; undated ones rank lowest
+                # and earlier sitemap positions win ties
+                state["seq"] += 1
+                item = (modified if modified is not None else float("-inf"),
+                        -state["seq"], entry.loc)
+                if len(heap) < limit:
+                    heapq.heappush(heap, item)
+                else:
+                    heapq.heappushpop(heap, item)
+                    state["truncated"] = True
+
+        def enough() -> bool:
+            return not state["dated"] and len(heap) >= limit
+
+        parser = SitemapParser()
+        parsed = []
+
+        def consume(chunk) -> bool:
+            entries = parser.feed(chunk)
+            if len(parsed) <= MAX_CACHED_ENTRIES:
+                parsed.extend(entries)
+            handle(entries)
+            return enough()
+
+        def result():
+            ranked = sorted(heap, reverse=True)
+            urls = [(None if rank == float("-inf") else rank, loc) for rank, _, loc in ranked]
+            return (children, urls, state["newest"], state["truncated"], False)
+
+        cached = self.sitemap_cache.get(sitemap_url) if self.sitemap_cache else None
+        status, response_headers = self._stream_sitemap(
+            sitemap_url, consume, SitemapCache.conditional_headers(cached)
+        )
+
+        if status == 304 and cached:
+            handle(cached.entries)
+            if cached.complete or enough():
+                self._record_sitemap_cache(True)
+                state["truncated"] = state["truncated"] or not cached.complete
+                return result()
+
+            # Cached prefix is too short for this run - download in full
+            children.clear()
+            heap.clear()
+            state.update(seq=0, dated=False, newest=None, truncated=False)
+            status, response_headers = self._stream_sitemap(sitemap_url, consume)
+
+        self._record_sitemap_cache(False)
+        if status != 200:
+            logger.info(f"[Sitemap] {sitemap_url} returned status {status}",
+                        extra={"url": sitemap_url, "stage": "sitemap"})
+            if status in (404, 410):
+                self.discovery_cache.forget_sitemap(sitemap_url)
+            return ([], [], None, False, True)
+
+        complete = not enough()
+        if complete:
+            entries = parser.close()
+            parsed.extend(entries)
+            handle(entries)
+        else:
+            state["truncated"] = True
+
+        if self.sitemap_cache:
+            self.sitemap_cache.put(
+                sitemap_url,
+                response_headers.get("ETag"),
+                response_headers.get("Last-Modified"),
+                parsed,
+                complete,
+            )
+
+        return result()
+
+    def scan_sitemap(self, sitemap_url: str, ignore_set: set, limit: int = None,
+                     since: float = None, crawled: tuple = None) -> SitemapScan:
+        """
+        Collect candidate URLs from a sitemap (and its post sitemaps), newest first
 
         Args:
             sitemap_url: URL of the sitemap
-            ignore_set: Set of URLs to ignore
+            ignore_set: Set of canonical URLs to ignore
+            limit: Maximum candidates to return (defaults to scan_depth)
+            since: Site watermark; entries and child sitemaps not modified
+                after it are skipped
+            crawled: Site's crawled range (low, high); entries inside it are skipped
 
         Returns:
-            List of candidate URLs
+            SitemapScan(urls, lastmods, newest, truncated, failed) where newest
+            is the newest page lastmod seen, truncated means candidates were
+            left out and failed that a sitemap could not be read
         """
-        print(f"   [Sitemap] Parsing: {sitemap_url}")
-        new_candidates = []
-        scan_depth = self.config['scraper']['scan_depth']
+        if limit is None:
+            limit = self.config['scraper']['scan_depth']
 
-        try:
-            r = requests.get(sitemap_url, headers=self.headers, timeout=15)
-            soup = BeautifulSoup(r.content, "lxml-xml")
-
-            # Handle Index Sitemaps (sitemaps inside sitemaps)
-            if soup.find("sitemap"):
-                for sm in soup.find_all("sitemap"):
-                    loc = sm.find("loc").text
-                    if len(new_candidates) >= scan_depth:
-                        break
-                    if "post" in loc:
-                        new_candidates.extend(self.parse_sitemap(loc, ignore_set))
+        def accept(loc: str) -> bool:
+            # Skip non-recipe pages, URLs in our ignore list and known negatives
+            if any(x in loc for x in EXCLUDED_URL_PATTERNS):
+                return False
+            key = canonical_url(loc)
+            return key not in ignore_set and key not in self.negative_urls
+
+        found, newest, truncated, failed = self._scan(sitemap_url, accept, limit, since, crawled)
 
-                # Fallback if no posts found but nested sitemaps exist
-                if not new_candidates and soup.find("sitemap"):
-                    return self.parse_sitemap(soup.find("sitemap").find("loc").text, ignore_set)
+        # Newest first across all sitemaps; undated URLs keep their order at the end
+        found.sort(key=lambda item: item[0] if item[0] is not None else float("-inf"),
+                   reverse=True)
+        # Spellings of the same page (tracking parameters, www., ...) count once
+        unique = {}
+        lastmods = {}
+        for modified, loc in found:
+            if unique.setdefault(canonical_url(loc), loc) == loc:
+                lastmods.setdefault(loc, modified)
+        urls = list(unique.values())
+        if len(urls) > limit:
+            urls = urls[:limit]
+            truncated = True
+        return SitemapScan(urls, {url: lastmods[url] for url in urls}, newest, truncated, failed)
 
-            # Handle Actual URLs
-            for u in soup.find_all("url"):
-                if len(new_candidates) >= scan_depth:
+    def _scan(self, sitemap_url: str, accept, limit: int, since: float,
+              crawled: tuple = None) -> tuple:
+        """
+        Read a sitemap and recurse into its post sitemaps
+
+        Returns:
+            Tuple of (found: list of (lastmod, loc), newest lastmod, truncated, failed)
+        """
+        logger.info(f"[Sitemap] Parsing: {sitemap_url}",
+                    extra={"url": sitemap_url, "stage": "sitemap"})
+        found = []
+        newest = None
+        truncated = False
+        failed = False
+        try:
+            children, found, newest, truncated, failed = self._read_sitemap(
+                sitemap_url, accept, limit, since, crawled
+            )
+
+            # Handle Index Sitemaps (sitemaps inside sitemaps), newest first
+            posts = [child for child in children if "post" in child.loc]
+            posts.sort(key=lambda child: parse_lastmod(child.lastmod) or 0, reverse=True)
+            for child in posts:
+                if len(found) >= limit and newest is None:
+                    # Undated sitemaps: keep the old early stop
+                    truncated = True
                     break
-                loc = u.find("loc").text
-
-                # Skip non-recipe pages
-                if any(
-                    x in loc
-                    for x in [
-                        "/about",
-                        "/contact",
-                        "/shop",
-                        "/privacy",
-                        "login",
-                        "cart",
-                        "roundup",
-                    ]
-                ):
+                modified = parse_lastmod(child.lastmod)
+                if since is not None and modified is not None and modified <= since:
                     continue
+                child_found, child_newest, child_truncated, child_failed = self._scan(
+                    child.loc, accept, limit, since, crawled
+                )
+                found.extend(child_found)
+                truncated = truncated or child_truncated
+                failed = failed or child_failed
+                if child_newest is not None and (newest is None or child_newest > newest):
+                    newest = child_newest
 
-                # If URL is NOT in our ignore list
-                if loc not in ignore_set:
-                    new_candidates.append(loc)
+            # Fallback if the index has no post sitemaps
+            if not posts and not found and children:
+                return self._scan(children[0].loc, accept, limit, since, crawled)
 
         except Exception as e:
-            print(f"   [Error] Parsing sitemap: {e}")
+            logger.error(f"[Error] Parsing sitemap: {e}",
+                         extra={"url": sitemap_url, "stage": "sitemap"})
+            truncated = True
+            failed = True
 
-        return list(set(new_candidates))
+        return (found, newest, truncated, failed)
 
-    def run_scrape(self):
-        """Main scraping logic"""
-        self.running = True
-        self.status["running"] = True
-        self.status["total_imported"] = 0
-        self.status["sites_completed"] = 0
+    def parse_sitemap(self, sitemap_url: str, ignore_set: set, limit: int = None) -> list:
+        """
+        Parse sitemap and return list of candidate URLs
 
-        print(f"[Scraper] Starting: {len(self.site_list)} sites")
-        print(f"[Scraper] Target: {self.config['scraper']['target_recipes_per_site']} recipes/site")
-        print(f"[Scraper] Scan depth: {self.config['scraper']['scan_depth']}")
-        print("-" * 60)
+        Args:
+            sitemap_url: URL of the sitemap
+            ignore_set: Set of canonical URLs to ignore
+            limit: Maximum candidates to return (defaults to scan_depth)
 
-        # Load existing recipe URLs from enabled services
-        existing_mealie = set()
-        existing_tandoor = set()
+        Returns:
+            List of candidate URLs, newest first
+        """
+        return self.scan_sitemap(sitemap_url, ignore_set, limit).urls
+
+    def _claim_url(self, service: str, url: str) -> bool:
+        """
+        Reserve a URL for import so concurrent workers (and jobs) never import it twice
 
-        if self.mealie_client:
-            existing_mealie = self.mealie_client.get_existing_urls()
+        Args:
+            service: 'mealie' or 'tandoor'
+            url: URL about to be imported
 
-        if self.tandoor_client:
-            existing_tandoor = self.tandoor_client.get_existing_urls()
+        Returns:
+            True if the caller now owns the import, False if already known
+        """
+        return self.known_urls.claim(self.index_target(service), url)
 
-        # Combined existing URLs for initial filtering
-        combined_existing = set()
-        if self.config['mealie']['enabled'] and self.config['tandoor']['enabled']:
-            combined_existing = existing_mealie.intersection(existing_tandoor)
-        elif self.config['mealie']['enabled']:
-            combined_existing = existing_mealie
-        elif self.config['tandoor']['enabled']:
-            combined_existing = existing_tandoor
-
-        # Process each site
-        for site_idx, site in enumerate(self.site_list):
-            if not self.running:
-                print("[Scraper] Stopped by user")
-                break
+    def _release_url(self, service: str, url: str):
+        """Give back a URL claimed with _claim_url after a failed import"""
+        self.known_urls.release(self.index_target(service), url)
 
+    def _site_started(self, site: str):
+        """Record that a worker picked up a site"""
+        with self._lock:
             self.status["current_site"] = site
-            self.status["progress"] = int((site_idx / len(self.site_list)) * 100)
+            self.status["active_sites"].append(site)
+
+    def _site_finished(self, site: str):
+        """Record that a worker finished a site and update aggregate progress"""
+        with self._lock:
+            if site in self.status["active_sites"]:
+                self.status["active_sites"].remove(site)
+            self.status["sites_completed"] += 1
+            self.status["progress"] = int(
+                (self.status["sites_completed"] / len(self.site_list)) * 100
+            )
+            if self.status["active_sites"]:
+                self.status["current_site"] = self.status["active_sites"][-1]
+
+    def _record_import(self):
+        """Increment the aggregate import counter"""
+        with self._lock:
+            self.status["total_imported"] += 1
+
+    def _job_add(self, job: SiteJob):
+        """Count one more candidate of a site as in the pipeline"""
+        with self._lock:
+            job.outstanding += 1
+
+    def _job_done(self, job: SiteJob):
+        """Count one candidate (or the discovery step) of a site as finished"""
+        with self._lock:
+            job.outstanding -= 1
+            finished = job.outstanding == 0
+        if finished:
+            if self.running:
+                self.checkpoint.site_done(job.site, job.imported)
+                self._advance_watermark(job)
+            self._site_finished(job.site)
+
+    def _settle(self, job: SiteJob, url: str):
+        """Mark a candidate as finished for good: imported, refused or not a recipe"""
+        with self._lock:
+            job.settled.add(url)
+
+    def _advance_watermark(self, job: SiteJob):
+        """
+        Record the part of a site's sitemap this crawl has fully processed
+
+        Candidates go through the pipeline newest first. Everything modified
+        after the newest candidate that is not settled (dropped once the
+        site hit its target, or still waiting for a retry) up to the newest
+        lastmod seen is done; if all are settled, everything above the scan's
+        floor is. A sitemap that could not be read records nothing.
+        """
+        if not self.watermarks or job.newest is None or job.scan_failed:
+            return
+        done_from = job.floor
+        with self._lock:
+            for modified, url in job.dated:
+                if url not in job.settled:
+                    done_from = modified
+                    break
+        self.watermarks.advance(job.site, done_from, job.newest)
+
+    def _discover_stage(self, jobs: list):
+        """Pipeline stage: find and parse the sitemap of each site"""
+        for job in jobs:
+            try:
+                if self.running:
+                    self._site_started(job.site)
+                    self._discover_site(job)
+            except Exception as e:
+                logger.error(f"[Error] {job.site}: {e}",
+                             extra={"site": job.site, "stage": "discover"})
+            finally:
+                # Release the hold taken when the job was created
+                self._job_done(job)
+
+    def _discover_site(self, job: SiteJob):
+        """Queue the candidate URLs of a site for verification"""
+        site = job.site
+        fields = {"site": site, "stage": "discover"}
+        logger.info(f"[Site {job.index + 1}/{len(self.site_list)}] {site}", extra=fields)
 
-            print(f"\n[Site {site_idx + 1}/{len(self.site_list)}] {site}")
+        if job.resumed:
+            self._resume_site(job)
+            return
 
+        with self.budget:
             # Find sitemap
             sitemap = self.find_sitemap(site)
             if not sitemap:
-                print("   [Skip] No sitemap found")
-                self.status["sites_completed"] += 1
-                continue
+                logger.info(f"[Skip] {site}: No sitemap found", extra=fields)
+                return
+
+            # Parse sitemap, skipping entries earlier crawls have processed
+            since = self.watermarks.get(site) if self.watermarks else None
+            crawled = self.watermarks.crawled(site) if self.watermarks else None
+            scan = self.scan_sitemap(sitemap, self.combined_existing, since=since,
+                                     crawled=crawled)
+
+        targets = scan.urls
+        job.newest = scan.newest
+        job.scan_failed = scan.failed
+        job.dated = [(scan.lastmods[url], url) for url in targets
+                     if scan.lastmods[url] is not None]
+        if scan.truncated and targets and scan.lastmods[targets[-1]] is not None:
+            # Older entries than the last candidate may have been left out
+            job.floor = scan.lastmods[targets[-1]]
+        if not targets:
+            if since is not None or crawled:
+                logger.info(f"[Skip] {site}: Nothing new since the last crawl", extra=fields)
+            else:
+                logger.info(f"[Skip] {site}: No new recipes found in recent posts", extra=fields)
+            return
+
+        logger.info(f"[Found] {site}: {len(targets)} candidate URLs (target {job.target})",
+                    extra=fields)
+        self.checkpoint.save_candidates(site, targets)
+
+        for url in targets:
+            if not self.running or job.satisfied:
+                break
+            self._job_add(job)
+            self.verify_stage.put((job, url))
+
+    def _resume_site(self, job: SiteJob):
+        """Requeue the candidates a site had left when the previous run stopped"""
+        remaining = self.checkpoint.candidates(job.site)
+        logger.info(f"[Resume] {job.site}: {len(remaining)} candidate URLs left "
+                    f"({job.imported} of {job.target} imported)",
+                    extra={"site": job.site, "stage": "discover"})
+
+        for url, state in remaining:
+            if not self.running or job.satisfied:
+                break
+            self._job_add(job)
+            if state == CANDIDATE_VERIFIED:
+                with self._lock:
+                    job.queued += 1
+                self.import_stage.put((job, url))
+            else:
+                self.verify_stage.put((job, url))
+
+    def _handled(self, url: str) -> bool:
+        """Check whether a candidate needs no work: imported everywhere or a known negative"""
+        # Imports by other jobs since discovery count too
+        if self.known_urls.known(self._open_targets, url):
+            return True
+        return canonical_url(url) in self.negative_urls
+
+    def _wanted(self, job: SiteJob, url: str) -> bool:
+        """Candidate filter: drop URLs that became unnecessary while queued (caller holds the lock)"""
+        if not self.running or job.open_slots() <= 0:
+            return False
+        return not self._handled(url)
 
-            # Parse sitemap
-            targets = self.parse_sitemap(sitemap, combined_existing)
-            if not targets:
-                print("   [Skip] No new recipes found in recent posts")
-                self.status["sites_completed"] += 1
+    def _verify_gate(self, item: tuple, verifying: int) -> float:
+        """
+        Verify queue gate: decide when a site's next candidate may be verified
+
+        A site's candidates are verified at most its open import slots (plus
+        VERIFY_HEADROOM) at a time and wait while its in-flight imports could
+        already reach the target. A candidate that may go takes its host's
+        rate-limit token here, so a worker never picks up a page it then has
+        to wait for; candidates the verify stage will drop go at once.
+
+        Args:
+            item: (job, url) at the head of the site's queue
+            verifying: Candidates of the site taken by verify workers
+
+        Returns:
+            0 to hand the candidate out, seconds until its host has a token,
+            or None to wait for the site's verifications or imports to settle
+        """
+        job, url = item
+        with self._lock:
+            if not self._wanted(job, url):
+                if self.running and job.open_slots() <= 0 and (job.importing or job.queued):
+                    return None
+                return 0
+            if verifying >= job.open_slots() + VERIFY_HEADROOM:
+                return None
+        return self.rate_limiter.try_acquire(url)
+
+    def _verify_stage(self, items: list):
+        """
+        Pipeline stage: verify candidates and pass recipes on to import
+
+        The verify queue is served round-robin across sites through
+        _verify_gate, so a throttled or busy site never holds up the others.
+        """
+        candidates = []
+        for job, url in items:
+            with self._lock:
+                wanted = self._wanted(job, url)
+                if not wanted and self._handled(url):
+                    job.settled.add(url)
+            if wanted:
+                candidates.append((job, url))
                 continue
+            if self.running:
+                self.checkpoint.mark([url])
+            self._job_done(job)
+
+        found = [False] * len(candidates)
+        try:
+            if candidates:
+                with self.budget:
+                    found = self._verify_urls([url for _, url in candidates])
+            self.checkpoint.mark([url for (_, url), ok in zip(candidates, found) if ok],
+                                 CANDIDATE_VERIFIED)
+            self.checkpoint.mark([url for (_, url), ok in zip(candidates, found) if not ok])
+        finally:
+            for (job, url), is_recipe in zip(candidates, found):
+                recipe = is_recipe and self.running
+                if recipe:
+                    with self._lock:
+                        job.queued += 1
+                    self.import_stage.put((job, url))
+                else:
+                    # Negatives were cached; a failed fetch is looked at again next run
+                    if not is_recipe and canonical_url(url) in self.negative_urls:
+                        self._settle(job, url)
+                    self._job_done(job)
 
-            print(f"   [Found] {len(targets)} candidate URLs")
-            print(f"   [Target] {self.config['scraper']['target_recipes_per_site']} recipes")
+    def _import_stage(self, items: list):
+        """Pipeline stage: import verified recipes until each site reaches its target"""
+        accepted = []
+        dropped = []
+        with self._lock:
+            for job, url in items:
+                job.queued -= 1
+                if self.running and job.imported + job.importing + job.deferred < job.target:
+                    job.importing += 1
+                    accepted.append((job, url))
+                else:
+                    dropped.append((job, url))
+        if self.running:
+            self.checkpoint.mark([url for _, url in dropped])
+        for job, _ in dropped:
+            self._job_done(job)
 
-            imported_count = 0
-            target_recipes = self.config['scraper']['target_recipes_per_site']
+        imported = set()
+        retry = {}
+        settled = set()
+        try:
+            urls = [url for _, url in accepted]
+            if self.config['scraper']['dry_run']:
+                for job, url in accepted:
+                    logger.info(f"[DRY RUN] Would import: {url}",
+                                extra={"site": job.site, "url": url, "stage": "import"})
+                imported = set(urls)
+            elif urls:
+                with self.budget:
+                    imported, retry, settled = self._import_batch(urls)
+            # Failed imports stay verified in the checkpoint until they succeed
+            self.checkpoint.mark([url for url in urls if url not in retry])
+        finally:
+            for job, url in accepted:
+                with self._lock:
+                    job.importing -= 1
+                    if url in settled:
+                        job.settled.add(url)
+                    if url in imported:
+                        self._count_import(job)
+                    elif url in retry:
+                        job.deferred += 1
+                    if url in retry:
+                        self._deferred[url] = (job, retry[url], url in imported)
+                if url in imported:
+                    self._record_import()
+                self._job_done(job)
+            for job in {job for job, url in accepted if url in imported}:
+                self.checkpoint.set_imported(job.site, job.imported)
+            # Sites may have freed or filled import slots
+            self.verify_stage.wake()
 
-            # Check each candidate URL
-            for url in targets:
-                if not self.running:
-                    break
+    def _count_import(self, job: SiteJob):
+        """Credit an import to its site (caller holds the lock)"""
+        job.imported += 1
+        if job.imported == job.target:
+            logger.info(f"[Done] {job.site}: Target reached",
+                        extra={"site": job.site, "stage": "import"})
 
-                if imported_count >= target_recipes:
-                    print("   [Done] Target reached")
+    def import_batch_size(self) -> int:
+        """Verified URLs collected per import round (1 unless Mealie bulk import is on)"""
+        if self.mealie_client and self.config['mealie'].get('bulk_import'):
+            return max(1, self.config['mealie'].get('bulk_batch_size', 25))
+        return 1
+
+    def _import_service(self, service: str, urls: list, durations: dict = None) -> dict:
+        """
+        Import URLs into one service, honouring its circuit breaker
+
+        Args:
+            service: 'mealie' or 'tandoor'
+            urls: Verified recipe URLs
+            durations: Optional url -> seconds, increased by the time spent
+                importing each URL (the whole request for a bulk import)
+
+        Returns:
+            Dict of url -> IMPORTED, REJECTED, FAILED, DEFERRED or UNKNOWN for
+            the URLs this call tried (URLs the service already has are left out)
+        """
+        client = self.mealie_client if service == 'mealie' else self.tandoor_client
+        breaker = self.breakers[service]
+
+        claimed = [url for url in urls if self._claim_url(service, url)]
+        outcomes = {}
+        if durations is None:
+            durations = {}
+
+        stage = f"{service}_import"
+        host = host_of(client.url)
+
+        if service == 'mealie' and self.config['mealie'].get('bulk_import'):
+            if claimed and breaker.allow():
+                with StageTimer(stage, host) as timer:
+                    outcomes = client.import_recipes_bulk(claimed)
+                    timer.result = "bulk"
+                for url in claimed:
+                    durations[url] = durations.get(url, 0.0) + timer.duration
+                if all(outcome in (FAILED, UNKNOWN) for outcome in outcomes.values()):
+                    breaker.record_failure()
+                else:
+                    breaker.record_success()
+        else:
+            for url in claimed:
+                if not breaker.allow():
                     break
+                with StageTimer(stage, host) as timer:
+                    outcomes[url] = client.import_recipe_result(url)
+                    timer.result = outcomes[url]
+                durations[url] = durations.get(url, 0.0) + timer.duration
+                if outcomes[url] == FAILED:
+                    breaker.record_failure()
+                else:
+                    breaker.record_success()
+
+        for url in claimed:
+            outcomes.setdefault(url, DEFERRED)
+            IMPORTS.inc(service=service, result=outcomes[url])
+            if outcomes[url] == IMPORTED:
+                self.url_index.add(self.index_target(service), url)
+            elif outcomes[url] != UNKNOWN:
+                self._release_url(service, url)
+
+        if UNKNOWN in outcomes.values():
+            # The claim keeps this run from resubmitting; the next run asks the server
+            self.url_index.expire(self.index_target(service))
+        return outcomes
 
-                # Verify it's a recipe
-                if not self.verify_is_recipe(url):
+    def _import_batch(self, urls: list, services: dict = None) -> tuple:
+        """
+        Import verified URLs into the enabled services
+
+        Mealie receives the whole batch through its bulk endpoint when bulk
+        import is on; Tandoor always imports one URL at a time.
+
+        Args:
+            urls: Verified recipe URLs
+            services: Optional url -> set of services to try (default: all enabled)
+
+        Returns:
+            Tuple of (imported: set of URLs imported into at least one service,
+            retry: dict url -> set of services whose import should be retried,
+            settled: set of URLs needing no more work - imported or refused
+            everywhere, with no outcome left unknown)
+        """
+        # A URL another job is importing is left to that job
+        urls = [url for url in urls if self.known_urls.begin_import(url)]
+        results = {url: {} for url in urls}
+        durations = {url: 0.0 for url in urls}
+
+        try:
+            for service, client in (('mealie', self.mealie_client),
+                                    ('tandoor', self.tandoor_client)):
+                if not client:
                     continue
+                wanted = [url for url in urls if services is None or service in services[url]]
+                for url, outcome in self._import_service(service, wanted, durations).items():
+                    results[url][service] = outcome
+        finally:
+            for url in urls:
+                self.known_urls.end_import(url)
+
+        imported = set()
+        retry = {}
+        settled = set()
+        for url in urls:
+            outcome = results[url]
+
+            # Every service that tried refused the URL - don't retry it next run
+            if outcome and all(result == REJECTED for result in outcome.values()):
+                self._remember_negative(url, IMPORT_REJECTED)
+
+            pending = {name for name, result in outcome.items() if result in (FAILED, DEFERRED)}
+            if pending:
+                retry[url] = pending
+
+            unknown = [name for key, name in (('mealie', "Mealie"), ('tandoor', "Tandoor"))
+                       if outcome.get(key) == UNKNOWN]
+            if unknown:
+                logger.warning(f"[Unknown] {', '.join(unknown)} may have imported {url} - "
+                               f"not resubmitting, checked at the next sync",
+                               extra={"url": url, "stage": "import"})
+            elif not pending:
+                settled.add(url)
+
+            # Output result
+            names = [
+                name for key, name in (('mealie', "Mealie"), ('tandoor', "Tandoor"))
+                if outcome.get(key) == IMPORTED
+            ]
+            if names:
+                logger.info(f"[OK] Imported to {', '.join(names)}: {url}",
+                            extra={"url": url, "stage": "import", "duration": durations[url]})
+                imported.add(url)
+
+        return (imported, retry, settled)
+
+    def _retry_deferred(self):
+        """
+        Retry imports that failed or were held back by an open circuit breaker
+
+        Runs after the pipeline has drained. Each round waits until the
+        breakers involved let a trial through; URLs still failing after
+        the last round are reported and left for the next run.
+        """
+        # Sites whose watermark waits for the retries (see _advance_watermark)
+        waiting = {job for job, _, _ in self._deferred.values()}
+
+        for round_no in range(DEFERRED_RETRY_ROUNDS):
+            if not self._deferred or not self.running:
+                break
+
+            pending = self._deferred
+            self._deferred = {}
+
+            services = set().union(*(entry[1] for entry in pending.values()))
+            wait = max(self.breakers[service].retry_in() for service in services)
+            logger.info(f"[Scraper] Retrying {len(pending)} failed imports"
+                        + (f" in {int(wait)}s" if wait >= 1 else ""), extra={"stage": "import"})
+            deadline = time.monotonic() + wait
+            while self.running and time.monotonic() < deadline:
+                time.sleep(0.5)
+
+            # A site that reached its target meanwhile no longer needs its uncounted URLs
+            urls = []
+            with self._lock:
+                for url, (job, _, counted) in pending.items():
+                    if counted or not job.satisfied:
+                        urls.append(url)
+                    else:
+                        job.deferred -= 1
+
+            batch_size = self.import_batch_size()
+            for start in range(0, len(urls), batch_size):
+                chunk = urls[start:start + batch_size]
+                if not self.running:
+                    # Stopped: keep the rest for the final report
+                    self._deferred.update((url, pending[url]) for url in urls[start:])
+                    break
+                with self.budget:
+                    imported, retry, settled = self._import_batch(
+                        chunk, {url: pending[url][1] for url in chunk}
+                    )
+                for url in chunk:
+                    job, _, counted = pending[url]
+                    with self._lock:
+                        if url in settled:
+                            job.settled.add(url)
+                        if url in imported and not counted:
+                            self._count_import(job)
+                            job.deferred -= 1
+                            counted = True
+                        if url in retry:
+                            self._deferred[url] = (job, retry[url], counted)
+                        elif not counted:
+                            # Refused everywhere (or outcome unknown): settled without an import
+                            job.deferred -= 1
+                    if url in imported and not pending[url][2]:
+                        self._record_import()
+
+        if self._deferred and self.running:
+            logger.warning(f"[Scraper] {len(self._deferred)} imports still failing - "
+                           f"they will be picked up again next run", extra={"stage": "import"})
+        with self._lock:
+            for job, _, counted in self._deferred.values():
+                if not counted:
+                    job.deferred -= 1
+        self._deferred = {}
 
-                # Dry run mode
-                if self.config['scraper']['dry_run']:
-                    print(f"      [DRY RUN] Would import: {url}")
-                    imported_count += 1
-                    self.status["total_imported"] += 1
+        # Sites whose retries went through can move their watermark further
+        if self.running:
+            for job in waiting:
+                self._advance_watermark(job)
+
+    def index_target(self, service: str) -> str:
+        """Return the URL index key for an enabled service"""
+        return f"{service}:{self.config[service]['url'].rstrip('/')}"
+
+    def load_existing_urls(self, service: str, client) -> set:
+        """
+        Load known URLs for a service from the local index
+
+        The index is reconciled with the server only when it is older than
+        scraper.index_sync_hours: incrementally (changes since the stored
+        watermark) where the client supports it, otherwise by downloading
+        the catalog. A full download happens on first use or when a resync
+        was requested.
+
+        Args:
+            service: "mealie" or "tandoor"
+            client: API client for the service
+
+        Returns:
+            Set of known recipe URLs (canonical)
+        """
+        target = self.index_target(service)
+        max_age = self.config['scraper'].get('index_sync_hours', 24)
+        watermark = self.url_index.get_meta(target, "watermark")
+        incremental = client.SUPPORTS_INCREMENTAL and watermark
+
+        if self.url_index.needs_full_sync(target):
+            incremental = False
+        elif not self.url_index.needs_sync(target, max_age):
+            urls = self.url_index.load(target)
+            logger.info(f"[{service.title()}] Loaded {len(urls)} known URLs from local index",
+                        extra={"stage": "catalog_sync"})
+            return urls
+
+        host = host_of(client.url)
+        if incremental:
+            with StageTimer("catalog_sync", host) as timer:
+                changed, new_watermark = client.sync_catalog(since=watermark)
+                timer.result = "incremental" if new_watermark is not None else "partial"
+            self.url_index.merge(target, changed)
+            if new_watermark is not None:
+                self.url_index.set_meta(target, "watermark", new_watermark)
+                self.url_index.mark_synced(target)
+            return self.url_index.load(target)
+
+        with StageTimer("catalog_sync", host) as timer:
+            urls, watermark = client.sync_catalog()
+            timer.result = "full" if watermark is not None else "partial"
+        if watermark is None:
+            # Partial catalog (server unreachable or a page failed): keep what we have
+            logger.warning(f"[{service.title()}] Sync incomplete - merging into local index",
+                           extra={"stage": "catalog_sync"})
+            self.url_index.merge(target, urls)
+            return self.url_index.load(target)
+
+        self.url_index.replace(target, urls)
+        if watermark:
+            self.url_index.set_meta(target, "watermark", watermark)
+        return {canonical_url(url) for url in urls}
+
+    def _close_known_urls(self):
+        """Stop using the shared known-URL sets opened by run_scrape"""
+        for target in self._open_targets:
+            self.known_urls.close(target)
+        self._open_targets = []
+
+    def _start_async_engine(self):
+        """Start the asyncio engine if configured, falling back to threads"""
+        if self.config['scraper'].get('engine', 'threaded') != 'async':
+            return
+
+        if not async_engine_available():
+            logger.warning("[Scraper] aiohttp not installed - using threaded engine")
+            return
+
+        self.async_engine = AsyncFetchEngine(
+            self.headers,
+            RecipeDetector,
+            max_concurrency=self.config['scraper'].get('max_concurrency', 200),
+            per_host_concurrency=self.config['scraper'].get('per_host_concurrency', 8),
+            rate_limiter=self.rate_limiter,
+        )
+        self.async_engine.start()
+        logger.info("[Scraper] Using asyncio fetch engine")
+
+    def _stop_async_engine(self):
+        """Shut down the asyncio engine if it was started"""
+        if self.async_engine:
+            self.async_engine.close()
+            self.async_engine = None
+
+    def _close_stores(self):
+        """Close the state databases opened by this scraper (not an injected url_index)"""
+        stores = [self.negative_cache, self.watermarks, self.checkpoint,
+                  self.discovery_cache, self.sitemap_cache]
+        if self._owns_url_index:
+            stores.append(self.url_index)
+        for store in stores:
+            if store:
+                store.close()
+
+    def run_scrape(self):
+        """Main scraping logic"""
+        self.running = True
+        max_workers = self.config['scraper'].get('max_workers', 4)
+        # Tags log lines so the logs page can show a single run
+        run_id = uuid.uuid4().hex[:8]
+        set_run_id(run_id)
+        started = time.monotonic()
+        with self._lock:
+            self.status["running"] = True
+            self.status["run_id"] = run_id
+            self.status["total_imported"] = 0
+            self.status["sites_completed"] = 0
+            self.status["active_sites"] = []
+            self.status["sitemap_cache_hits"] = 0
+            self.status["sitemap_cache_misses"] = 0
+        self._deferred = {}
+
+        set_site_log_rate(self.config['scraper'].get('site_log_rate', 5))
+        logger.info(f"[Scraper] Starting: {len(self.site_list)} sites ({max_workers} discovered in parallel)")
+        logger.info(f"[Scraper] Target: {self.config['scraper']['target_recipes_per_site']} recipes/site")
+        logger.info(f"[Scraper] Scan depth: {self.config['scraper']['scan_depth']}")
+
+        # Load existing recipe URLs from enabled services (shared with other running jobs)
+        try:
+            for service, client in (('mealie', self.mealie_client),
+                                    ('tandoor', self.tandoor_client)):
+                if client:
+                    target = self.index_target(service)
+                    self.known_urls.open(
+                        target, lambda: self.load_existing_urls(service, client)
+                    )
+                    self._open_targets.append(target)
+        except Exception:
+            self._close_known_urls()
+            self._close_stores()
+            raise
+
+        # Combined existing URLs for initial filtering
+        self.combined_existing = self.known_urls.common(self._open_targets)
+
+        # Known non-recipe URLs are filtered out alongside the existing URLs
+        self.negative_urls = self.negative_cache.active_urls()
+        if self.negative_urls:
+            logger.info(f"[Scraper] Skipping {len(self.negative_urls)} cached non-recipe URLs")
+
+        # Pick up an interrupted run of the same site list, or checkpoint a new one
+        saved = {}
+        if self.resume and self.checkpoint.resumable():
+            saved = self.checkpoint.sites()
+            done = sum(1 for state, _ in saved.values() if state == SITE_DONE)
+            logger.info(f"[Scraper] Resuming previous run: {done} of {len(self.site_list)} sites done")
+            with self._lock:
+                self.status["sites_completed"] = done
+                self.status["total_imported"] = sum(imported for _, imported in saved.values())
+                self.status["progress"] = int(done / len(self.site_list) * 100)
+        else:
+            if self.resume:
+                logger.info("[Scraper] No interrupted run of this site list - starting from the beginning")
+            self.checkpoint.start()
+
+        self._start_async_engine()
+
+        # Discovery -> verification -> import, connected by bounded queues
+        scraper_cfg = self.config['scraper']
+        queue_size = scraper_cfg.get('queue_size', 200)
+        self.discover_stage = Stage("discover", self._discover_stage, workers=max_workers,
+                                    queue_size=max_workers)
+        self.verify_stage = Stage(
+            "verify", self._verify_stage,
+            workers=scraper_cfg.get('verify_workers', 8),
+            queue_size=queue_size,
+            batch_size=scraper_cfg.get('per_host_concurrency', 8) if self.async_engine else 1,
+            batch_wait=0.2,
+            key=lambda item: item[0],
+            gate=self._verify_gate,
+        )
+        self.import_stage = Stage(
+            "import", self._import_stage,
+            workers=scraper_cfg.get('import_workers', 2),
+            queue_size=queue_size,
+            batch_size=self.import_batch_size(),
+            batch_wait=2.0,
+        )
+
+        completed = False
+        try:
+            for stage in (self.discover_stage, self.verify_stage, self.import_stage):
+                stage.start()
+
+            target = scraper_cfg['target_recipes_per_site']
+            for site_idx, site in enumerate(self.site_list):
+                if not self.running:
+                    break
+                state, imported = saved.get(site, (None, 0))
+                if state == SITE_DONE:
                     continue
+                job = SiteJob(site_idx, site, target)
+                job.imported = imported
+                job.resumed = state == SITE_DISCOVERED
+                self.discover_stage.put(job)
 
-                # Import to enabled services
-                success_mealie = False
-                success_tandoor = False
-
-                # Try Mealie
-                if self.mealie_client and url not in existing_mealie:
-                    if self.mealie_client.import_recipe(url):
-                        success_mealie = True
-                        existing_mealie.add(url)
-
-                # Try Tandoor
-                if self.tandoor_client and url not in existing_tandoor:
-                    if self.tandoor_client.import_recipe(url):
-                        success_tandoor = True
-                        existing_tandoor.add(url)
-
-                # Output result
-                if success_mealie or success_tandoor:
-                    services = []
-                    if success_mealie:
-                        services.append("Mealie")
-                    if success_tandoor:
-                        services.append("Tandoor")
-
-                    print(f"      [OK] Imported to {', '.join(services)}: {url}")
-                    imported_count += 1
-                    self.status["total_imported"] += 1
-
-                    # Be polite - delay between imports
-                    time.sleep(self.config['scraper']['delay_between_imports'])
+            # Each stage finishes its queue before the next one is closed
+            self.discover_stage.close()
+            self.verify_stage.close()
+            self.import_stage.close()
 
-            self.status["sites_completed"] += 1
+            self._retry_deferred()
+            completed = self.running
+        finally:
+            self.checkpoint.finish(completed)
+            self._close_known_urls()
+            self._stop_async_engine()
+            self._close_stores()
+            self.session.close()
+            log_suppressed(logger)
+            set_run_id(None)
+
+        if not self.running:
+            logger.info("[Scraper] Stopped by user", extra={"run_id": run_id})
 
         # Done
         self.running = False
-        self.status["running"] = False
-        self.status["progress"] = 100
-        print("\n" + "=" * 60)
-        print(f"[Scraper] Complete! Imported {self.status['total_imported']} recipes")
-        print("=" * 60)
+        with self._lock:
+            self.status["running"] = False
+            self.status["progress"] = 100
+            self.status["active_sites"] = []
+        logger.info(f"[Scraper] Complete! Imported {self.status['total_imported']} recipes",
+                    extra={"run_id": run_id, "duration": time.monotonic() - started})
@@ -0,0 +1,140 @@
+import zlib
+from collections import namedtuple
+from datetime import datetime, timezone
+from lxml import etree
+
+# kind is "url" for a page entry or "sitemap" for a child sitemap in an index
+SitemapEntry = namedtuple("SitemapEntry", ["kind", "loc", "lastmod"])
+
+# Result of scanning a site's sitemaps: candidate URLs (newest first), their
+# lastmod timestamps (url -> float or None), the newest page lastmod seen,
+# whether candidates were cut off by the limit and whether a sitemap failed
+SitemapScan = namedtuple("SitemapScan", ["urls", "lastmods", "newest", "truncated", "failed"])
+
+GZIP_MAGIC = b"\x1f\x8b"
+
+
+class SitemapParser:
+    """
+    Incremental sitemap parser fed with raw response bytes
+
+    Accepts plain XML or gzip-compressed (.xml.gz) sitemaps and yields
+    entries as soon as each <url>/<sitemap> element closes. Parsed elements
+    are discarded immediately, so memory stays flat for very large files.
+    """
+
+    def __init__(self):
+        self._parser = etree.XMLPullParser(
+            events=("end",), recover=True, resolve_entities=False, no_network=True
+        )
+        self._gunzip = None
+        self._started = False
+        self.bytes_read = 0
+
+    def feed(self, chunk: bytes) -> list:
+        """
+        Feed the next chunk of the response body
+
+        Args:
+            chunk: Raw bytes as received (compressed or not)
+
+        Returns:
+            List of SitemapEntry completed by this chunk
+        """
+        if not chunk:
+            return []
+
+        self.bytes_read += len(chunk)
+        if not self._started:
+            self._started = True
+            if chunk.startswith(GZIP_MAGIC):
+                self._gunzip = zlib.decompressobj(16 + zlib.MAX_WBITS)
+
+        if self._gunzip:
+            chunk = self._gunzip.decompress(chunk)
+
+        self._parser.feed(chunk)
+        return self._read_events()
+
+    def close(self) -> list:
+        """Finish parsing and return any remaining entries"""
+        if self._gunzip:
+            self._parser.feed(self._gunzip.flush())
+        try:
+            self._parser.close()
+        except etree.XMLSyntaxError:
+            pass
+        return self._read_events()
+
+    def _read_events(self) -> list:
+        entries = []
+        for _, element in self._parser.read_events():
+            kind = etree.QName(element).localname if isinstance(element.tag, str) else None
+            if kind not in ("url", "sitemap"):
+                continue
+
+            loc = lastmod = None
+            for child in element:
+                if not isinstance(child.tag, str):
+                    continue
+                name = etree.QName(child).localname
+                if name == "loc" and child.text:
+                    loc = child.text.strip()
+                elif name == "lastmod" and child.text:
+                    lastmod = child.text.strip()
+
+            # Free the element and everything parsed before it
+            element.clear()
+            while element.getprevious() is not None:
+                del element.getparent()[0]
+
+            if loc:
+                entries.append(SitemapEntry(kind, loc, lastmod))
+        return entries
+
+
+def iter_sitemap(chunks):
+    """
+    Yield sitemap entries from an iterable of raw body chunks
+
+    Stop iterating (break) to stop reading; the caller owns closing the
+    underlying response.
+
+    Args:
+        chunks: Iterable of bytes (e.g. response.iter_content())
+
+    Yields:
+        SitemapEntry
+    """
+    parser = SitemapParser()
+    for chunk in chunks:
+        for entry in parser.feed(chunk):
+            yield entry
+    for entry in parser.close():
+        yield entry
+
+
+def parse_lastmod(value: str) -> float:
+    """
+    Parse a W3C datetime <lastmod> value (2024, 2024-05-01, 2024-05-01T10:00:00Z, ...)
+
+    Args:
+        value: Text of the <lastmod> element
+
+    Returns:
+        Unix timestamp (dates without a timezone are taken as UTC), or None
+    """
+    if not value:
+        return None
+    value = value.strip()
+    if len(value) == 4:
+        value += "-01-01"
+    elif len(value) == 7:
+        value += "-01"
+    try:
+        parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp()
@@ -0,0 +1,246 @@
+import json
+import time
+from collections import namedtuple
+from core.sitemap import SitemapEntry
+from core.state_store import SqliteStore
+
+CachedSitemap = namedtuple(
+    "CachedSitemap", ["url", "etag", "last_modified", "entries", "complete", "fetched_at"]
+)
+
+# Sitemaps with more parsed entries than this are not cached
+MAX_CACHED_ENTRIES = 50000
+
+
+class SitemapCache(SqliteStore):
+    """
+    Disk cache of parsed sitemap responses for conditional GETs
+
+    Each sitemap URL keeps its ETag / Last-Modified validators and the
+    entries parsed from the last 200 response. `complete` is False when
+    reading stopped early, in which case the cached entries are only a
+    prefix of the sitemap.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS sitemap_cache (
+            url TEXT PRIMARY KEY,
+            etag TEXT,
+            last_modified TEXT,
+            entries TEXT NOT NULL,
+            complete INTEGER NOT NULL,
+            fetched_at REAL NOT NULL
+        ) WITHOUT ROWID;
+    """
+
+    def get(self, url: str) -> CachedSitemap:
+        """
+        Look up a cached sitemap
+
+        Args:
+            url: Sitemap URL
+
+        Returns:
+            CachedSitemap or None
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT url, etag, last_modified, entries, complete, fetched_at "
+                "FROM sitemap_cache WHERE url = ?",
+                (url,),
+            ).fetchone()
+        if not row:
+            return None
+
+        entries = [SitemapEntry(*entry) for entry in json.loads(row[3])]
+        return CachedSitemap(row[0], row[1], row[2], entries, bool(row[4]), row[5])
+
+    def put(self, url: str, etag: str, last_modified: str, entries: list, complete: bool):
+        """
+        Store a sitemap response (ignored without validators or if too large)
+
+        Args:
+            url: Sitemap URL
+            etag: ETag response header
+            last_modified: Last-Modified response header
+            entries: Parsed SitemapEntry list
+            complete: Whether the whole sitemap was read
+        """
+        if not (etag or last_modified) or len(entries) > MAX_CACHED_ENTRIES:
+            self.delete(url)
+            return
+
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO sitemap_cache "
+                "(url, etag, last_modified, entries, complete, fetched_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (url, etag, last_modified, json.dumps([list(e) for e in entries]),
+                 int(complete), time.time()),
+            )
+
+    def delete(self, url: str):
+        """Drop a cached sitemap"""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM sitemap_cache WHERE url = ?", (url,))
+
+    @staticmethod
+    def conditional_headers(cached: CachedSitemap) -> dict:
+        """Build If-None-Match / If-Modified-Since headers for a cached sitemap"""
+        headers = {}
+        if cached and cached.etag:
+            headers["If-None-Match"] = cached.etag
+        if cached and cached.last_modified:
+            headers["If-Modified-Since"] = cached.last_modified
+        return headers
+
+
+class SitemapDiscoveryCache(SqliteStore):
+    """
+    Persistent result of sitemap discovery per site
+
+    Stores the resolved sitemap URL, or NULL for "no sitemap found", with
+    the time it was checked so both outcomes can expire independently.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS sitemap_discovery (
+            site TEXT PRIMARY KEY,
+            sitemap_url TEXT,
+            checked_at REAL NOT NULL
+        ) WITHOUT ROWID;
+    """
+
+    def lookup(self, site: str, ttl_hours: float, negative_ttl_hours: float) -> tuple:
+        """
+        Look up a fresh discovery result
+
+        Args:
+            site: Site base URL
+            ttl_hours: Lifetime of a found sitemap
+            negative_ttl_hours: Lifetime of a "no sitemap" result
+
+        Returns:
+            Tuple of (cached: bool, sitemap_url: str or None)
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT sitemap_url, checked_at FROM sitemap_discovery WHERE site = ?",
+                (site,),
+            ).fetchone()
+        if not row:
+            return (False, None)
+
+        sitemap_url, checked_at = row
+        ttl = ttl_hours if sitemap_url else negative_ttl_hours
+        if time.time() - checked_at > ttl * 3600:
+            return (False, None)
+        return (True, sitemap_url)
+
+    def store(self, site: str, sitemap_url: str):
+        """Record a discovery result (sitemap_url None means no sitemap)"""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO sitemap_discovery (site, sitemap_url, checked_at) "
+                "VALUES (?, ?, ?)",
+                (site, sitemap_url, time.time()),
+            )
+
+    def forget_sitemap(self, sitemap_url: str):
+        """Drop discovery results pointing at a sitemap that has disappeared"""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "DELETE FROM sitemap_discovery WHERE sitemap_url = ?", (sitemap_url,)
+            )
+
+
+class SiteWatermarks(SqliteStore):
+    """
+    Sitemap <lastmod> ranges per site that earlier crawls fully processed
+
+    The watermark covers everything up to a point in time. A crawl cut off
+    by scan_depth or the site's target only gets through the newest part
+    of what is new, which is kept as a separate crawled range until a
+    later crawl closes the gap to the watermark. Sitemap entries inside
+    either (and child sitemaps not modified after the watermark) are
+    skipped on the next run.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS site_watermarks (
+            site TEXT PRIMARY KEY,
+            high_water REAL NOT NULL,
+            updated_at REAL NOT NULL
+        ) WITHOUT ROWID;
+
+        CREATE TABLE IF NOT EXISTS site_crawled_ranges (
+            site TEXT PRIMARY KEY,
+            low REAL NOT NULL,
+            high REAL NOT NULL,
+            updated_at REAL NOT NULL
+        ) WITHOUT ROWID;
+    """
+
+    def get(self, site: str) -> float:
+        """Return the watermark of a site as a Unix timestamp (None if never crawled)"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT high_water FROM site_watermarks WHERE site = ?", (site,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def crawled(self, site: str) -> tuple:
+        """Return a site's crawled range above the watermark as (low, high), low exclusive (None if none)"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT low, high FROM site_crawled_ranges WHERE site = ?", (site,)
+            ).fetchone()
+        return tuple(row) if row else None
+
+    def advance(self, site: str, low: float, high: float):
+        """
+        Record that a crawl processed every entry modified after `low` up to `high`
+
+        The range is merged with the stored crawled range if they overlap
+        (otherwise the newer one is kept); once it reaches down to the
+        watermark, the watermark moves up to its top.
+
+        Args:
+            site: Site URL
+            low: Exclusive lower bound, or None if the crawl reached the watermark
+            high: Newest lastmod the crawl saw
+        """
+        now = time.time()
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                "SELECT high_water FROM site_watermarks WHERE site = ?", (site,)
+            ).fetchone()
+            watermark = row[0] if row else None
+            crawled = self._conn.execute(
+                "SELECT low, high FROM site_crawled_ranges WHERE site = ?", (site,)
+            ).fetchone()
+
+            if low is None or (watermark is not None and low <= watermark):
+                high = high if watermark is None else max(watermark, high)
+                if crawled and crawled[0] <= high:
+                    # The crawled range now joins up with the watermark
+                    high = max(high, crawled[1])
+                    self._conn.execute("DELETE FROM site_crawled_ranges WHERE site = ?", (site,))
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO site_watermarks (site, high_water, updated_at) "
+                    "VALUES (?, ?, ?)",
+                    (site, high, now),
+                )
+                return
+
+            if crawled and low <= crawled[1] and crawled[0] <= high:
+                low, high = min(low, crawled[0]), max(high, crawled[1])
+            elif crawled and crawled[1] > high:
+                # Keep the newer range already stored
+                return
+            if low < high:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO site_crawled_ranges (site, low, high, updated_at) "
+                    "VALUES (?, ?, ?, ?)",
+                    (site, low, high, now),
+                )
@@ -0,0 +1,45 @@
+import sqlite3
+import threading
+from pathlib import Path
+from config.config_manager import get_data_dir
+
+# Single SQLite file holding the scraper's persistent state
+STATE_DB_NAME = "dredger.db"
+
+
+def get_state_db_path() -> Path:
+    """Return path to the scraper state database"""
+    return get_data_dir() / STATE_DB_NAME
+
+
+class SqliteStore:
+    """
+    Base class for small thread-safe SQLite-backed stores
+
+    Subclasses set SCHEMA (executed on open) and use self._lock around
+    every access to self._conn.
+    """
+
+    SCHEMA = ""
+
+    def __init__(self, db_path: Path = None):
+        """
+        Open (and create if needed) the store
+
+        Args:
+            db_path: Database file (defaults to data/dredger.db)
+        """
+        self.db_path = Path(db_path) if db_path else get_state_db_path()
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(str(self.db_path), timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        if self.SCHEMA:
+            self._conn.executescript(self.SCHEMA)
+
+    def close(self):
+        """Close the database connection"""
+        with self._lock:
+            self._conn.close()
@@ -1,20 +1,39 @@
+import logging
 import requests
+from core.http_session import create_session
+from core.import_result import FAILED, IMPORTED, classify_status
+from core.paging import fetch_pages
+from core.retry import RetryPolicy
+
+logger = logging.getLogger(__name__)
 
 
 class TandoorClient:
     """Client for interacting with Tandoor API"""
 
-    def __init__(self, url: str, api_key: str):
+    SUPPORTS_INCREMENTAL = False
+
+    # Largest page size the recipe endpoint accepts
+    PAGE_SIZE = 100
+
+    def __init__(self, url: str, api_key: str, session: requests.Session = None,
+                 catalog_workers: int = 4, retry_policy: RetryPolicy = None):
         """
         Initialize Tandoor API client
 
         Args:
             url: Base URL of Tandoor instance (e.g., http://192.168.1.80:8080)
             api_key: API key for authentication
+            session: Shared pooled session (a private one is created if omitted)
+            catalog_workers: Catalog pages fetched in parallel
+            retry_policy: Backoff for timeouts, 429 and 5xx on imports (none if omitted)
         """
         self.url = url.rstrip('/')
         self.api_key = api_key
         self.headers = {"Authorization": f"Bearer {self.api_key}"}
+        self.session = session or create_session()
+        self.catalog_workers = catalog_workers
+        self.retry_policy = retry_policy or RetryPolicy(retries=0)
 
     def test_connection(self) -> tuple:
         """
@@ -24,7 +43,7 @@ class TandoorClient:
             Tuple of (success: bool, message: str)
         """
         try:
-            r = requests.get(
+            r = self.session.get(
                 f"{self.url}/api/recipe/?page=1&limit=1",
                 headers=self.headers,
                 timeout=10
@@ -49,44 +68,76 @@ class TandoorClient:
         Returns:
             Set of existing recipe URLs
         """
-        print("[Tandoor] Fetching existing recipes...")
+        urls, _ = self.sync_catalog()
+        return urls
+
+    def _fetch_recipe_page(self, page: int) -> dict:
+        """Fetch one page of recipes (raises on failure)"""
+        r = self.session.get(
+            f"{self.url}/api/recipe/",
+            params={"page": page, "page_size": self.PAGE_SIZE},
+            headers=self.headers,
+            timeout=10,
+        )
+        r.raise_for_status()
+        return r.json()
+
+    def sync_catalog(self, since: str = None) -> tuple:
+        """
+        Fetch all recipe URLs from Tandoor
+
+        The first page reports the total count; the remaining pages are
+        fetched in parallel. Tandoor has no update-timestamp filter, so
+        `since` is accepted for interface parity and ignored.
+
+        Args:
+            since: Unused
+
+        Returns:
+            Tuple of (urls: set, watermark: str) with an empty watermark, or
+            None as the watermark if the sync did not complete
+        """
+        logger.info("[Tandoor] Fetching existing recipes...", extra={"stage": "catalog_sync"})
         existing = set()
-        page = 1
-
-        while True:
-            try:
-                r = requests.get(
-                    f"{self.url}/api/recipe/?page={page}&limit=100",
-                    headers=self.headers,
-                    timeout=10,
-                )
-                if r.status_code != 200:
-                    if r.status_code == 401:
-                        print("[Tandoor] Authentication failed")
-                    else:
-                        print(f"[Tandoor] Request failed with status {r.status_code}")
-                    break
-
-                data = r.json()
-                results = data.get("results", [])
-                if not results:
-                    break
-
-                for recipe in results:
-                    if recipe.get("source"):
-                        existing.add(recipe.get("source"))
-
-                print(f"   ...scanned page {page} (Total: {len(existing)})", end="\r")
-
-                if not data.get("next"):
-                    break
-                page += 1
-            except Exception as e:
-                print(f"\n[Tandoor] Error reading index: {e}")
-                break
-
-        print(f"\n[Tandoor] Found {len(existing)} existing recipe URLs")
-        return existing
+
+        def collect(page, data):
+            for recipe in data.get("results", []):
+                if recipe.get("source"):
+                    existing.add(recipe.get("source"))
+
+            logger.debug(f"[Tandoor] Scanned page {page} (Total: {len(existing)})",
+                         extra={"stage": "catalog_sync"})
+
+        try:
+            first = self._fetch_recipe_page(1)
+        except requests.exceptions.HTTPError as e:
+            if e.response is not None and e.response.status_code == 401:
+                logger.error("[Tandoor] Authentication failed", extra={"stage": "catalog_sync"})
+            else:
+                logger.error(f"[Tandoor] Request failed: {e}", extra={"stage": "catalog_sync"})
+            return (set(), None)
+        except Exception as e:
+            logger.error(f"[Tandoor] Error reading index: {e}", extra={"stage": "catalog_sync"})
+            return (set(), None)
+
+        collect(1, first)
+        page_size = len(first.get("results", [])) or self.PAGE_SIZE
+        total_pages = max(1, -(-first.get("count", 0) // page_size))
+
+        _, failed = fetch_pages(
+            self._fetch_recipe_page,
+            range(2, total_pages + 1),
+            workers=self.catalog_workers,
+            on_page=collect,
+        )
+
+        logger.info(f"[Tandoor] Found {len(existing)} existing recipe URLs",
+                    extra={"stage": "catalog_sync"})
+        if failed:
+            logger.warning(f"[Tandoor] {len(failed)} of {total_pages} pages failed - index is partial",
+                           extra={"stage": "catalog_sync"})
+            return (existing, None)
+        return (existing, "")
 
     def import_recipe(self, url: str) -> bool:
         """
@@ -98,6 +149,18 @@ class TandoorClient:
         Returns:
             True if successful, False otherwise
         """
+        return self.import_recipe_result(url) == IMPORTED
+
+    def import_recipe_result(self, url: str) -> str:
+        """
+        Import a single recipe by URL and classify the outcome
+
+        Args:
+            url: Recipe URL to import
+
+        Returns:
+            IMPORTED, REJECTED (the server refused this URL) or FAILED (transient)
+        """
         endpoint = f"{self.url}/api/recipe/from-url/"
         headers = {
             "Authorization": f"Bearer {self.api_key}",
@@ -105,13 +168,14 @@ class TandoorClient:
         }
 
         try:
-            r = requests.post(
+            r = self.retry_policy.send(lambda: self.session.post(
                 endpoint,
                 json={"url": url},
                 headers=headers,
                 timeout=10
-            )
-            return r.status_code in [200, 201]
+            ))
+            return classify_status(r.status_code, (200, 201))
         except Exception as e:
-            print(f"[Tandoor] Error importing {url}: {e}")
-            return False
+            logger.error(f"[Tandoor] Error importing {url}: {e}",
+                         extra={"url": url, "stage": "tandoor_import"})
+            return FAILED
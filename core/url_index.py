@@ -0,0 +1,294 @@
+import threading
+import time
+from pathlib import Path
+from core.state_store import SqliteStore
+from core.urls import CANONICAL_VERSION, canonical_url
+
+# index_meta target holding settings of the index itself
+INDEX_META = "*"
+
+
+class UrlIndex(SqliteStore):
+    """
+    Local on-disk index of recipe source URLs known to each target
+
+    A target is a service instance, e.g. "mealie:http://192.168.1.79:9000".
+    The index is updated as imports succeed and only reconciled with the
+    server when it is stale or a resync was requested. URLs are stored in
+    canonical_url() form.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS known_urls (
+            target TEXT NOT NULL,
+            url TEXT NOT NULL,
+            added_at REAL NOT NULL,
+            PRIMARY KEY (target, url)
+        ) WITHOUT ROWID;
+
+        CREATE TABLE IF NOT EXISTS index_meta (
+            target TEXT NOT NULL,
+            key TEXT NOT NULL,
+            value TEXT,
+            PRIMARY KEY (target, key)
+        ) WITHOUT ROWID;
+    """
+
+    def __init__(self, db_path: Path = None):
+        super().__init__(db_path)
+        self._canonicalize()
+
+    def _canonicalize(self):
+        """Rewrite URLs stored before (or under an older) canonical_url() once"""
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                "SELECT value FROM index_meta WHERE target = ? AND key = 'canonical_version'",
+                (INDEX_META,),
+            ).fetchone()
+            if row and row[0] == CANONICAL_VERSION:
+                return
+            rows = self._conn.execute("SELECT target, url, added_at FROM known_urls").fetchall()
+            self._conn.execute("DELETE FROM known_urls")
+            # Oldest first, so a merged URL keeps its first added_at
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO known_urls (target, url, added_at) VALUES (?, ?, ?)",
+                ((target, canonical_url(url), added_at)
+                 for target, url, added_at in sorted(rows, key=lambda row: row[2])),
+            )
+            self._set_meta(INDEX_META, "canonical_version", CANONICAL_VERSION)
+
+    def load(self, target: str) -> set:
+        """
+        Load all known URLs for a target
+
+        Args:
+            target: Target key
+
+        Returns:
+            Set of canonical URLs
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT url FROM known_urls WHERE target = ?", (target,)
+            ).fetchall()
+        return {row[0] for row in rows}
+
+    def count(self, target: str) -> int:
+        """Return the number of known URLs for a target"""
+        with self._lock:
+            return self._conn.execute(
+                "SELECT COUNT(*) FROM known_urls WHERE target = ?", (target,)
+            ).fetchone()[0]
+
+    def add(self, target: str, url: str):
+        """Record a single URL (e.g. after a successful import)"""
+        self.merge(target, [url])
+
+    def merge(self, target: str, urls):
+        """Add URLs to a target without removing existing ones"""
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO known_urls (target, url, added_at) VALUES (?, ?, ?)",
+                ((target, canonical_url(url), now) for url in urls),
+            )
+
+    def replace(self, target: str, urls):
+        """
+        Replace a target's URLs with a full server catalog and mark it synced
+
+        Args:
+            target: Target key
+            urls: Complete set of URLs reported by the server
+        """
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM known_urls WHERE target = ?", (target,))
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO known_urls (target, url, added_at) VALUES (?, ?, ?)",
+                ((target, canonical_url(url), now) for url in urls),
+            )
+            self._set_meta(target, "last_full_sync", str(now))
+            self._set_meta(target, "last_sync", str(now))
+
+    def mark_synced(self, target: str):
+        """Record a successful (incremental) reconcile with the server"""
+        self.set_meta(target, "last_sync", str(time.time()))
+
+    def expire(self, target: str):
+        """Have the next run reconcile a target with its server (incrementally where supported)"""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "DELETE FROM index_meta WHERE target = ? AND key = 'last_sync'", (target,)
+            )
+
+    def get_meta(self, target: str, key: str) -> str:
+        """Read a metadata value for a target (None if unset)"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value FROM index_meta WHERE target = ? AND key = ?", (target, key)
+            ).fetchone()
+        return row[0] if row else None
+
+    def set_meta(self, target: str, key: str, value: str):
+        """Write a metadata value for a target"""
+        with self._lock, self._conn:
+            self._set_meta(target, key, value)
+
+    def _set_meta(self, target: str, key: str, value: str):
+        self._conn.execute(
+            "INSERT OR REPLACE INTO index_meta (target, key, value) VALUES (?, ?, ?)",
+            (target, key, value),
+        )
+
+    def last_sync(self, target: str) -> float:
+        """Return the time of the last full or incremental sync (None if never synced)"""
+        value = self.get_meta(target, "last_sync")
+        return float(value) if value else None
+
+    def needs_full_sync(self, target: str) -> bool:
+        """Check whether a target has never been fully synced or a resync was requested"""
+        return self.get_meta(target, "last_full_sync") is None
+
+    def needs_sync(self, target: str, max_age_hours: float) -> bool:
+        """Check whether a target must be reconciled with its server"""
+        last = self.last_sync(target)
+        if last is None:
+            return True
+        return (time.time() - last) > max_age_hours * 3600
+
+    def request_resync(self, target: str = None):
+        """
+        Force a full reconcile on the next run
+
+        Args:
+            target: Target key, or None for every target
+        """
+        with self._lock, self._conn:
+            if target:
+                self._conn.execute(
+                    "DELETE FROM index_meta WHERE target = ? "
+                    "AND key IN ('last_full_sync', 'last_sync')",
+                    (target,),
+                )
+            else:
+                self._conn.execute(
+                    "DELETE FROM index_meta WHERE key IN ('last_full_sync', 'last_sync')"
+                )
+
+
+class KnownUrlSets:
+    """
+    In-memory known-URL sets shared by the scrape jobs of one process
+
+    The first job to open a target loads it (from UrlIndex, syncing if
+    needed); jobs opening it while it is in use share the same set. A URL
+    is claimed before it is imported, so two jobs crawling overlapping
+    site lists never import it twice. A target is dropped once the last
+    job using it closes it, so the next run loads it fresh. URLs passed in
+    are compared in canonical_url() form.
+    """
+
+    def __init__(self):
+        # target -> [set of URLs, number of jobs using it]
+        self._targets = {}
+        # URLs some job is importing right now (into any service)
+        self._importing = set()
+        self._lock = threading.Lock()
+        # Held while a target loads, so jobs starting together sync it once
+        self._load_lock = threading.Lock()
+
+    def open(self, target: str, load):
+        """
+        Start using a target
+
+        Args:
+            target: Target key
+            load: Callable returning the target's known URLs, called only
+                if no other job has the target open
+        """
+        with self._load_lock:
+            with self._lock:
+                entry = self._targets.get(target)
+                if entry:
+                    entry[1] += 1
+                    return
+
+            urls = {canonical_url(url) for url in load()}
+            with self._lock:
+                self._targets[target] = [urls, 1]
+
+    def close(self, target: str):
+        """Stop using a target opened with open()"""
+        with self._lock:
+            entry = self._targets.get(target)
+            if entry:
+                entry[1] -= 1
+                if entry[1] <= 0:
+                    del self._targets[target]
+
+    def claim(self, target: str, url: str) -> bool:
+        """
+        Reserve a URL for import
+
+        Returns:
+            True if the caller now owns the import, False if already known
+        """
+        url = canonical_url(url)
+        with self._lock:
+            urls = self._targets[target][0]
+            if url in urls:
+                return False
+            urls.add(url)
+            return True
+
+    def release(self, target: str, url: str):
+        """Give back a URL claimed with claim() after a failed import"""
+        url = canonical_url(url)
+        with self._lock:
+            entry = self._targets.get(target)
+            if entry:
+                entry[0].discard(url)
+
+    def begin_import(self, url: str) -> bool:
+        """
+        Take a URL for importing into every service
+
+        Keeps one job from importing a recipe into Mealie while another
+        imports it into Tandoor, so it is counted by a single job.
+
+        Returns:
+            False if another job is importing the URL
+        """
+        url = canonical_url(url)
+        with self._lock:
+            if url in self._importing:
+                return False
+            self._importing.add(url)
+            return True
+
+    def end_import(self, url: str):
+        """Release a URL taken with begin_import()"""
+        url = canonical_url(url)
+        with self._lock:
+            self._importing.discard(url)
+
+    def known(self, targets: list, url: str) -> bool:
+        """Return True if every one of the targets (at least one) knows the URL"""
+        url = canonical_url(url)
+        with self._lock:
+            return bool(targets) and all(url in self._targets[target][0] for target in targets)
+
+    def common(self, targets: list) -> set:
+        """
+        Return the URLs known to every one of the targets
+
+        Args:
+            targets: Open target keys
+
+        Returns:
+            A snapshot set of canonical URLs (empty if no targets are given)
+        """
+        with self._lock:
+            sets = [self._targets[target][0] for target in targets]
+            return set.intersection(*sets) if sets else set()
@@ -0,0 +1,45 @@
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+# Bump when canonical_url() changes, so stored URLs are rewritten once
+CANONICAL_VERSION = "1"
+
+# Query parameters that only track where a visitor came from
+TRACKING_PARAMS = {"fbclid", "gclid", "mc_cid", "mc_eid"}
+
+
+def canonical_url(url: str) -> str:
+    """
+    Return the form of a URL used to compare and store recipe URLs
+
+    Two URLs of the same page compare equal once canonical: the scheme
+    becomes https, the host is lowercased without "www." or a default
+    port, the trailing slash, fragment and tracking parameters (utm_*,
+    fbclid, ...) are dropped. The result is a lookup key only; pages are
+    still fetched and imported by the URL the site published.
+
+    Args:
+        url: Recipe URL as found in a sitemap or reported by Mealie/Tandoor
+
+    Returns:
+        Canonical URL (the stripped input if it isn't an http(s) URL)
+    """
+    url = url.strip()
+    try:
+        parts = urlsplit(url)
+        port = parts.port
+    except ValueError:
+        return url
+    if parts.scheme.lower() not in ("http", "https") or not parts.hostname:
+        return url
+
+    host = parts.hostname
+    if host.startswith("www."):
+        host = host[4:]
+    if port and port not in (80, 443):
+        host = f"{host}:{port}"
+
+    query = urlencode([
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not key.lower().startswith("utm_") and key.lower() not in TRACKING_PARAMS
+    ])
+    return urlunsplit(("https", host, parts.path.rstrip("/"), query, ""))
@@ -0,0 +1,193 @@
+import logging
+import signal
+import threading
+import time
+from pathlib import Path
+from config.config_manager import load_config, load_site_list
+from core.jobs import (
+    JOB_DONE, JOB_FAILED, JOB_INTERRUPTED, JOB_STOPPED, WORKER_HEARTBEAT, JobStore
+)
+from core.log_files import configure_logging
+from core.metrics import QUEUE_DEPTH, REGISTRY, SCRAPER_STATUS
+from core.pipeline import ConcurrencyBudget
+from core.rate_limiter import build_rate_limiter
+from core.scraper import RecipeScraper
+from core.url_index import KnownUrlSets
+
+logger = logging.getLogger(__name__)
+
+# The worker is the only process writing the scraper log
+LOG_FILE = Path(__file__).parent.parent / 'logs' / 'scraper.log'
+
+# Seconds between checks for queued jobs while idle
+POLL_INTERVAL = 1.0
+
+# Seconds between status writes (and stop-request checks) while jobs run
+STATUS_INTERVAL = 0.5
+
+
+class ActiveJob:
+    """A claimed job and the thread running its scraper"""
+
+    def __init__(self, job_id: int, scraper: RecipeScraper):
+        self.job_id = job_id
+        self.scraper = scraper
+        self.errors = []
+        self.last_status = None
+        self.stop_requested = False
+        self.thread = threading.Thread(target=self._run, name=f"job-{job_id}", daemon=True)
+
+    def _run(self):
+        try:
+            self.scraper.run_scrape()
+        except Exception as e:
+            logger.exception(f"[Worker] Job {self.job_id} failed: {e}")
+            self.errors.append(str(e))
+
+
+class ScrapeWorker:
+    """
+    Process that runs the scrape jobs queued by the web interface
+
+    Runs up to scraper.max_jobs jobs at a time, each in its own thread.
+    Running jobs share one known-URL set per service (so overlapping site
+    lists never import a URL twice), one per-host rate limiter and one
+    concurrency budget of scraper.total_workers. While jobs run, their
+    status is copied to the job table and stop requests are picked up from
+    it; a heartbeat (with the current metrics) tells the web tier the
+    worker is alive.
+    """
+
+    def __init__(self, jobs: JobStore = None):
+        self.jobs = jobs or JobStore()
+        # job id -> ActiveJob
+        self.running = {}
+        self.known_urls = KnownUrlSets()
+        self.budget = ConcurrencyBudget(load_config()['scraper'].get('total_workers', 16))
+        self.rate_limiter = None
+        self._shutdown = threading.Event()
+        self._last_heartbeat = 0.0
+
+    def run_forever(self):
+        """Claim and run queued jobs until shutdown() is called"""
+        # Only one worker may run: recover() would mark another's jobs interrupted
+        other = self.jobs.register_worker()
+        if other:
+            logger.error(f"[Worker] Another worker (pid {other}) is already running - exiting")
+            return
+
+        recovered = self.jobs.recover()
+        if recovered:
+            logger.warning(f"[Worker] Marked {recovered} job(s) of a previous worker as interrupted")
+        logger.info("[Worker] Waiting for scrape jobs")
+
+        while not self._shutdown.is_set():
+            self._heartbeat()
+            self._start_queued()
+            self._check_running()
+            self._shutdown.wait(STATUS_INTERVAL if self.running else POLL_INTERVAL)
+
+        # Let stopped jobs wind down so they are recorded as interrupted
+        while self.running:
+            time.sleep(STATUS_INTERVAL)
+            self._check_running()
+
+    def shutdown(self, *_):
+        """Stop the running jobs (they stay resumable) and leave run_forever()"""
+        self._shutdown.set()
+        for active in list(self.running.values()):
+            active.scraper.stop()
+
+    def _heartbeat(self, force: bool = False):
+        now = time.monotonic()
+        if force or now - self._last_heartbeat >= WORKER_HEARTBEAT:
+            for active in list(self.running.values()):
+                active.scraper.update_metrics(job=str(active.job_id))
+            self.jobs.heartbeat(REGISTRY.render())
+            self._last_heartbeat = now
+
+    def _start_queued(self):
+        """Claim queued jobs while there are free job slots"""
+        max_jobs = load_config()['scraper'].get('max_jobs', 2)
+        while len(self.running) < max_jobs and not self._shutdown.is_set():
+            job = self.jobs.claim_next()
+            if not job:
+                break
+            self.start_job(job)
+
+    def start_job(self, job: dict):
+        """
+        Start a claimed job on its own thread
+
+        Args:
+            job: Job from JobStore.claim_next()
+        """
+        job_id = job["id"]
+        logger.info(f"[Worker] Starting job {job_id}: {job['site_list']}")
+        try:
+            config = load_config()
+            site_list = load_site_list(job["site_list"])
+            if not site_list:
+                raise ValueError(f"No sites found in {job['site_list']}")
+
+            # Jobs running together share one politeness limiter per host;
+            # rate limit changes are picked up once the worker is idle
+            if not self.running:
+                self.rate_limiter = build_rate_limiter(config)
+            self.budget.set_limit(config['scraper'].get('total_workers', 16))
+
+            scraper = RecipeScraper(
+                config, site_list, resume=job["resume"], known_urls=self.known_urls,
+                budget=self.budget, rate_limiter=self.rate_limiter
+            )
+        except Exception as e:
+            logger.error(f"[Worker] Job {job_id} could not start: {e}")
+            self.jobs.finish(job_id, JOB_FAILED, str(e))
+            return
+
+        active = ActiveJob(job_id, scraper)
+        self.running[job_id] = active
+        active.thread.start()
+
+    def _check_running(self):
+        """Store status changes, pass on stop requests and record finished jobs"""
+        for job_id, active in list(self.running.items()):
+            finished = not active.thread.is_alive()
+            status = active.scraper.get_status()
+            if status != active.last_status:
+                self.jobs.set_status(job_id, status)
+                active.last_status = status
+            if not active.stop_requested and self.jobs.stop_requested(job_id):
+                active.stop_requested = True
+                active.scraper.stop()
+            if finished:
+                self._finish(active)
+
+    def _finish(self, active: ActiveJob):
+        """Record how a job ended and drop it from the running jobs"""
+        if active.errors:
+            state = JOB_FAILED
+        elif self._shutdown.is_set():
+            state = JOB_INTERRUPTED
+        elif active.stop_requested:
+            state = JOB_STOPPED
+        else:
+            state = JOB_DONE
+        self.jobs.finish(active.job_id, state, active.errors[0] if active.errors else None)
+
+        del self.running[active.job_id]
+        QUEUE_DEPTH.remove(job=str(active.job_id))
+        SCRAPER_STATUS.remove(job=str(active.job_id))
+        self._heartbeat(force=True)
+        logger.info(f"[Worker] Job {active.job_id} {state}")
+
+
+def main():
+    """Entry point of the worker process (`python worker.py`, or started by app.py)"""
+    LOG_FILE.parent.mkdir(exist_ok=True)
+    configure_logging(LOG_FILE)
+
+    worker = ScrapeWorker()
+    signal.signal(signal.SIGTERM, worker.shutdown)
+    signal.signal(signal.SIGINT, worker.shutdown)
+    worker.run_forever()
@@ -33,7 +33,8 @@ def extract_config():
             "dry_run": False,
             "target_recipes_per_site": 50,
             "scan_depth": 1000,
-            "delay_between_imports": 1.5
+            "requests_per_second": 2.0,
+            "burst": 5
         },
         "active_site_list": "sites.txt"
     }
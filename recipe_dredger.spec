@@ -27,7 +27,6 @@ hiddenimports = [
     'click',
     'itsdangerous',
     'blinker',
-    'bs4',
     'lxml',
     'lxml.etree',
     'lxml._elementpath',
@@ -1,10 +1,17 @@
-from flask import Blueprint, render_template, current_app, redirect, url_for
+from flask import Blueprint, Response, jsonify, render_template, request, redirect, url_for
 from config.config_manager import load_config, get_site_lists
+from core.jobs import JobStore
+from core.log_files import read_after, read_page, tail_lines
 from config.setup_wizard import is_first_run
 from pathlib import Path
 
 main_bp = Blueprint('main', __name__)
 
+LOG_FILE = Path(__file__).parent.parent / 'logs' / 'scraper.log'
+
+# Largest page the log API returns
+MAX_LOG_PAGE = 1000
+
 
 @main_bp.route('/')
 def dashboard():
@@ -16,19 +23,12 @@ def dashboard():
     config = load_config()
     site_lists = get_site_lists()
 
-    # Get scraper status
-    scraper_instance = current_app.get_scraper_instance()
-    if scraper_instance:
-        scraper_status = scraper_instance.get_status()
-    else:
-        scraper_status = {
-            "running": False,
-            "progress": 0,
-            "current_site": "",
-            "total_imported": 0,
-            "sites_completed": 0,
-            "sites_total": 0
-        }
+    # Get scraper status (reported by the worker process)
+    jobs = JobStore()
+    try:
+        scraper_status = jobs.status()
+    finally:
+        jobs.close()
 
     return render_template(
         'dashboard.html',
@@ -41,18 +41,63 @@ def dashboard():
 @main_bp.route('/logs')
 def logs():
     """Display scraper logs"""
-    log_file = Path(__file__).parent.parent / 'logs' / 'scraper.log'
-
     log_lines = []
-    if log_file.exists():
+    if LOG_FILE.exists():
         try:
-            with open(log_file, 'r', encoding='utf-8') as f:
-                # Read last 500 lines
-                all_lines = f.readlines()
-                log_lines = all_lines[-500:]
+            # Read last 500 lines
+            log_lines = tail_lines(LOG_FILE, 500)
         except Exception as e:
             log_lines = [f"Error reading log file: {e}"]
     else:
         log_lines = ["No logs yet. Start the scraper to generate logs."]
 
     return render_template('logs.html', log_lines=log_lines)
+
+
+@main_bp.route('/logs/api')
+def logs_api():
+    """
+    Page through the log file by byte offset
+
+    Query parameters:
+        before: Offset returned by the previous page (omit for the newest lines)
+        after: Offset ("end") of an earlier response; returns lines written since
+        limit: Lines per page (default 200)
+        level, site, run: Filters by level, text in the message and scraper run id
+    """
+    try:
+        limit = min(max(request.args.get('limit', 200, type=int), 1), MAX_LOG_PAGE)
+        filters = {
+            "level": request.args.get('level') or None,
+            "site": request.args.get('site') or None,
+            "run_id": request.args.get('run') or None,
+        }
+        after = request.args.get('after', type=int)
+        if after is not None:
+            return jsonify(read_after(LOG_FILE, after, limit, **filters))
+
+        return jsonify(read_page(
+            LOG_FILE, before=request.args.get('before', type=int), limit=limit, **filters
+        ))
+    except Exception as e:
+        return jsonify({
+            "success": False,
+            "message": f"Error reading log file: {str(e)}"
+        }), 500
+
+
+@main_bp.route('/metrics')
+def metrics():
+    """
+    Prometheus metrics: per-stage latency, bytes, import outcomes and queue depths
+
+    The metrics live in the worker process, which stores a snapshot with
+    every heartbeat.
+    """
+    jobs = JobStore()
+    try:
+        worker = jobs.worker()
+    finally:
+        jobs.close()
+
+    return Response(worker["metrics"] if worker else "", mimetype='text/plain; version=0.0.4')
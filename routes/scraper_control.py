@@ -1,55 +1,92 @@
-from flask import Blueprint, request, jsonify, current_app
-import threading
-from core.scraper import RecipeScraper
+from flask import Blueprint, Response, request, jsonify, stream_with_context
+import queue
+import time
+from pathlib import Path
+from core.checkpoint import RunCheckpoint
+from core.events import BROKER, LogTailer, StatusWatcher, format_sse
+from core.jobs import JobStore, job_status, job_summary
+from core.url_index import UrlIndex
 from config.config_manager import load_config, load_site_list, save_config, get_site_lists
 
 scraper_bp = Blueprint('scraper', __name__)
 
 
-@scraper_bp.route('/start', methods=['POST'])
-def start_scraper():
-    """Start the scraping process"""
-    # Check if scraper is already running
-    scraper_thread = current_app.get_scraper_thread()
-    if scraper_thread and scraper_thread.is_alive():
+def _queue_job(site_list_file: str, resume: bool, action: str):
+    """
+    Validate a scrape request and queue it in the job table
+
+    Args:
+        site_list_file: Site list filename in data/
+        resume: Continue the interrupted run of this list
+        action: What the messages call the request ("Scraper" or "Job")
+
+    Returns:
+        Flask response tuple of (json, status code)
+    """
+    config = load_config()
+    site_list = load_site_list(site_list_file)
+
+    if not site_list:
         return jsonify({
             "success": False,
-            "message": "Scraper is already running"
+            "message": f"No sites found in {site_list_file}"
         }), 400
 
-    try:
-        # Load configuration and site list
-        config = load_config()
-        site_list_file = config.get('active_site_list', 'sites.txt')
-        site_list = load_site_list(site_list_file)
+    # Check if at least one service is enabled
+    if not config['mealie']['enabled'] and not config['tandoor']['enabled']:
+        return jsonify({
+            "success": False,
+            "message": "Please enable at least one service (Mealie or Tandoor) in settings"
+        }), 400
 
-        if not site_list:
+    # Resuming only makes sense if the last run of this list was interrupted
+    if resume:
+        checkpoint = RunCheckpoint(site_list)
+        try:
+            resumable = checkpoint.resumable()
+        finally:
+            checkpoint.close()
+        if not resumable:
             return jsonify({
                 "success": False,
-                "message": f"No sites found in {site_list_file}"
+                "message": f"No interrupted run of {site_list_file} to resume"
             }), 400
 
-        # Check if at least one service is enabled
-        if not config['mealie']['enabled'] and not config['tandoor']['enabled']:
-            return jsonify({
-                "success": False,
-                "message": "Please enable at least one service (Mealie or Tandoor) in settings"
-            }), 400
+    # The job table makes sure a list is queued only once, whichever web process asks
+    jobs = JobStore()
+    try:
+        job_id = jobs.create(site_list_file, resume=resume)
+        worker = jobs.worker()
+    finally:
+        jobs.close()
 
-        # Create scraper instance
-        scraper_instance = RecipeScraper(config, site_list)
-        current_app.set_scraper_instance(scraper_instance)
+    if job_id is None:
+        return jsonify({
+            "success": False,
+            "message": f"A scrape of {site_list_file} is already queued or running"
+        }), 400
 
-        # Start scraper in background thread
-        thread = threading.Thread(target=scraper_instance.run_scrape, daemon=True)
-        thread.start()
-        current_app.set_scraper_thread(thread)
+    message = f"{action} resumed successfully" if resume else f"{action} started successfully"
+    if not (worker and worker["alive"]):
+        message += " - it will begin once the worker process is running (python worker.py)"
+    return jsonify({
+        "success": True,
+        "message": message,
+        "job_id": job_id
+    }), 200
 
-        return jsonify({
-            "success": True,
-            "message": "Scraper started successfully"
-        })
 
+@scraper_bp.route('/start', methods=['POST'])
+def start_scraper():
+    """
+    Queue a scrape of the active site list for the worker process
+
+    A JSON body {"resume": true} continues an interrupted run.
+    """
+    try:
+        config = load_config()
+        resume = bool((request.get_json(silent=True) or {}).get('resume'))
+        return _queue_job(config.get('active_site_list', 'sites.txt'), resume, "Scraper")
     except Exception as e:
         return jsonify({
             "success": False,
@@ -59,20 +96,24 @@ def start_scraper():
 
 @scraper_bp.route('/stop', methods=['POST'])
 def stop_scraper():
-    """Stop the scraping process"""
-    scraper_instance = current_app.get_scraper_instance()
+    """Ask the worker to stop every running scrape (queued ones are cancelled)"""
+    try:
+        jobs = JobStore()
+        try:
+            stopping = [job["id"] for job in jobs.active() if jobs.request_stop(job["id"])]
+        finally:
+            jobs.close()
 
-    if not scraper_instance or not scraper_instance.running:
-        return jsonify({
-            "success": False,
-            "message": "Scraper is not running"
-        }), 400
+        if not stopping:
+            return jsonify({
+                "success": False,
+                "message": "Scraper is not running"
+            }), 400
 
-    try:
-        scraper_instance.stop()
         return jsonify({
             "success": True,
-            "message": "Scraper stopping..."
+            "message": "Scraper stopping...",
+            "job_ids": stopping
         })
     except Exception as e:
         return jsonify({
@@ -81,22 +122,202 @@ def stop_scraper():
         }), 500
 
 
+@scraper_bp.route('/jobs', methods=['GET'])
+def list_jobs():
+    """List the queued and running jobs plus the most recent finished ones"""
+    jobs = JobStore()
+    try:
+        recent = jobs.recent()
+        worker = jobs.worker()
+    finally:
+        jobs.close()
+
+    return jsonify({
+        "jobs": [job_summary(job) for job in recent],
+        "worker_alive": bool(worker and worker["alive"])
+    })
+
+
+@scraper_bp.route('/jobs', methods=['POST'])
+def create_job():
+    """
+    Queue a scrape job
+
+    JSON body:
+        site_list: Site list filename (defaults to the active list)
+        resume: Continue the interrupted run of that list
+    """
+    try:
+        data = request.get_json(silent=True) or {}
+        site_list_file = data.get('site_list') or load_config().get('active_site_list', 'sites.txt')
+        if site_list_file not in get_site_lists():
+            return jsonify({
+                "success": False,
+                "message": f"Site list '{site_list_file}' not found"
+            }), 404
+        return _queue_job(site_list_file, bool(data.get('resume')), "Job")
+    except Exception as e:
+        return jsonify({
+            "success": False,
+            "message": f"Error creating job: {str(e)}"
+        }), 500
+
+
+@scraper_bp.route('/jobs/<int:job_id>', methods=['GET'])
+def get_job(job_id):
+    """Get the status of one job"""
+    jobs = JobStore()
+    try:
+        job = jobs.get(job_id)
+        worker = jobs.worker()
+    finally:
+        jobs.close()
+
+    if not job:
+        return jsonify({
+            "success": False,
+            "message": f"Job {job_id} not found"
+        }), 404
+    return jsonify(job_status(job, worker))
+
+
+@scraper_bp.route('/jobs/<int:job_id>/cancel', methods=['POST'])
+def cancel_job(job_id):
+    """Stop a running job, or drop a queued one"""
+    jobs = JobStore()
+    try:
+        job = jobs.get(job_id)
+        cancelled = bool(job) and jobs.request_stop(job_id)
+    finally:
+        jobs.close()
+
+    if not job:
+        return jsonify({
+            "success": False,
+            "message": f"Job {job_id} not found"
+        }), 404
+    if not cancelled:
+        return jsonify({
+            "success": False,
+            "message": f"Job {job_id} is not queued or running"
+        }), 400
+
+    return jsonify({
+        "success": True,
+        "message": f"Job {job_id} stopping..."
+    })
+
+
 @scraper_bp.route('/status', methods=['GET'])
 def scraper_status():
-    """Get current scraper status"""
-    scraper_instance = current_app.get_scraper_instance()
+    """Get current scraper status (as last reported by the worker process)"""
+    return jsonify(_read_status())
+
+
+# Seconds between keep-alive comments on an idle event stream
+EVENT_HEARTBEAT_SECONDS = 15
+
+# Seconds before an event stream is closed; browsers reconnect on their own,
+# so a server worker is never held by one client for longer than this
+EVENT_STREAM_SECONDS = 300
+
+# Long-lived store for the status watcher, opened on first use
+_status_jobs = None
+
+
+def _read_status() -> dict:
+    global _status_jobs
+    if _status_jobs is None:
+        _status_jobs = JobStore()
+    return _status_jobs.status()
+
+
+log_tailer = LogTailer(Path(__file__).parent.parent / 'logs' / 'scraper.log', BROKER)
+status_watcher = StatusWatcher(_read_status, BROKER)
+
 
-    if not scraper_instance:
+@scraper_bp.route('/events', methods=['GET'])
+def scraper_events():
+    """
+    Server-Sent Events stream of status changes and new log lines
+
+    Events:
+        status: Full scraper status (sent on connect and on every change)
+        log: Lines appended to logs/scraper.log, each with its text and the
+            fields the logs page filters on
+
+    The stream ends after EVENT_STREAM_SECONDS and the browser reconnects.
+    """
+    log_tailer.ensure_started()
+    status_watcher.ensure_started()
+
+    def stream():
+        subscriber = BROKER.subscribe()
+        try:
+            yield format_sse("status", _read_status())
+            deadline = time.monotonic() + EVENT_STREAM_SECONDS
+            while time.monotonic() < deadline:
+                try:
+                    event, data = subscriber.get(timeout=EVENT_HEARTBEAT_SECONDS)
+                except queue.Empty:
+                    # Comment line keeps proxies from closing an idle connection
+                    yield ": keep-alive\n\n"
+                    continue
+                yield format_sse(event, data)
+        finally:
+            BROKER.unsubscribe(subscriber)
+
+    return Response(
+        stream_with_context(stream()),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
+
+@scraper_bp.route('/checkpoint', methods=['GET'])
+def checkpoint_status():
+    """Get progress of the last run of the active site list and whether it can be resumed"""
+    try:
+        config = load_config()
+        site_list = load_site_list(config.get('active_site_list', 'sites.txt'))
+
+        if not site_list:
+            return jsonify({"resumable": False})
+
+        checkpoint = RunCheckpoint(site_list)
+        try:
+            summary = checkpoint.summary()
+            summary["resumable"] = checkpoint.resumable()
+        finally:
+            checkpoint.close()
+
+        return jsonify(summary)
+    except Exception as e:
         return jsonify({
-            "running": False,
-            "progress": 0,
-            "current_site": "",
-            "total_imported": 0,
-            "sites_completed": 0,
-            "sites_total": 0
-        })
+            "success": False,
+            "message": f"Error reading checkpoint: {str(e)}"
+        }), 500
+
 
-    return jsonify(scraper_instance.get_status())
+@scraper_bp.route('/index/resync', methods=['POST'])
+def resync_index():
+    """Force a full recipe catalog download from Mealie/Tandoor on the next run"""
+    try:
+        url_index = UrlIndex()
+        try:
+            url_index.request_resync()
+        finally:
+            url_index.close()
+
+        return jsonify({
+            "success": True,
+            "message": "Recipe index will be fully resynced on the next run"
+        })
+    except Exception as e:
+        return jsonify({
+            "success": False,
+            "message": f"Error requesting resync: {str(e)}"
+        }), 500
 
 
 @scraper_bp.route('/site-lists', methods=['GET'])
@@ -1,7 +1,9 @@
 from flask import Blueprint, render_template, request, jsonify, flash, redirect, url_for
 from config.config_manager import load_config, save_config, validate_config
+from core.async_engine import async_engine_available
 from core.mealie_client import MealieClient
 from core.tandoor_client import TandoorClient
+from core.http_session import get_shared_session
 
 settings_bp = Blueprint('settings', __name__)
 
@@ -10,7 +12,8 @@ settings_bp = Blueprint('settings', __name__)
 def settings():
     """Settings page"""
     config = load_config()
-    return render_template('settings.html', config=config)
+    return render_template('settings.html', config=config,
+                           async_available=async_engine_available())
 
 
 @settings_bp.route('/update', methods=['POST'])
@@ -32,11 +35,20 @@ def update_settings():
     try:
         config['scraper']['target_recipes_per_site'] = int(request.form.get('target_recipes', 50))
         config['scraper']['scan_depth'] = int(request.form.get('scan_depth', 1000))
+        config['scraper']['max_workers'] = int(request.form.get('max_workers', 4))
     except ValueError:
         flash('Invalid numeric values provided', 'error')
         return redirect(url_for('settings.settings'))
 
     config['scraper']['dry_run'] = request.form.get('dry_run') == 'on'
+    engine = request.form.get('engine', config['scraper'].get('engine', 'threaded'))
+    config['scraper']['engine'] = engine
+
+    # Refuse the async engine up front instead of falling back when a run starts
+    if engine == 'async' and not async_engine_available():
+        flash('The asyncio engine requires aiohttp (pip install -r requirements-async.txt)',
+              'error')
+        return redirect(url_for('settings.settings'))
 
     # Validate configuration
     is_valid, errors = validate_config(config)
@@ -69,7 +81,8 @@ def test_connection(service):
 
             client = MealieClient(
                 config['mealie']['url'],
-                config['mealie']['api_token']
+                config['mealie']['api_token'],
+                session=get_shared_session()
             )
             success, message = client.test_connection()
 
@@ -82,7 +95,8 @@ def test_connection(service):
 
             client = TandoorClient(
                 config['tandoor']['url'],
-                config['tandoor']['api_key']
+                config['tandoor']['api_key'],
+                session=get_shared_session()
             )
             success, message = client.test_connection()
 
@@ -2,6 +2,7 @@ from flask import Blueprint, render_template, request, redirect, url_for, flash
 from config.setup_wizard import is_first_run, save_wizard_config
 from core.mealie_client import MealieClient
 from core.tandoor_client import TandoorClient
+from core.http_session import get_shared_session
 
 setup_bp = Blueprint('setup', __name__)
 
@@ -48,7 +49,7 @@ def test_mealie_setup():
         mealie_url = f"http://{mealie_url}"
 
     try:
-        client = MealieClient(mealie_url, mealie_token)
+        client = MealieClient(mealie_url, mealie_token, session=get_shared_session())
         success, message = client.test_connection()
         return {'success': success, 'message': message}
     except Exception as e:
@@ -70,7 +71,7 @@ def test_tandoor_setup():
         tandoor_url = f"http://{tandoor_url}"
 
     try:
-        client = TandoorClient(tandoor_url, tandoor_key)
+        client = TandoorClient(tandoor_url, tandoor_key, session=get_shared_session())
         success, message = client.test_connection()
         return {'success': success, 'message': message}
     except Exception as e:
@@ -0,0 +1,23 @@
+import sys
+import time
+from pathlib import Path
+import pytest
+
+# Tests import the app's packages (core, config, routes) from the repository root
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Replace time.monotonic with a clock that only moves when a test advances clock.now"""
+    clock = FakeClock()
+    monkeypatch.setattr(time, "monotonic", clock)
+    return clock
@@ -0,0 +1,90 @@
+from core.checkpoint import (CANDIDATE_QUEUED, CANDIDATE_VERIFIED, SITE_DISCOVERED,
+                             SITE_DONE, SITE_PENDING, RunCheckpoint)
+
+SITES = ["https://a.example.com", "https://b.example.com", "https://c.example.com"]
+
+
+def interrupted_run(db_path):
+    """A run that finished site a, discovered site b and never reached site c"""
+    checkpoint = RunCheckpoint(SITES, db_path)
+    checkpoint.start()
+    checkpoint.save_candidates(SITES[0], [f"{SITES[0]}/1"])
+    checkpoint.site_done(SITES[0], 1)
+    checkpoint.save_candidates(SITES[1], [f"{SITES[1]}/{n}" for n in range(4)])
+    checkpoint.mark([f"{SITES[1]}/0"])
+    checkpoint.mark([f"{SITES[1]}/1"], CANDIDATE_VERIFIED)
+    checkpoint.set_imported(SITES[1], 1)
+    checkpoint.finish(False)
+    checkpoint.close()
+
+
+def test_interrupted_run_resumes_where_it_stopped(tmp_path):
+    interrupted_run(tmp_path / "state.db")
+
+    checkpoint = RunCheckpoint(SITES, tmp_path / "state.db")
+    assert checkpoint.resumable()
+    assert checkpoint.sites() == {
+        SITES[0]: (SITE_DONE, 1),
+        SITES[1]: (SITE_DISCOVERED, 1),
+        SITES[2]: (SITE_PENDING, 0),
+    }
+    # The finished candidate is gone, the rest keep their order and state
+    assert checkpoint.candidates(SITES[1]) == [
+        (f"{SITES[1]}/1", CANDIDATE_VERIFIED),
+        (f"{SITES[1]}/2", CANDIDATE_QUEUED),
+        (f"{SITES[1]}/3", CANDIDATE_QUEUED),
+    ]
+    assert checkpoint.summary() == {
+        "status": "interrupted", "sites_total": 3, "sites_completed": 1, "total_imported": 2,
+    }
+
+
+def test_run_left_running_by_a_dead_process_is_resumable(tmp_path):
+    checkpoint = RunCheckpoint(SITES, tmp_path / "state.db")
+    checkpoint.start()
+    checkpoint.close()
+
+    assert RunCheckpoint(SITES, tmp_path / "state.db").resumable()
+
+
+def test_completed_run_is_not_resumable(tmp_path):
+    checkpoint = RunCheckpoint(SITES, tmp_path / "state.db")
+    checkpoint.start()
+    checkpoint.finish(True)
+
+    assert not checkpoint.resumable()
+    assert checkpoint.summary()["status"] == "complete"
+
+
+def test_other_site_list_does_not_see_the_checkpoint(tmp_path):
+    interrupted_run(tmp_path / "state.db")
+
+    for site_list in (SITES[:2], list(reversed(SITES)), SITES + ["https://d.example.com"]):
+        other = RunCheckpoint(site_list, tmp_path / "state.db")
+        assert not other.resumable()
+        assert other.summary() == {}
+        assert other.sites() == {}
+
+
+def test_start_discards_the_previous_run(tmp_path):
+    interrupted_run(tmp_path / "state.db")
+
+    checkpoint = RunCheckpoint(SITES, tmp_path / "state.db")
+    checkpoint.start()
+    assert checkpoint.sites() == {site: (SITE_PENDING, 0) for site in SITES}
+    assert checkpoint.candidates(SITES[1]) == []
+
+
+def test_marks_are_buffered_until_flushed(tmp_path, clock):
+    checkpoint = RunCheckpoint(SITES, tmp_path / "state.db")
+    checkpoint.start()
+    checkpoint.save_candidates(SITES[0], [f"{SITES[0]}/1", f"{SITES[0]}/2"])
+    reader = RunCheckpoint(SITES, tmp_path / "state.db")
+
+    checkpoint.mark([f"{SITES[0]}/1"])
+    assert len(reader.candidates(SITES[0])) == 2
+
+    # The next mark after the interval writes everything buffered so far
+    clock.now += 5
+    checkpoint.mark([f"{SITES[0]}/2"], CANDIDATE_VERIFIED)
+    assert reader.candidates(SITES[0]) == [(f"{SITES[0]}/2", CANDIDATE_VERIFIED)]
@@ -0,0 +1,27 @@
+import os
+import stat
+from config import config_manager
+from config.config_manager import _atomic_write
+
+
+def test_atomic_write_replaces_the_file_and_keeps_its_mode(tmp_path):
+    path = tmp_path / "config.json"
+    path.write_text("old")
+    path.chmod(0o640)
+
+    _atomic_write(path, "new")
+
+    assert path.read_text() == "new"
+    assert stat.S_IMODE(path.stat().st_mode) == 0o640
+    assert [p.name for p in tmp_path.iterdir()] == ["config.json"]
+
+
+def test_atomic_write_works_without_fchmod(tmp_path, monkeypatch):
+    # Windows builds before Python 3.13 have no os.fchmod
+    monkeypatch.delattr(config_manager.os, "fchmod", raising=False)
+    path = tmp_path / "sites.txt"
+
+    _atomic_write(path, "https://example.com\n")
+
+    assert path.read_text() == "https://example.com\n"
+    assert stat.S_IMODE(path.stat().st_mode) == 0o644
@@ -0,0 +1,78 @@
+import pytest
+from core.detector import RecipeDetector
+
+PADDING = b"<p>" + b"x" * 5000 + b"</p>"
+
+JSON_LD = b'<script type="application/ld+json">{"@context":"https://schema.org","@type": "Recipe"}</script>'
+
+
+def scan(data: bytes, chunk_size: int, detector: RecipeDetector = None):
+    """Feed a page in chunks until the detector finishes; returns it and the chunks fed"""
+    detector = detector or RecipeDetector()
+    fed = 0
+    for i in range(0, len(data), chunk_size):
+        fed += 1
+        if detector.feed(data[i:i + chunk_size]):
+            break
+    return detector, fed
+
+
+@pytest.mark.parametrize("marker", [
+    JSON_LD,
+    b'"@type" : [ "Thing", "Recipe" ]',
+    b'"@type":"https://schema.org/Recipe"',
+    b'<div class="wprm-recipe-container wprm-recipe">',
+    b"<div class='entry tasty-recipes'>",
+])
+def test_recipe_markers_are_found(marker):
+    detector, _ = scan(PADDING + marker + PADDING, chunk_size=len(PADDING) * 3)
+    assert detector.found and detector.done
+
+
+# Every split point up to the end of the marker
+MARKER_END = JSON_LD.index(b'"Recipe"') + len(b'"Recipe"')
+
+
+@pytest.mark.parametrize("split", range(1, MARKER_END))
+def test_marker_split_across_chunks(split):
+    detector = RecipeDetector()
+    assert not detector.feed(PADDING + JSON_LD[:split])
+    assert detector.feed(JSON_LD[split:] + PADDING)
+    assert detector.found
+
+
+def test_marker_split_across_many_small_chunks():
+    detector, _ = scan(PADDING + JSON_LD + PADDING, chunk_size=7)
+    assert detector.found
+
+
+def test_stops_at_the_chunk_holding_the_marker():
+    page = JSON_LD + PADDING * 10
+    detector, fed = scan(page, chunk_size=1000)
+    assert detector.found
+    assert fed == 1
+    assert detector.bytes_scanned == 1000
+
+    # Chunks fed after detection finished are ignored
+    assert detector.feed(PADDING)
+    assert detector.bytes_scanned == 1000
+
+
+@pytest.mark.parametrize("page", [
+    PADDING,
+    b'<script type="application/ld+json">{"@type":"Article","about":"Recipe"}</script>',
+    b'<link rel="stylesheet" href="/wp-content/plugins/wp-recipe-maker/style.css">',
+    b'"@type":"RecipeCollection"',
+])
+def test_non_recipe_pages(page):
+    detector, _ = scan(PADDING + page + PADDING, chunk_size=4096)
+    assert not detector.found
+    assert not detector.done
+
+
+def test_scan_limit_ends_detection():
+    detector, fed = scan(PADDING * 10 + JSON_LD, chunk_size=1000,
+                         detector=RecipeDetector(max_bytes=3000))
+    assert detector.done and not detector.found
+    assert fed == 3
+
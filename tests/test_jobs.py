@@ -0,0 +1,185 @@
+import os
+import threading
+import time
+import pytest
+from config.config_manager import create_default_config
+from core import jobs, worker
+from core.jobs import (
+    JOB_DONE, JOB_FAILED, JOB_INTERRUPTED, JOB_QUEUED, JOB_RUNNING, JOB_STOPPED,
+    WORKER_TIMEOUT, JobStore, _worker_running
+)
+
+
+def test_worker_with_a_stale_heartbeat_is_gone():
+    assert not _worker_running(os.getpid(), time.time() - WORKER_TIMEOUT - 1)
+
+
+def test_worker_is_running_while_its_process_exists():
+    assert _worker_running(os.getpid(), time.time())
+
+
+def test_worker_whose_process_exited_is_gone(monkeypatch):
+    def kill(pid, signal):
+        raise ProcessLookupError
+
+    monkeypatch.setattr(jobs.os, "kill", kill)
+    assert not _worker_running(12345, time.time())
+
+
+def test_windows_checks_the_process_without_signalling_it(monkeypatch):
+    def kill(pid, signal):
+        raise AssertionError("os.kill(pid, 0) sends CTRL_C_EVENT on Windows")
+
+    monkeypatch.setattr(jobs.os, "name", "nt")
+    monkeypatch.setattr(jobs.os, "kill", kill)
+    monkeypatch.setattr(jobs, "_windows_process_exists", lambda pid: False)
+    assert not _worker_running(12345, time.time())
+
+
+OTHER_PID = 99999
+
+
+@pytest.fixture
+def store(tmp_path):
+    return JobStore(tmp_path / "state.db")
+
+
+def register_other_worker(store, heartbeat: float):
+    """Record a worker row as written by another process"""
+    with store._conn:
+        store._conn.execute(
+            "INSERT OR REPLACE INTO worker (id, pid, heartbeat) VALUES (1, ?, ?)",
+            (OTHER_PID, heartbeat),
+        )
+
+
+def test_a_site_list_has_one_active_job(store):
+    first = store.create("sites.json")
+    assert store.create("sites.json") is None
+    assert store.create("other.json") is not None
+
+    store.finish(first, JOB_DONE)
+    assert store.create("sites.json", resume=True) is not None
+    assert [(job["site_list"], job["resume"]) for job in store.active()] == [
+        ("other.json", False), ("sites.json", True),
+    ]
+
+
+def test_claim_takes_the_oldest_queued_job(store):
+    first = store.create("a.json")
+    second = store.create("b.json")
+
+    job = store.claim_next()
+    assert job["id"] == first
+    assert job["state"] == JOB_RUNNING and job["started_at"]
+    assert store.claim_next()["id"] == second
+    assert store.claim_next() is None
+
+
+def test_stop_cancels_a_queued_job_and_flags_a_running_one(store):
+    running = store.create("a.json")
+    store.claim_next()
+    queued = store.create("b.json")
+
+    assert store.request_stop(queued)
+    assert store.get(queued)["state"] == JOB_STOPPED
+
+    assert store.request_stop(running)
+    assert store.stop_requested(running)
+    assert store.get(running)["state"] == JOB_RUNNING
+
+    store.finish(running, JOB_STOPPED)
+    assert not store.request_stop(running)
+
+
+def test_live_worker_keeps_its_registration(store, monkeypatch):
+    monkeypatch.setattr(jobs, "_process_exists", lambda pid: True)
+    register_other_worker(store, time.time())
+    assert store.register_worker() == OTHER_PID
+
+
+@pytest.mark.parametrize("heartbeat, exists", [
+    (time.time() - WORKER_TIMEOUT - 1, True),
+    (time.time(), False),
+])
+def test_dead_worker_is_replaced_and_its_jobs_interrupted(store, monkeypatch, heartbeat, exists):
+    monkeypatch.setattr(jobs, "_process_exists", lambda pid: exists)
+    register_other_worker(store, heartbeat)
+    left_running = store.create("a.json")
+    store.claim_next()
+    queued = store.create("b.json")
+
+    assert store.register_worker() is None
+    assert store.worker()["pid"] == os.getpid()
+    assert store.recover() == 1
+    assert store.get(left_running)["state"] == JOB_INTERRUPTED
+    assert store.get(queued)["state"] == JOB_QUEUED
+
+
+class StubScraper:
+    """Stands in for RecipeScraper; fails or runs until stopped as the site list says"""
+
+    def __init__(self, config, site_list, resume=False, **shared):
+        self.site_list = site_list
+        self.finished = threading.Event() if "wait" in site_list else None
+        self.status = {"running": False, "progress": 0}
+
+    def run_scrape(self):
+        if "fail" in self.site_list:
+            raise RuntimeError("site list failed")
+        self.status = {"running": True, "progress": 50}
+        if self.finished:
+            self.finished.wait(5)
+        self.status = {"running": False, "progress": 100}
+
+    def stop(self):
+        if self.finished:
+            self.finished.set()
+
+    def get_status(self) -> dict:
+        return dict(self.status)
+
+    def update_metrics(self, job: str = ""):
+        pass
+
+
+@pytest.fixture
+def scrape_worker(store, monkeypatch):
+    monkeypatch.setattr(worker, "load_config", create_default_config)
+    monkeypatch.setattr(worker, "load_site_list", lambda name: [name.split(".")[0]])
+    monkeypatch.setattr(worker, "RecipeScraper", StubScraper)
+    monkeypatch.setattr(worker, "POLL_INTERVAL", 0.01)
+    monkeypatch.setattr(worker, "STATUS_INTERVAL", 0.01)
+    scrape_worker = worker.ScrapeWorker(store)
+    thread = threading.Thread(target=scrape_worker.run_forever)
+    thread.start()
+    yield scrape_worker
+    scrape_worker.shutdown()
+    thread.join(5)
+
+
+def wait_for_state(store, job_id: int, state: str) -> dict:
+    deadline = time.monotonic() + 5
+    while time.monotonic() < deadline:
+        job = store.get(job_id)
+        if job["state"] == state:
+            return job
+        time.sleep(0.01)
+    raise AssertionError(f"job {job_id} is {store.get(job_id)['state']}, not {state}")
+
+
+def test_worker_runs_queued_jobs_and_records_the_outcome(store, scrape_worker):
+    done = store.create("done.json")
+    failed = store.create("fail.json")
+
+    assert wait_for_state(store, done, JOB_DONE)["status"]["progress"] == 100
+    assert wait_for_state(store, failed, JOB_FAILED)["error"] == "site list failed"
+    assert store.worker()["alive"]
+
+
+def test_worker_stops_a_job_on_request(store, scrape_worker):
+    job_id = store.create("wait.json")
+    wait_for_state(store, job_id, JOB_RUNNING)
+
+    store.request_stop(job_id)
+    wait_for_state(store, job_id, JOB_STOPPED)
@@ -0,0 +1,24 @@
+from datetime import datetime, timezone
+import pytest
+from core.sitemap import parse_lastmod
+
+
+def utc(*args) -> float:
+    return datetime(*args, tzinfo=timezone.utc).timestamp()
+
+
+@pytest.mark.parametrize("value, expected", [
+    ("2024", utc(2024, 1, 1)),
+    ("2024-05", utc(2024, 5, 1)),
+    ("2024-05-01", utc(2024, 5, 1)),
+    ("2024-05-01T10:30:00Z", utc(2024, 5, 1, 10, 30)),
+    ("2024-05-01T10:30:00+02:00", utc(2024, 5, 1, 8, 30)),
+    (" 2024-05-01T10:30:00 ", utc(2024, 5, 1, 10, 30)),
+])
+def test_w3c_datetimes(value, expected):
+    assert parse_lastmod(value) == expected
+
+
+@pytest.mark.parametrize("value", [None, "", "yesterday", "2024-13-01"])
+def test_invalid_values_give_none(value):
+    assert parse_lastmod(value) is None
@@ -0,0 +1,80 @@
+import pytest
+from core import log_files
+from core.log_files import read_after, read_page
+
+
+def log_line(n: int, level: str = "INFO") -> str:
+    # Varying lengths, some longer than the read blocks used below
+    return f"2026-01-31 12:00:{n % 60:02d},000 - {level} - 1a2b3c4d - line {n} {'x' * (n * 7 % 40)}\n"
+
+
+LINES = [log_line(n, "ERROR" if n % 5 == 0 else "INFO") for n in range(40)]
+
+
+@pytest.fixture(params=[1, 7, 16, 64])
+def block_size(request, monkeypatch):
+    monkeypatch.setattr(log_files, "READ_BLOCK_SIZE", request.param)
+    return request.param
+
+
+@pytest.fixture
+def log_file(tmp_path):
+    path = tmp_path / "scraper.log"
+    path.write_text("".join(LINES), encoding="utf-8")
+    return path
+
+
+def test_pages_cover_every_line_once(log_file, block_size):
+    pages = []
+    before = None
+    while True:
+        page = read_page(log_file, before=before, limit=6)
+        pages.insert(0, page["lines"])
+        before = page["before"]
+        if before is None:
+            break
+    assert [line for page in pages for line in page] == LINES
+
+
+def test_filtered_page_spans_blocks(log_file, block_size):
+    page = read_page(log_file, limit=3, level="error")
+    assert page["lines"] == [LINES[25], LINES[30], LINES[35]]
+    older = read_page(log_file, before=page["before"], limit=10, level="error")
+    assert older["lines"] == [LINES[0], LINES[5], LINES[10], LINES[15], LINES[20]]
+    assert older["before"] is None
+
+
+def test_before_inside_a_line_starts_at_that_line(log_file, block_size):
+    offset = len("".join(LINES[:10])) + 5
+    assert read_page(log_file, before=offset, limit=2)["lines"] == LINES[8:10]
+
+
+def test_unfinished_last_line_waits_for_its_newline(log_file, block_size):
+    with open(log_file, "a", encoding="utf-8") as f:
+        f.write(log_line(40)[:-10])
+
+    page = read_page(log_file, limit=2)
+    assert page["lines"] == LINES[-2:]
+    assert page["end"] == len("".join(LINES))
+
+    assert read_after(log_file, page["end"])["lines"] == []
+    with open(log_file, "a", encoding="utf-8") as f:
+        f.write(log_line(40)[-10:] + log_line(41))
+    after = read_after(log_file, page["end"])
+    assert after["lines"] == [log_line(40), log_line(41)]
+    assert after["end"] == log_file.stat().st_size
+
+
+def test_read_after_limit_continues_from_end(log_file):
+    first = read_after(log_file, 0, limit=30)
+    second = read_after(log_file, first["end"])
+    assert first["lines"] + second["lines"] == LINES
+
+
+def test_rotated_file_is_read_from_the_start(log_file, block_size):
+    end = read_page(log_file)["end"]
+    log_file.write_text("".join(LINES[:3]), encoding="utf-8")
+
+    after = read_after(log_file, end)
+    assert after["lines"] == LINES[:3]
+    assert read_page(log_file)["lines"] == LINES[:3]
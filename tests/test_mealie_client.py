@@ -0,0 +1,151 @@
+import pytest
+import requests
+from urllib3.exceptions import NewConnectionError
+from core.import_result import FAILED, IMPORTED, REJECTED, UNKNOWN
+from core.mealie_client import MealieClient
+from core.retry import RetryPolicy
+
+URLS = ["https://example.com/post-1", "https://example.com/post-10", "https://example.com/post-2"]
+
+
+def test_success_entries_without_urls_count_as_imported():
+    report = {
+        "status": "partial",
+        "entries": [
+            {"success": True, "message": "Successfully Imported Pasta Bake"},
+            {"success": True, "message": "Successfully Imported Soup"},
+            {"success": False, "message": "Failed to scrape url https://example.com/post-1"},
+        ],
+    }
+
+    assert MealieClient._report_results(URLS, report) == {
+        "https://example.com/post-1": REJECTED,
+        "https://example.com/post-10": IMPORTED,
+        "https://example.com/post-2": IMPORTED,
+    }
+
+
+def test_failure_matches_whole_url_only():
+    report = {
+        "status": "partial",
+        "entries": [
+            {"success": False, "message": "Failed to scrape url 'https://example.com/post-10'"},
+        ],
+    }
+
+    results = MealieClient._report_results(URLS, report)
+
+    assert results["https://example.com/post-10"] == REJECTED
+    assert results["https://example.com/post-1"] == IMPORTED
+
+
+def test_unattributed_failures_leave_the_outcome_unknown():
+    # A failure entry without a URL can't be attributed - nothing is resubmitted
+    report = {
+        "status": "partial",
+        "entries": [
+            {"success": False, "message": "Failed to scrape url https://example.com/post-1"},
+            {"success": False, "message": "Unexpected error"},
+        ],
+    }
+
+    assert MealieClient._report_results(URLS, report) == {
+        "https://example.com/post-1": REJECTED,
+        "https://example.com/post-10": UNKNOWN,
+        "https://example.com/post-2": UNKNOWN,
+    }
+    assert set(MealieClient._report_results(URLS, {"status": "failure"}).values()) == {UNKNOWN}
+
+
+def test_successful_report_without_entries():
+    assert MealieClient._report_results(URLS, {"status": "success"}) == dict.fromkeys(URLS, IMPORTED)
+
+
+class Response:
+    def __init__(self, status_code: int, body=None):
+        self.status_code = status_code
+        self.body = body
+        self.headers = {}
+
+    def json(self):
+        return self.body
+
+
+class FakeSession:
+    """Plays back POST responses (or raises errors) and counts the POSTs"""
+
+    def __init__(self, *posts, report=None):
+        self.posts = list(posts)
+        self.report = report
+        self.post_count = 0
+
+    def post(self, url, **kwargs):
+        self.post_count += 1
+        result = self.posts.pop(0)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    def get(self, url, **kwargs):
+        return Response(200, self.report)
+
+
+def bulk_client(session) -> MealieClient:
+    client = MealieClient("http://mealie", "token", session=session,
+                          retry_policy=RetryPolicy(retries=2, base_delay=0))
+    client.REPORT_POLL_INTERVAL = 0
+    return client
+
+
+def refused() -> requests.exceptions.ConnectionError:
+    return requests.exceptions.ConnectionError(
+        NewConnectionError(None, "Failed to establish a new connection")
+    )
+
+
+def test_bulk_import_reads_the_report():
+    session = FakeSession(Response(202, {"reportId": "1"}), report={"status": "success"})
+
+    assert bulk_client(session).import_recipes_bulk(URLS) == dict.fromkeys(URLS, IMPORTED)
+
+
+def test_bulk_import_is_resent_only_if_it_never_connected():
+    session = FakeSession(refused(), Response(202, {"reportId": "1"}), report={"status": "success"})
+
+    assert bulk_client(session).import_recipes_bulk(URLS) == dict.fromkeys(URLS, IMPORTED)
+    assert session.post_count == 2
+
+    session = FakeSession(refused(), refused(), refused())
+    assert bulk_client(session).import_recipes_bulk(URLS) == dict.fromkeys(URLS, FAILED)
+
+
+@pytest.mark.parametrize("error", [
+    requests.exceptions.ReadTimeout("read timed out"),
+    requests.exceptions.ConnectionError("connection reset by peer"),
+])
+def test_lost_bulk_response_is_unknown_and_not_resent(error):
+    session = FakeSession(error, Response(202, {"reportId": "1"}))
+
+    assert bulk_client(session).import_recipes_bulk(URLS) == dict.fromkeys(URLS, UNKNOWN)
+    assert session.post_count == 1
+
+
+def test_bulk_server_error_is_not_resent():
+    session = FakeSession(Response(503), Response(202, {"reportId": "1"}))
+
+    assert bulk_client(session).import_recipes_bulk(URLS) == dict.fromkeys(URLS, FAILED)
+    assert session.post_count == 1
+
+
+def test_accepted_bulk_without_report_id_is_unknown():
+    session = FakeSession(Response(202, {}))
+
+    assert bulk_client(session).import_recipes_bulk(URLS) == dict.fromkeys(URLS, UNKNOWN)
+
+
+def test_unfinished_bulk_report_is_unknown():
+    session = FakeSession(Response(202, {"reportId": "1"}), report={"status": "in-progress"})
+    client = bulk_client(session)
+    client.REPORT_TIMEOUT = 0
+
+    assert client.import_recipes_bulk(URLS) == dict.fromkeys(URLS, UNKNOWN)
@@ -0,0 +1,57 @@
+import queue
+import pytest
+from core.pipeline import _END, FairQueue
+
+
+def test_keys_are_served_round_robin():
+    fair = FairQueue(10, key=lambda item: item[0])
+    for item in [("a", 1), ("a", 2), ("a", 3), ("b", 1), ("c", 1), ("b", 2)]:
+        fair.put(item)
+
+    taken = [fair.get(timeout=0) for _ in range(6)]
+
+    assert taken == [("a", 1), ("b", 1), ("c", 1), ("a", 2), ("b", 2), ("a", 3)]
+
+
+def test_held_key_does_not_block_the_others():
+    held = {"slow"}
+    fair = FairQueue(10, key=lambda item: item[0],
+                     gate=lambda item, taken: None if item[0] in held else 0)
+    fair.put(("slow", 1))
+    fair.put(("fast", 1))
+    fair.put(("fast", 2))
+
+    assert fair.get(timeout=0) == ("fast", 1)
+    assert fair.get(timeout=0) == ("fast", 2)
+    with pytest.raises(queue.Empty):
+        fair.get(timeout=0.05)
+
+    held.clear()
+    fair.wake()
+    assert fair.get(timeout=0) == ("slow", 1)
+
+
+def test_gate_sees_items_taken_until_done():
+    fair = FairQueue(10, key=lambda item: item[0],
+                     gate=lambda item, taken: 0 if taken < 1 else None)
+    fair.put(("a", 1))
+    fair.put(("a", 2))
+
+    first = fair.get(timeout=0)
+    with pytest.raises(queue.Empty):
+        fair.get(timeout=0.05)
+
+    fair.done([first])
+    assert fair.get(timeout=0) == ("a", 2)
+
+
+def test_end_marker_comes_after_every_item():
+    fair = FairQueue(10, key=lambda item: item[0])
+    fair.put(("a", 1))
+    fair.put(_END)
+    fair.put(("b", 1))
+
+    assert fair.get() == ("a", 1)
+    assert fair.get() == ("b", 1)
+    assert fair.get() is _END
+    assert fair.qsize() == 0
@@ -0,0 +1,66 @@
+import pytest
+from core.rate_limiter import HostRateLimiter, TokenBucket, host_of
+
+
+def test_burst_is_free_then_waits_one_interval_per_token(clock):
+    bucket = TokenBucket(rate=2.0, burst=3)
+
+    assert [bucket.reserve() for _ in range(3)] == [0.0, 0.0, 0.0]
+    assert bucket.reserve() == pytest.approx(0.5)
+    assert bucket.reserve() == pytest.approx(1.0)
+
+
+def test_tokens_refill_over_time_up_to_burst(clock):
+    bucket = TokenBucket(rate=1.0, burst=2)
+    bucket.reserve()
+    bucket.reserve()
+
+    clock.now += 1.0
+    assert bucket.reserve() == 0.0
+    assert bucket.reserve() == pytest.approx(1.0)
+
+    # A long idle period saves at most `burst` tokens
+    clock.now += 100.0
+    assert [bucket.reserve() for _ in range(2)] == [0.0, 0.0]
+    assert bucket.reserve() > 0
+
+
+def test_burst_is_at_least_one(clock):
+    bucket = TokenBucket(rate=1.0, burst=0)
+
+    assert bucket.reserve() == 0.0
+    assert bucket.reserve() == pytest.approx(1.0)
+
+
+def test_host_of():
+    assert host_of("https://Example.com/recipes/") == "example.com"
+    assert host_of("Example.com/") == "example.com"
+
+
+def test_hosts_get_separate_buckets_and_overrides(clock):
+    limiter = HostRateLimiter(1.0, 1, {"https://slow.example.com": {"requests_per_second": 0.5}})
+
+    assert limiter.reserve("https://fast.example.com/a") == 0.0
+    assert limiter.reserve("https://fast.example.com/b") == pytest.approx(1.0)
+    assert limiter.reserve("https://slow.example.com/a") == 0.0
+    assert limiter.reserve("https://slow.example.com/b") == pytest.approx(2.0)
+
+
+def test_try_reserve_takes_only_an_available_token(clock):
+    bucket = TokenBucket(rate=2.0, burst=1)
+
+    assert bucket.try_reserve() == 0.0
+    assert bucket.try_reserve() == pytest.approx(0.5)
+    # Asking doesn't put the bucket into debt
+    clock.now += 0.5
+    assert bucket.try_reserve() == 0.0
+
+
+def test_token_taken_ahead_is_used_by_the_next_request(clock):
+    limiter = HostRateLimiter(1.0, 1)
+
+    assert limiter.try_acquire("https://example.com/a") == 0.0
+    assert limiter.try_acquire("https://example.com/b") == pytest.approx(1.0)
+    # The request for the URL handed out goes without waiting, the next one waits
+    assert limiter.reserve("https://example.com/a") == 0.0
+    assert limiter.reserve("https://example.com/c") == pytest.approx(1.0)
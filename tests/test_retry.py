@@ -0,0 +1,65 @@
+import pytest
+from core.retry import CircuitBreaker
+
+
+def test_opens_after_threshold_consecutive_failures(clock):
+    breaker = CircuitBreaker("Mealie", threshold=3, cooldown=30)
+
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.allow()
+
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    assert not breaker.allow()
+    assert breaker.retry_in() == pytest.approx(30)
+
+
+def test_success_resets_the_failure_count(clock):
+    breaker = CircuitBreaker("Mealie", threshold=2, cooldown=30)
+
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_half_open_lets_a_single_trial_through(clock):
+    breaker = CircuitBreaker("Mealie", threshold=1, cooldown=30)
+    breaker.record_failure()
+
+    clock.now += 29
+    assert not breaker.allow()
+
+    clock.now += 1
+    assert breaker.retry_in() == 0.0
+    assert breaker.allow()
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert not breaker.allow()
+
+
+def test_trial_success_closes_the_circuit(clock):
+    breaker = CircuitBreaker("Mealie", threshold=1, cooldown=30)
+    breaker.record_failure()
+    clock.now += 30
+    breaker.allow()
+
+    breaker.record_success()
+
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.allow() and breaker.allow()
+
+
+def test_trial_failure_reopens_for_another_cooldown(clock):
+    breaker = CircuitBreaker("Mealie", threshold=5, cooldown=30)
+    for _ in range(5):
+        breaker.record_failure()
+    clock.now += 30
+    breaker.allow()
+
+    breaker.record_failure()
+
+    assert breaker.state == CircuitBreaker.OPEN
+    assert not breaker.allow()
+    assert breaker.retry_in() == pytest.approx(30)
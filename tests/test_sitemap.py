@@ -0,0 +1,62 @@
+import gzip
+from core.sitemap import SitemapEntry, SitemapParser, iter_sitemap
+
+URLSET = b"""<?xml version="1.0" encoding="UTF-8"?>
+<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">
+  <url><loc> https://example.com/pasta/ </loc><lastmod>2024-05-01</lastmod></url>
+  <url><loc>https://example.com/soup/</loc></url>
+  <url><lastmod>2024-05-02</lastmod></url>
+</urlset>
+"""
+
+INDEX = b"""<?xml version="1.0" encoding="UTF-8"?>
+<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">
+  <sitemap><loc>https://example.com/post-sitemap.xml</loc><lastmod>2024-06-01</lastmod></sitemap>
+  <sitemap><loc>https://example.com/page-sitemap.xml</loc></sitemap>
+</sitemapindex>
+"""
+
+
+def parse(data: bytes, chunk_size: int = None) -> list:
+    chunks = [data] if chunk_size is None else [
+        data[i:i + chunk_size] for i in range(0, len(data), chunk_size)
+    ]
+    return list(iter_sitemap(chunks))
+
+
+def test_url_entries_with_stripped_loc_and_lastmod():
+    assert parse(URLSET) == [
+        SitemapEntry("url", "https://example.com/pasta/", "2024-05-01"),
+        SitemapEntry("url", "https://example.com/soup/", None),
+    ]
+
+
+def test_index_entries_are_sitemaps():
+    assert [(entry.kind, entry.loc) for entry in parse(INDEX)] == [
+        ("sitemap", "https://example.com/post-sitemap.xml"),
+        ("sitemap", "https://example.com/page-sitemap.xml"),
+    ]
+
+
+def test_chunk_boundaries_do_not_matter():
+    assert parse(URLSET, chunk_size=7) == parse(URLSET)
+
+
+def test_gzip_body_is_decompressed():
+    assert parse(gzip.compress(URLSET), chunk_size=16) == parse(URLSET)
+
+
+def test_entries_are_returned_as_soon_as_they_close():
+    parser = SitemapParser()
+    end = URLSET.index(b"</url>") + len(b"</url>")
+
+    assert [entry.loc for entry in parser.feed(URLSET[:end])] == ["https://example.com/pasta/"]
+    assert parser.bytes_read == end
+
+
+def test_truncated_document_keeps_complete_entries():
+    cut = URLSET[:URLSET.index(b"<url><lastmod>")]
+
+    assert [entry.loc for entry in parse(cut)] == [
+        "https://example.com/pasta/", "https://example.com/soup/"
+    ]
@@ -0,0 +1,65 @@
+from core.sitemap_cache import SiteWatermarks
+
+SITE = "https://example.com"
+
+
+def test_crawl_reaching_the_watermark_moves_it(tmp_path):
+    marks = SiteWatermarks(tmp_path / "state.db")
+
+    marks.advance(SITE, None, 100.0)
+    assert marks.get(SITE) == 100.0
+
+    marks.advance(SITE, 100.0, 150.0)
+    assert marks.get(SITE) == 150.0
+    assert marks.crawled(SITE) is None
+
+
+def test_cut_off_crawl_keeps_a_range_until_the_gap_closes(tmp_path):
+    marks = SiteWatermarks(tmp_path / "state.db")
+    marks.advance(SITE, None, 100.0)
+
+    # Only the newest part of what is new was processed
+    marks.advance(SITE, 180.0, 200.0)
+    assert marks.get(SITE) == 100.0
+    assert marks.crawled(SITE) == (180.0, 200.0)
+
+    # The next crawl works further down and overlaps the range
+    marks.advance(SITE, 140.0, 210.0)
+    assert marks.crawled(SITE) == (140.0, 210.0)
+
+    # Reaching the watermark joins everything up
+    marks.advance(SITE, 90.0, 210.0)
+    assert marks.get(SITE) == 210.0
+    assert marks.crawled(SITE) is None
+
+
+def test_first_crawl_cut_off_has_no_watermark_yet(tmp_path):
+    marks = SiteWatermarks(tmp_path / "state.db")
+
+    marks.advance(SITE, 50.0, 80.0)
+
+    assert marks.get(SITE) is None
+    assert marks.crawled(SITE) == (50.0, 80.0)
+
+
+def test_disjoint_ranges_keep_the_newest(tmp_path):
+    marks = SiteWatermarks(tmp_path / "state.db")
+    marks.advance(SITE, None, 100.0)
+    marks.advance(SITE, 150.0, 160.0)
+
+    marks.advance(SITE, 170.0, 190.0)
+    assert marks.crawled(SITE) == (170.0, 190.0)
+
+    # An older, empty or lower range doesn't replace it
+    marks.advance(SITE, 120.0, 130.0)
+    marks.advance(SITE, 190.0, 190.0)
+    assert marks.crawled(SITE) == (170.0, 190.0)
+
+
+def test_watermark_never_moves_back(tmp_path):
+    marks = SiteWatermarks(tmp_path / "state.db")
+    marks.advance(SITE, None, 100.0)
+
+    marks.advance(SITE, None, 60.0)
+
+    assert marks.get(SITE) == 100.0
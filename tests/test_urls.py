@@ -0,0 +1,91 @@
+import pytest
+from core.negative_cache import NegativeCache
+from core.url_index import KnownUrlSets, UrlIndex
+from core.urls import canonical_url
+
+
+@pytest.mark.parametrize("url", [
+    "https://example.com/pasta",
+    "http://example.com/pasta",
+    "https://www.example.com/pasta",
+    "https://example.com/pasta/",
+    "https://example.com/pasta#recipe",
+    "https://example.com/pasta?utm_source=feed&utm_medium=rss",
+    "https://example.com/pasta?fbclid=abc",
+    "HTTPS://WWW.EXAMPLE.COM:443/pasta",
+    "http://example.com:80/pasta/",
+    "  https://example.com/pasta  ",
+])
+def test_spellings_of_one_page_match(url):
+    assert canonical_url(url) == "https://example.com/pasta"
+
+
+def test_meaningful_parts_are_kept():
+    assert canonical_url("https://example.com/Pasta?p=12&utm_source=x") == \
+        "https://example.com/Pasta?p=12"
+    assert canonical_url("http://example.com:8080/pasta") == "https://example.com:8080/pasta"
+    assert canonical_url("https://example.com/") == "https://example.com"
+
+
+@pytest.mark.parametrize("value", ["mailto:cook@example.com", "not a url", "http://[bad"])
+def test_non_http_values_pass_through(value):
+    assert canonical_url(value) == value
+
+
+def test_canonical_form_is_stable():
+    url = "http://www.example.com/pasta/?utm_campaign=x#top"
+    assert canonical_url(canonical_url(url)) == canonical_url(url)
+
+
+def test_url_index_stores_canonical_urls(tmp_path):
+    index = UrlIndex(tmp_path / "state.db")
+    index.merge("mealie:x", ["http://www.example.com/pasta/", "https://example.com/pasta"])
+
+    assert index.load("mealie:x") == {"https://example.com/pasta"}
+
+
+def test_url_index_rewrites_old_rows_once(tmp_path):
+    db = tmp_path / "state.db"
+    index = UrlIndex(db)
+    with index._conn:
+        index._conn.execute("DELETE FROM index_meta")
+        index._conn.executemany(
+            "INSERT INTO known_urls (target, url, added_at) VALUES (?, ?, ?)",
+            [("mealie:x", "http://www.example.com/pasta/", 2.0),
+             ("mealie:x", "https://example.com/pasta?utm_source=a", 1.0)],
+        )
+    index.close()
+
+    index = UrlIndex(db)
+    rows = index._conn.execute("SELECT url, added_at FROM known_urls").fetchall()
+
+    assert rows == [("https://example.com/pasta", 1.0)]
+
+
+def test_negative_cache_looks_up_by_canonical_url(tmp_path):
+    cache = NegativeCache(tmp_path / "state.db")
+    cache.record("http://www.example.com/about/", "not_recipe", 1)
+
+    assert cache.reason("https://example.com/about?utm_source=x") == "not_recipe"
+    assert cache.active_urls() == {"https://example.com/about"}
+
+
+def test_known_sets_compare_canonical_urls():
+    known = KnownUrlSets()
+    known.open("mealie:x", lambda: ["http://www.example.com/pasta/"])
+
+    assert known.known(["mealie:x"], "https://example.com/pasta#recipe")
+    assert not known.claim("mealie:x", "https://example.com/pasta?utm_source=x")
+    assert known.begin_import("https://example.com/soup")
+    assert not known.begin_import("http://www.example.com/soup/")
+
+
+def test_expired_target_is_synced_incrementally(tmp_path):
+    index = UrlIndex(tmp_path / "state.db")
+    index.replace("mealie:x", ["https://example.com/a"])
+    assert not index.needs_sync("mealie:x", 24)
+
+    index.expire("mealie:x")
+
+    assert index.needs_sync("mealie:x", 24)
+    assert not index.needs_full_sync("mealie:x")
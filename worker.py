@@ -0,0 +1,12 @@
+#!/usr/bin/env python3
+"""
+Scrape worker: runs the jobs started from the web interface.
+
+`python app.py` starts one automatically. When serving the web interface
+with a multi-process WSGI server, run exactly one of these next to it.
+"""
+
+from core.worker import main
+
+if __name__ == "__main__":
+    main()